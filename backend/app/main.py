@@ -1,10 +1,19 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import time
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from .routes import news_routes, user_routes
+from .routes import news_routes, user_routes, admin_routes
+from .services import cpu_executor, http_client, json_codec, metrics
+from .services.ocr_engine import ocr_engine
+from .services.storage import storage
+from .services.warmup import warmup
 from utils.config import settings
 
-app = FastAPI(title="Fake News Checker API", version="1.0.0")
+app = FastAPI(title="Fake News Checker API", version="1.0.0",
+              default_response_class=json_codec.JSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -15,9 +24,75 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class CompressionMiddleware:
+    """gzip (or brotli) for regular responses. Progressive streams are passed through untouched:
+    a compressor holds small writes back, which would delay each event until the stream ends."""
+
+    # Suffixes of routes that stream results as they complete
+    streaming_paths = ("/check-text/stream", "/check-batch")
+
+    def __init__(self, app):
+        self.app = app
+        self.compressed = app
+        mode = settings.RESPONSE_COMPRESSION
+        if mode == "off":
+            return
+        if mode == "auto":
+            try:
+                from brotli_asgi import BrotliMiddleware
+                self.compressed = BrotliMiddleware(
+                    app, minimum_size=settings.COMPRESSION_MIN_BYTES, gzip_fallback=True)
+                return
+            except ImportError:
+                pass
+        self.compressed = GZipMiddleware(app, minimum_size=settings.COMPRESSION_MIN_BYTES)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not scope["path"].endswith(self.streaming_paths):
+            await self.compressed(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+app.add_middleware(CompressionMiddleware)
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # label by route template (not raw path) to keep cardinality bounded
+        route = request.scope.get("route")
+        metrics.HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                                     route=getattr(route, "path", "unmatched"), status=str(status))
+
+
 # Include routes
 app.include_router(news_routes.router, prefix="/api/v1/news", tags=["news"])
 app.include_router(user_routes.router, prefix="/api/v1/users", tags=["users"])
+app.include_router(admin_routes.router, prefix="/api/v1/admin", tags=["admin"])
+
+
+@app.on_event("startup")
+async def warm_models():
+    """Load the OCR reader and speech engines in the background instead of on first use"""
+    if settings.WARMUP_ON_STARTUP:
+        warmup.start("ocr", ocr_engine.load)
+        warmup.start("speech", news_routes.speech_processor.warm_up)
+
+
+@app.on_event("shutdown")
+async def close_upstream_connections():
+    await http_client.aclose()
+    cpu_executor.shutdown()
+    ocr_engine.close()
+    storage.close()
 
 
 @app.get("/")
@@ -27,4 +102,12 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    """Liveness plus readiness: `ready` turns true once startup warm-up has finished"""
+    return {"status": "healthy", **warmup.snapshot()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint (stage timings, model attempts, cache hit ratios)"""
+    body = await asyncio.to_thread(metrics.REGISTRY.render)
+    return Response(content=body, media_type=metrics.CONTENT_TYPE)
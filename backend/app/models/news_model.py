@@ -15,6 +15,15 @@ class ImageAnalysisRequest(BaseModel):
     text: Optional[str] = None
     language: str = "en"
 
+class BatchItem(BaseModel):
+    text: str
+    language: str = "en"
+    id: Optional[str] = None  # echoed back so clients can match results
+
+class BatchCheckRequest(BaseModel):
+    items: List[BatchItem]
+    verify: bool = True  # set False for rule-based analysis only (no Tavily/Gemini calls)
+
 class AnalysisResponse(BaseModel):
     status: str
     analysis: Dict[str, Any]
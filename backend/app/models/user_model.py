@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime
 
@@ -8,7 +8,7 @@ class User(BaseModel):
     phone: Optional[str] = None
     name: Optional[str] = None
     preferred_language: str = "en"
-    created_at: str = datetime.now().isoformat()
+    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
     
     class Config:
         schema_extra = {
@@ -27,7 +27,7 @@ class CheckHistory(BaseModel):
     input_text: str
     input_type: str  # text, voice, image
     result: Dict[str, Any]
-    timestamp: str = datetime.now().isoformat()
+    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
     
     class Config:
         schema_extra = {
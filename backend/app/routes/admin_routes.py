@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+from ..services.model_router import gemini_router
+from ..services.pattern_rules import pattern_rules
+from ..services.claim_index import claim_index
+from ..services.upstream_scheduler import upstream_scheduler
+from ..services.retrieval_verifier import cache_stats
+
+router = APIRouter()
+
+
+@router.get("/models")
+async def get_model_routing():
+    """Current Gemini model routing table (known-good and parked models)"""
+    return gemini_router.snapshot()
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Verification cache tiers (text, claim, evidence): backend, size and hit/miss counters"""
+    return cache_stats()
+
+
+@router.get("/patterns")
+async def get_pattern_rules():
+    """FactChecker pattern rules currently loaded (the rule file is re-read when it changes)"""
+    pattern_rules.reload()
+    return pattern_rules.stats()
+
+
+@router.get("/claim-index")
+async def get_claim_index():
+    """Local fact-checked claim index: size, build time and lookup/hit counters"""
+    return claim_index.stats()
+
+
+@router.get("/upstream")
+async def get_upstream_limits():
+    """Per-provider rate limits: queued calls, current request rate and any 429 pause"""
+    return upstream_scheduler.stats()
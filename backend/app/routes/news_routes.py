@@ -1,71 +1,246 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from typing import Optional
-import json
-from ..services.ai_analyzer import NewsAnalyzer
-from ..services.speech_processor import SpeechProcessor
-from ..services.fact_checker import FactChecker
-from ..services.retrieval_verifier import verify_with_osint
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from typing import Dict, List, Optional
 import asyncio
+from ..models.news_model import BatchCheckRequest, BatchItem
+from ..services.ai_analyzer import news_analyzer, run_analysis
+from ..services.speech_processor import SpeechProcessor
+from ..services.fact_checker import run_fact_check
+from ..services.cpu_executor import run_cpu
+from ..services import json_codec, metrics
+from ..services.upstream_scheduler import BATCH, priority as upstream_priority
+from ..services.retrieval_verifier import verify_with_osint, text_cache_key
+from ..services.storage import result_key, storage
+from ..services.response_shaping import DETAIL_PATTERN, shape
+from utils.config import settings
 
 router = APIRouter()
-news_analyzer = NewsAnalyzer()
 speech_processor = SpeechProcessor()
-fact_checker = FactChecker()
 
 
-@router.post("/check-text")
-async def check_news_text(text: str = Form(...), language: str = Form("en")):
-    """Analyze text news for authenticity"""
-    try:
-        # Analyze the news content
-        analysis = news_analyzer.analyze_text(text, language)
+async def _local_checks(text: str, language: str):
+    """Rule-based analysis and pattern fact-check, off the event loop for large inputs"""
+    return await asyncio.gather(
+        run_cpu(run_analysis, text, language, size=len(text)),
+        run_cpu(run_fact_check, text, size=len(text)),
+    )
 
-        # Fact check against known sources
-        fact_check = await fact_checker.verify_claims(text)
 
-        # Retrieval-augmented verification (Tavily + Gemini)
-        verification = await asyncio.to_thread(verify_with_osint, text)
+async def _run_checks(text: str, language: str, verify: bool = True) -> Dict:
+    """Rule-based analysis, pattern fact-check and OSINT verification for one text"""
+    # Analyze the news content and fact check against known patterns
+    analysis, fact_check = await _local_checks(text, language)
 
-        # Prefer calibrated verification confidence when available
-        overall_conf = analysis.get("confidence_score", 0.5)
-        if isinstance(verification, dict) and verification.get("status") == "ok":
-            overall_conf = float(verification.get("confidence", overall_conf))
+    # Retrieval-augmented verification (Tavily + Gemini)
+    verification = await verify_with_osint(text) if verify else {
+        "status": "skipped", "reason": "verification disabled"}
 
-        return {
-            "status": "success",
-            "analysis": analysis,
-            "fact_check": fact_check,
-            "verification": verification,
-            "confidence_score": overall_conf
-        }
+    # Prefer calibrated verification confidence when available
+    overall_conf = analysis.get("confidence_score", 0.5)
+    if isinstance(verification, dict) and verification.get("status") == "ok":
+        overall_conf = float(verification.get("confidence", overall_conf))
+
+    return {
+        "analysis": analysis,
+        "fact_check": fact_check,
+        "verification": verification,
+        "confidence_score": overall_conf
+    }
+
+
+def _timings(breakdown: Dict[str, float], requested: bool) -> Dict:
+    return {"timings_ms": breakdown} if requested else {}
+
+
+def _text_key(text: str, language: str) -> str:
+    """Language plus the verifier's text hash: identifies the input a result was computed for"""
+    return f"{language}:{text_cache_key(text)}"
+
+
+def _record(user_id: Optional[str], text: str, language: str, input_type: str, checks: Dict) -> None:
+    """Add the check to the user's history without waiting for the write.
+
+    The result is stored once per text and outcome (shared by every user who got it); the
+    history row only references it.
+    """
+    if user_id:
+        result = {"status": "success", **checks}
+        storage.add_history({
+            "user_id": user_id,
+            "input_text": text,
+            "input_type": input_type,
+            "result": result,
+            "result_key": result_key(_text_key(text, language), result),
+        })
+
+
+@router.post("/check-text")
+async def check_news_text(text: str = Form(...), language: str = Form("en"),
+                          user_id: Optional[str] = Form(None), timings: bool = False,
+                          detail: str = Query("full", pattern=DETAIL_PATTERN),
+                          fields: Optional[str] = None):
+    """Analyze text news for authenticity (`?timings=true` adds a per-stage `timings_ms` breakdown).
+
+    With `user_id`, the check is added to that user's history (see /history/{user_id}).
+    `detail=compact|summary` and `fields=` shrink the response (see response_shaping).
+    """
+    try:
+        with metrics.collect_timings() as breakdown:
+            checks = await _run_checks(text, language)
+        _record(user_id, text, language, "text", checks)
+        return json_codec.JSONResponse(
+            shape({"status": "success", **checks, **_timings(breakdown, timings)}, detail, fields))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _format_event(event: str, data: Dict, sse: bool) -> str:
+    if sse:
+        return f"event: {event}\ndata: {json_codec.dumps(data).decode()}\n\n"
+    return json_codec.dumps({"event": event, "data": data}).decode() + "\n"
+
+
+@router.post("/check-text/stream")
+async def check_news_text_stream(request: Request, text: str = Form(...), language: str = Form("en"),
+                                 user_id: Optional[str] = Form(None)):
+    """Streaming variant of /check-text.
+
+    Emits the local analysis immediately, then the extracted claims and each per-claim verdict as
+    it completes, then the same final payload /check-text returns. Sends Server-Sent Events when
+    the client accepts text/event-stream, NDJSON ({"event", "data"} per line) otherwise.
+    """
+    sse = "text/event-stream" in request.headers.get("accept", "")
+
+    async def stream():
+        try:
+            analysis, fact_check = await _local_checks(text, language)
+            yield _format_event("analysis", {"analysis": analysis, "fact_check": fact_check}, sse)
+
+            events: asyncio.Queue = asyncio.Queue()
+            verify_task = asyncio.create_task(verify_with_osint(
+                text, on_event=lambda name, data: events.put_nowait((name, data))))
+            try:
+                while not verify_task.done() or not events.empty():
+                    get_event = asyncio.ensure_future(events.get())
+                    await asyncio.wait({get_event, verify_task}, return_when=asyncio.FIRST_COMPLETED)
+                    if get_event.done():
+                        name, data = get_event.result()
+                        yield _format_event(name, data, sse)
+                    else:
+                        get_event.cancel()
+                verification = verify_task.result()
+            finally:
+                verify_task.cancel()
+
+            overall_conf = analysis.get("confidence_score", 0.5)
+            if isinstance(verification, dict) and verification.get("status") == "ok":
+                overall_conf = float(verification.get("confidence", overall_conf))
+            checks = {
+                "analysis": analysis,
+                "fact_check": fact_check,
+                "verification": verification,
+                "confidence_score": overall_conf
+            }
+            _record(user_id, text, language, "text", checks)
+            yield _format_event("result", {"status": "success", **checks}, sse)
+        except Exception as e:
+            yield _format_event("error", {"status": "error", "detail": str(e)}, sse)
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+def _parse_batch(body: bytes, content_type: str) -> BatchCheckRequest:
+    """Accept a JSON object ({"items": [...]}), a JSON array of items, or NDJSON (one item per line)"""
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items = [json_codec.loads(line) for line in body.decode("utf-8").splitlines() if line.strip()]
+        return BatchCheckRequest(items=items)
+    data = json_codec.loads(body or b"{}")
+    if isinstance(data, list):
+        return BatchCheckRequest(items=data)
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object or array")
+    return BatchCheckRequest(**data)
+
+
+@router.post("/check-batch")
+async def check_news_batch(request: Request, detail: str = Query("full", pattern=DETAIL_PATTERN),
+                           fields: Optional[str] = None):
+    """Check many texts in one request; streams one NDJSON result line per item, in input order.
+
+    Identical texts are checked once, and claims shared between items reuse the same
+    search/verdict work through the verifier's claim cache and request coalescing.
+    """
+    try:
+        batch = _parse_batch(await request.body(), request.headers.get("content-type", ""))
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid batch: {e}")
+    if not batch.items:
+        raise HTTPException(status_code=400, detail="Batch has no items")
+    if len(batch.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"Batch exceeds {settings.BATCH_MAX_ITEMS} items")
+
+    sem = asyncio.Semaphore(max(1, settings.BATCH_MAX_PARALLEL))
+    first_index: Dict[str, int] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run(item: BatchItem) -> Dict:
+        async with sem:
+            return await _run_checks(item.text, item.language, verify=batch.verify)
+
+    # Dedupe identical texts (same key the verifier caches on) and start them all; their
+    # upstream calls queue behind interactive requests
+    keys: List[str] = []
+    with upstream_priority(BATCH):
+        for index, item in enumerate(batch.items):
+            key = _text_key(item.text, item.language)
+            keys.append(key)
+            if key not in tasks:
+                first_index[key] = index
+                tasks[key] = asyncio.create_task(run(item))
+
+    async def stream():
+        try:
+            for index, (item, key) in enumerate(zip(batch.items, keys)):
+                line = {"index": index, "id": item.id}
+                try:
+                    line.update({"status": "success", **await tasks[key]})
+                except Exception as e:
+                    line.update({"status": "error", "detail": str(e)})
+                if first_index[key] != index:
+                    line["duplicate_of"] = first_index[key]
+                yield json_codec.dumps(shape(line, detail, fields)) + b"\n"
+        finally:
+            # Client went away mid-stream: don't leave work running for nobody
+            for task in tasks.values():
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.post("/check-voice")
-async def check_news_voice(audio_file: UploadFile = File(...), language: str = Form("en")):
+async def check_news_voice(audio_file: UploadFile = File(...), language: str = Form("en"),
+                           user_id: Optional[str] = Form(None), timings: bool = False,
+                           detail: str = Query("full", pattern=DETAIL_PATTERN),
+                           fields: Optional[str] = None):
     """Process voice input and check news"""
     try:
-        # Convert speech to text
-        text = await speech_processor.speech_to_text(audio_file, language)
-
-        # Analyze the converted text
-        analysis = news_analyzer.analyze_text(text, language)
-        fact_check = await fact_checker.verify_claims(text)
-        verification = await asyncio.to_thread(verify_with_osint, text)
+        with metrics.collect_timings() as breakdown:
+            # Convert speech to text
+            text = await speech_processor.speech_to_text(audio_file, language)
 
-        overall_conf = analysis.get("confidence_score", 0.5)
-        if isinstance(verification, dict) and verification.get("status") == "ok":
-            overall_conf = float(verification.get("confidence", overall_conf))
+            # Analyze the converted text
+            checks = await _run_checks(text, language)
+        _record(user_id, text, language, "voice", checks)
 
-        return {
+        return json_codec.JSONResponse(shape({
             "status": "success",
             "original_text": text,
-            "analysis": analysis,
-            "fact_check": fact_check,
-            "verification": verification,
-            "confidence_score": overall_conf
-        }
+            **checks,
+            **_timings(breakdown, timings)
+        }, detail, fields))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -74,38 +249,56 @@ async def check_news_voice(audio_file: UploadFile = File(...), language: str = F
 async def check_news_image(
     image_file: UploadFile = File(...),
     text: Optional[str] = Form(None),
-    language: str = Form("en")
+    language: str = Form("en"),
+    user_id: Optional[str] = Form(None),
+    timings: bool = False,
+    detail: str = Query("full", pattern=DETAIL_PATTERN),
+    fields: Optional[str] = None
 ):
     """Analyze image with potential fake news"""
     try:
-        # Extract text from image using OCR
-        extracted_text = await news_analyzer.extract_text_from_image(image_file)
+        with metrics.collect_timings() as breakdown:
+            # Extract text from image using OCR
+            extracted_text = await news_analyzer.extract_text_from_image(image_file)
 
-        # Combine with provided text
-        full_text = f"{text or ''} {extracted_text}".strip()
+            # Combine with provided text
+            full_text = f"{text or ''} {extracted_text}".strip()
 
-        analysis = news_analyzer.analyze_text(full_text, language)
-        fact_check = await fact_checker.verify_claims(full_text)
-        verification = await asyncio.to_thread(verify_with_osint, full_text)
+            checks = await _run_checks(full_text, language)
+        _record(user_id, full_text, language, "image", checks)
 
-        overall_conf = analysis.get("confidence_score", 0.5)
-        if isinstance(verification, dict) and verification.get("status") == "ok":
-            overall_conf = float(verification.get("confidence", overall_conf))
-
-        return {
+        return json_codec.JSONResponse(shape({
             "status": "success",
             "extracted_text": extracted_text,
-            "analysis": analysis,
-            "fact_check": fact_check,
-            "verification": verification,
-            "confidence_score": overall_conf
-        }
+            **checks,
+            **_timings(breakdown, timings)
+        }, detail, fields))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/history/{user_id}")
-async def get_check_history(user_id: str):
-    """Get user's fact-check history"""
-    # Implementation for history retrieval
-    return {"user_id": user_id, "history": []}
+async def get_check_history(user_id: str, limit: int = Query(20, ge=1, le=100),
+                            cursor: Optional[str] = None,
+                            view: str = Query("summary", pattern="^(summary|full)$")):
+    """Get user's fact-check history, newest first.
+
+    `view=summary` (default) returns verdict, confidence and risk per check; `view=full` the
+    complete stored result, per-claim evidence included (also at /results/{result_key}).
+    Pass the returned `next_cursor` as `cursor` for the next page.
+    """
+    try:
+        history, next_cursor = await asyncio.to_thread(
+            storage.history_page, user_id, limit, cursor, view)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"user_id": user_id, "view": view, "history": history, "next_cursor": next_cursor}
+
+
+@router.get("/results/{result_key}")
+async def get_check_result(result_key: str):
+    """Full stored check result referenced by history entries"""
+    result = await asyncio.to_thread(storage.get_result, result_key)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Result not found")
+    return result
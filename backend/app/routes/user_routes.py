@@ -1,14 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List, Optional
-from ..models.user_model import User, CheckHistory
+import asyncio
+from ..models.user_model import User
+from ..services.storage import storage
 from utils.helpers import get_current_user
 
 router = APIRouter()
 
-# Mock database (replace with actual database in production)
-users_db = {}
-history_db = {}
-
 
 @router.post("/register")
 async def register_user(user_data: dict):
@@ -19,9 +17,6 @@ async def register_user(user_data: dict):
             raise HTTPException(
                 status_code=400, detail="Email or phone required")
 
-        if user_id in users_db:
-            raise HTTPException(status_code=400, detail="User already exists")
-
         user = User(
             id=user_id,
             email=user_data.get("email"),
@@ -30,13 +25,16 @@ async def register_user(user_data: dict):
             preferred_language=user_data.get("preferred_language", "en")
         )
 
-        users_db[user_id] = user.dict()
+        if not await asyncio.to_thread(storage.add_user, user.dict()):
+            raise HTTPException(status_code=400, detail="User already exists")
 
         return {
             "status": "success",
             "user_id": user_id,
             "message": "User registered successfully"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -44,53 +42,53 @@ async def register_user(user_data: dict):
 @router.get("/profile/{user_id}")
 async def get_user_profile(user_id: str):
     """Get user profile"""
-    if user_id not in users_db:
+    user = await asyncio.to_thread(storage.get_user, user_id)
+    if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return users_db[user_id]
+    return user
 
 
 @router.post("/history/{user_id}")
 async def add_check_history(user_id: str, history_item: dict):
     """Add fact-check history for user"""
     try:
-        if user_id not in history_db:
-            history_db[user_id] = []
-
-        history_entry = CheckHistory(
-            id=len(history_db[user_id]) + 1,
-            user_id=user_id,
-            input_text=history_item.get("input_text", ""),
-            input_type=history_item.get("input_type", "text"),
-            result=history_item.get("result", {}),
-            timestamp=history_item.get("timestamp")
-        )
-
-        history_db[user_id].append(history_entry.dict())
+        # written with other pending rows in one transaction; returns once committed
+        history_id = await asyncio.wrap_future(storage.add_history({
+            "user_id": user_id,
+            "input_text": history_item.get("input_text", ""),
+            "input_type": history_item.get("input_type", "text"),
+            "result": history_item.get("result", {}),
+            "timestamp": history_item.get("timestamp")
+        }))
 
-        return {"status": "success", "message": "History added"}
+        return {"status": "success", "message": "History added", "id": history_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/history/{user_id}")
-async def get_user_history(user_id: str, limit: int = 10):
-    """Get user's fact-check history"""
-    if user_id not in history_db:
-        return {"history": []}
+async def get_user_history(user_id: str, limit: int = Query(10, ge=1, le=100),
+                           cursor: Optional[str] = None):
+    """Get user's fact-check history, newest first.
 
-    history = history_db[user_id][-limit:]
+    Pass the returned `next_cursor` as `cursor` to get the following page (null on the last one).
+    """
+    try:
+        history, next_cursor = await asyncio.to_thread(storage.history_page, user_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {
         "user_id": user_id,
-        "history": history[::-1]  # Return in reverse chronological order
+        "history": history,
+        "next_cursor": next_cursor
     }
 
 
 @router.put("/preferences/{user_id}")
 async def update_user_preferences(user_id: str, preferences: dict):
     """Update user preferences"""
-    if user_id not in users_db:
+    if await asyncio.to_thread(storage.update_user, user_id, preferences) is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    users_db[user_id].update(preferences)
     return {"status": "success", "message": "Preferences updated"}
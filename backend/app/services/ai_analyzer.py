@@ -1,36 +1,72 @@
+import asyncio
 import re
-import json
-from typing import Dict, List
-import io
+from typing import Dict, List, Optional
 import base64
 import logging
-from urllib import request, error
 from utils.config import settings
+from . import http_client, image_prep, metrics, ocr_engine
+from .model_router import gemini_router, vision_models
+from .lexicon import KeywordCounter
 
 logger = logging.getLogger(__name__)
 
 
+# Keyword lexicons for the rule-based analyzers (matched case-insensitively as substrings)
+POSITIVE_WORDS = ['good', 'great', 'excellent', 'amazing',
+                  'wonderful', 'positive', 'success', 'strong', 'growth']
+NEGATIVE_WORDS = ['bad', 'terrible', 'horrible', 'awful',
+                  'disaster', 'crisis', 'failure', 'collapse', 'death']
+SENSATIONAL_WORDS = ['shocking', 'unbelievable', 'you won\'t believe',
+                     'they don\'t want', 'secret revealed', 'exclusive']
+VAGUE_PHRASES = ['some people say', 'experts claim',
+                 'allegedly', 'reportedly', 'rumor has it']
+EMOTIONAL_APPEAL_WORDS = ['outrageous', 'disgusting',
+                          'evil', 'conspiracy', 'cover-up', 'corruption']
+CREDIBLE_SOURCES = ['reuters', 'ap news', 'bbc',
+                    'associated press', 'government', 'official', 'study', 'research']
+URGENCY_WORDS = ['urgent', 'breaking', 'shocking', 'alert', 'warning']
+EMOTIONAL_WORDS = ['outrageous', 'unbelievable', 'amazing', 'terrible']
+VAGUE_WORDS = ['they', 'them', 'some people', 'experts say']
+RISK_KEYWORDS = {
+    'high': ['death', 'kill', 'emergency', 'danger', 'warning'],
+    'medium': ['fake', 'hoax', 'scam', 'fraud'],
+    'low': ['maybe', 'possibly', 'rumor']
+}
+
+# Every lexicon in one shared-lowercase counter; only these lists need full occurrence counts
+_COUNTED_WORDS = URGENCY_WORDS + EMOTIONAL_WORDS + VAGUE_WORDS + \
+    RISK_KEYWORDS['high'] + RISK_KEYWORDS['medium']
+LEXICON = KeywordCounter(
+    POSITIVE_WORDS + NEGATIVE_WORDS + SENSATIONAL_WORDS + VAGUE_PHRASES + EMOTIONAL_APPEAL_WORDS +
+    CREDIBLE_SOURCES + _COUNTED_WORDS + RISK_KEYWORDS['low'],
+    counted=_COUNTED_WORDS,
+)
+
+
 class NewsAnalyzer:
     def __init__(self):
         # Rule-based analysis (no heavy ML dependencies required)
         self.sentiment_analyzer = None
         self.fake_news_detector = None
-        self.reader = None
 
+    @metrics.timed("analysis")
     def analyze_text(self, text: str, language: str = "en") -> Dict:
         """Analyze text for fake news indicators using rule-based approach"""
 
         # Basic text analysis
         text_metrics = self._calculate_text_metrics(text)
 
+        # Count every keyword lexicon below over one lowercased copy of the text
+        hits = LEXICON.scan(text)
+
         # Rule-based sentiment analysis (no ML needed)
-        sentiment = self._analyze_sentiment_rules(text)
+        sentiment = self._analyze_sentiment_rules(text, hits)
 
         # Rule-based fake news detection
-        fake_news_score = self._detect_fake_news_rules(text)
+        fake_news_score = self._detect_fake_news_rules(text, hits)
 
         # Linguistic analysis
-        linguistic_features = self._analyze_linguistic_features(text)
+        linguistic_features = self._analyze_linguistic_features(text, hits)
 
         return {
             "text_metrics": text_metrics,
@@ -38,20 +74,15 @@ class NewsAnalyzer:
             "fake_news_probability": fake_news_score,
             "linguistic_features": linguistic_features,
             "confidence_score": self._calculate_confidence(text_metrics, linguistic_features),
-            "risk_level": self._determine_risk_level(text)
+            "risk_level": self._determine_risk_level(text, hits)
         }
 
-    def _analyze_sentiment_rules(self, text: str) -> Dict:
+    def _analyze_sentiment_rules(self, text: str, hits: Optional[Dict[str, int]] = None) -> Dict:
         """Detect sentiment using keyword-based rules"""
-        text_lower = text.lower()
-
-        positive_words = ['good', 'great', 'excellent', 'amazing',
-                          'wonderful', 'positive', 'success', 'strong', 'growth']
-        negative_words = ['bad', 'terrible', 'horrible', 'awful',
-                          'disaster', 'crisis', 'failure', 'collapse', 'death']
+        hits = hits if hits is not None else LEXICON.scan(text)
 
-        pos_count = sum(1 for word in positive_words if word in text_lower)
-        neg_count = sum(1 for word in negative_words if word in text_lower)
+        pos_count = sum(1 for word in POSITIVE_WORDS if hits[word])
+        neg_count = sum(1 for word in NEGATIVE_WORDS if hits[word])
 
         if pos_count > neg_count:
             return {"label": "POSITIVE", "score": min(0.95, 0.5 + pos_count * 0.1)}
@@ -60,37 +91,27 @@ class NewsAnalyzer:
         else:
             return {"label": "NEUTRAL", "score": 0.5}
 
-    def _detect_fake_news_rules(self, text: str) -> float:
+    def _detect_fake_news_rules(self, text: str, hits: Optional[Dict[str, int]] = None) -> float:
         """Detect fake news probability using rule-based patterns"""
-        text_lower = text.lower()
+        hits = hits if hits is not None else LEXICON.scan(text)
         score = 0.3  # baseline
 
         # Check for sensationalism
-        sensational_words = ['shocking', 'unbelievable', 'you won\'t believe',
-                             'they don\'t want', 'secret revealed', 'exclusive']
-        sensational_count = sum(
-            1 for word in sensational_words if word in text_lower)
+        sensational_count = sum(1 for word in SENSATIONAL_WORDS if hits[word])
         score += sensational_count * 0.15
 
         # Check for vague language
-        vague_phrases = ['some people say', 'experts claim',
-                         'allegedly', 'reportedly', 'rumor has it']
-        vague_count = sum(
-            1 for phrase in vague_phrases if phrase in text_lower)
+        vague_count = sum(1 for phrase in VAGUE_PHRASES if hits[phrase])
         score += vague_count * 0.1
 
         # Check for emotional appeals
-        emotional_words = ['outrageous', 'disgusting',
-                           'evil', 'conspiracy', 'cover-up', 'corruption']
         emotional_count = sum(
-            1 for word in emotional_words if word in text_lower)
+            1 for word in EMOTIONAL_APPEAL_WORDS if hits[word])
         score += emotional_count * 0.12
 
         # Check for credible sources
-        credible_sources = ['reuters', 'ap news', 'bbc',
-                            'associated press', 'government', 'official', 'study', 'research']
         credible_count = sum(
-            1 for source in credible_sources if source in text_lower)
+            1 for source in CREDIBLE_SOURCES if hits[source])
         score -= credible_count * 0.1
 
         # Check for numbers and dates (typically more credible)
@@ -108,25 +129,20 @@ class NewsAnalyzer:
             "word_count": len(words),
             "sentence_count": len([s for s in sentences if s.strip()]),
             "avg_sentence_length": len(words) / max(len([s for s in sentences if s.strip()]), 1),
-            "capital_ratio": sum(1 for c in text if c.isupper()) / max(len(text), 1),
+            "capital_ratio": sum(map(str.isupper, text)) / max(len(text), 1),
             "exclamation_count": text.count('!'),
             "question_count": text.count('?')
         }
 
-    def _analyze_linguistic_features(self, text: str) -> Dict:
+    def _analyze_linguistic_features(self, text: str, hits: Optional[Dict[str, int]] = None) -> Dict:
         """Analyze linguistic patterns associated with fake news"""
-        # Common fake news indicators
-        urgency_words = ['urgent', 'breaking', 'shocking', 'alert', 'warning']
-        emotional_words = ['outrageous', 'unbelievable', 'amazing', 'terrible']
-        vague_words = ['they', 'them', 'some people', 'experts say']
-
-        text_lower = text.lower()
+        hits = hits if hits is not None else LEXICON.scan(text)
 
         return {
-            "urgency_score": sum(text_lower.count(word) for word in urgency_words),
-            "emotional_score": sum(text_lower.count(word) for word in emotional_words),
-            "vague_references": sum(text_lower.count(word) for word in vague_words),
-            "has_clickbait": any(word in text_lower for word in urgency_words[:3])
+            "urgency_score": sum(hits[word] for word in URGENCY_WORDS),
+            "emotional_score": sum(hits[word] for word in EMOTIONAL_WORDS),
+            "vague_references": sum(hits[word] for word in VAGUE_WORDS),
+            "has_clickbait": any(hits[word] for word in URGENCY_WORDS[:3])
         }
 
     def _calculate_confidence(self, text_metrics: Dict, linguistic_features: Dict) -> float:
@@ -147,19 +163,12 @@ class NewsAnalyzer:
 
         return max(0.1, min(0.95, base_score))
 
-    def _determine_risk_level(self, text: str) -> str:
+    def _determine_risk_level(self, text: str, hits: Optional[Dict[str, int]] = None) -> str:
         """Determine risk level of content"""
-        risk_keywords = {
-            'high': ['death', 'kill', 'emergency', 'danger', 'warning'],
-            'medium': ['fake', 'hoax', 'scam', 'fraud'],
-            'low': ['maybe', 'possibly', 'rumor']
-        }
+        hits = hits if hits is not None else LEXICON.scan(text)
 
-        text_lower = text.lower()
-        high_count = sum(text_lower.count(word)
-                         for word in risk_keywords['high'])
-        medium_count = sum(text_lower.count(word)
-                           for word in risk_keywords['medium'])
+        high_count = sum(hits[word] for word in RISK_KEYWORDS['high'])
+        medium_count = sum(hits[word] for word in RISK_KEYWORDS['medium'])
 
         if high_count > 0:
             return "high"
@@ -168,6 +177,7 @@ class NewsAnalyzer:
         else:
             return "low"
 
+    @metrics.timed("ocr")
     async def extract_text_from_image(self, image_file) -> str:
         """Extract text from image using OCR. If easyocr/Pillow aren't installed,
         return an empty string to keep the API runnable."""
@@ -176,41 +186,23 @@ class NewsAnalyzer:
                             'image/png') or 'image/png'
 
         try:
-            from PIL import Image
-            import easyocr
-            import numpy as np
-
-            image = Image.open(io.BytesIO(image_data)).convert('RGB')
-            image_np = np.array(image)
-
-            if self.reader is None:
-                self.reader = easyocr.Reader(['en', 'hi', 'ta', 'te', 'bn'])
-
-            results = self.reader.readtext(image_np)
-            extracted_text = ' '.join([result[1] for result in results])
-            return extracted_text
+            return await ocr_engine.read_text(image_data)
         except Exception:
             # Fallback: Use Gemini multimodal to OCR without local deps
             try:
-                return self._ocr_with_gemini(image_data, mime_type)
+                return await self._ocr_with_gemini(image_data, mime_type)
             except Exception:
                 return ""
 
-    def _ocr_with_gemini(self, image_bytes: bytes, mime_type: str) -> str:
+    @metrics.timed("ocr_gemini")
+    async def _ocr_with_gemini(self, image_bytes: bytes, mime_type: str) -> str:
         api_key = settings.GOOGLE_API_KEY
-        preferred = settings.GEMINI_MODEL or "gemini-2.5-flash"
-        # try a set of common multimodal-capable variants
-        candidates = [
-            preferred,
-            "gemini-2.5-flash-001",
-            "gemini-2.5-flash-latest",
-            "gemini-1.5-flash",
-            "gemini-1.5-flash-001",
-            "gemini-1.5-flash-latest",
-        ]
         if not api_key:
             return ""
 
+        # downscaled grayscale JPEG of the text area instead of the raw upload
+        image_bytes, mime_type = await asyncio.to_thread(
+            image_prep.encode_for_upload, image_bytes, mime_type)
         b64 = base64.b64encode(image_bytes).decode('utf-8')
         payload = {
             "contents": [
@@ -224,43 +216,42 @@ class NewsAnalyzer:
             ]
         }
 
-        for model in candidates:
+        # multimodal-capable variants, known-good models first
+        for model in gemini_router.candidates(vision_models()):
             url = f"https://generativelanguage.googleapis.com/v1/models/{model}:generateContent?key={api_key}"
-            data = json.dumps(payload).encode('utf-8')
-            req = request.Request(
-                url,
-                data=data,
-                headers={"Content-Type": "application/json"},
-                method="POST",
-            )
             try:
-                with request.urlopen(req, timeout=30.0) as resp:
-                    body = resp.read().decode('utf-8')
-                    res = json.loads(body)
-                    text = ""
-                    try:
-                        candidates_out = res.get("candidates") or []
-                        if candidates_out:
-                            content = candidates_out[0].get("content") or {}
-                            parts = content.get("parts") or []
-                            # concatenate all text parts for OCR output
-                            for p in parts:
-                                if "text" in p:
-                                    text += (p.get("text") or "") + "\n"
-                    except Exception:
-                        text = ""
-                    if text.strip():
-                        return text.strip()
-            except error.HTTPError as e:
+                res = await http_client.post_json(url, payload, timeout=30.0)
+                gemini_router.record_success(model)
+                text = ""
                 try:
-                    detail = e.read().decode('utf-8', errors='ignore')
+                    candidates_out = res.get("candidates") or []
+                    if candidates_out:
+                        content = candidates_out[0].get("content") or {}
+                        parts = content.get("parts") or []
+                        # concatenate all text parts for OCR output
+                        for p in parts:
+                            if "text" in p:
+                                text += (p.get("text") or "") + "\n"
                 except Exception:
-                    detail = ""
+                    text = ""
+                if text.strip():
+                    return text.strip()
+            except http_client.UpstreamHTTPError as e:
                 logger.warning("Gemini OCR HTTPError %s on %s: %s",
-                               e.code, model, detail[:200])
+                               e.status, model, e.body[:200])
+                gemini_router.record_failure(model, str(e), e.status)
                 continue
             except Exception as e:
                 logger.warning("Gemini OCR failed on %s: %s", model, e)
+                gemini_router.record_failure(model, str(e))
                 continue
 
         return ""
+
+
+news_analyzer = NewsAnalyzer()
+
+
+def run_analysis(text: str, language: str = "en") -> Dict:
+    """Module-level entry point for CPU executors (picklable for the process pool)."""
+    return news_analyzer.analyze_text(text, language)
@@ -0,0 +1,427 @@
+"""
+Local index of previously fact-checked claims (ClaimReview), searched before any network call.
+
+Build it from one or more bulk dumps, run from backend/:
+
+    python -m app.services.claim_index build dump.json [more.json ...]
+
+Dumps may be Google Fact Check Tools responses ({"claims": [...]}), schema.org ClaimReview
+objects (a single object, a list or an "@graph"), or NDJSON with one of those per line.
+
+The index is a directory (CLAIM_INDEX_PATH) of flat binary files in native byte order, opened
+with mmap so every worker process shares the same pages and nothing is parsed at startup:
+
+    meta.json                 document/term counts and average document length
+    terms.bin / terms.off     sorted UTF-8 terms and their uint64 offsets (binary-searched)
+    postings.off              uint64 start of each term's postings
+    postings.doc / .tf        uint32 document ids and term frequencies
+    docs.bin / docs.off       JSON record per document and uint64 offsets
+    docs.len                  uint32 token count per document (BM25 length normalization)
+
+`lookup(claim)` ranks candidates with BM25 and accepts the best one only if at least
+CLAIM_INDEX_MIN_SIMILARITY of its tokens appear in the claim, the two share most of their words
+both ways (Dice coefficient >= 0.75), and both or neither are negated ("not", "never", "n't", ...),
+so "X is not true" never reuses the rating of a fact-check of "X". A match whose Dice coefficient
+also reaches CLAIM_INDEX_CONFIDENT_DICE is marked "confident": the caller answers it from the index
+alone, with no search or model call. A rebuilt index is picked up
+automatically (meta.json is re-checked at most every CLAIM_INDEX_RELOAD_SECONDS).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.config import settings
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+_VERSION = 1
+_K1 = 1.2
+_B = 0.75
+# a match must share most words both ways, not be a small part of a longer input (e.g. an article)
+_MIN_DICE = 0.75
+# tokens that flip a claim's meaning; "n't" tokenizes to "t" ("don't" -> "don", "t")
+_NEGATIONS = frozenset(("not", "no", "never", "t", "nor", "neither", "none", "nothing",
+                        "false", "fake", "myth", "hoax", "untrue"))
+
+_FALSE_RATINGS = ("false", "fake", "pants on fire", "incorrect", "hoax", "fabricated",
+                  "not true", "untrue", "wrong", "scam", "baseless")
+_TRUE_RATINGS = ("true", "correct", "accurate")
+_MIXED_RATINGS = ("half", "partly", "mixed", "misleading", "missing context", "unproven")
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def rating_to_verdict(rating: str, value: Any = None, best: Any = None, worst: Any = None) -> str:
+    """Map a ClaimReview rating to "true" / "false" / "uncertain"."""
+    try:
+        value, best, worst = float(value), float(best), float(worst)
+        if best != worst:
+            norm = (value - worst) / (best - worst)
+            if norm <= 0.34:
+                return "false"
+            if norm >= 0.66:
+                return "true"
+            return "uncertain"
+    except (TypeError, ValueError):
+        pass
+    r = (rating or "").strip().lower()
+    if not r or any(m in r for m in _MIXED_RATINGS):
+        return "uncertain"
+    if any(m in r for m in _FALSE_RATINGS):
+        return "false"
+    if any(m in r for m in _TRUE_RATINGS):
+        return "true"
+    return "uncertain"
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def _name(value: Any) -> str:
+    if isinstance(value, dict):
+        return str(value.get("name") or value.get("site") or "")
+    return str(value or "")
+
+
+def _from_factcheck_api(claim: Dict) -> Iterator[Dict]:
+    for review in claim.get("claimReview") or []:
+        rating = review.get("textualRating") or ""
+        publisher = review.get("publisher") or {}
+        yield {
+            "claim": claim.get("text") or "",
+            "claimant": claim.get("claimant") or "",
+            "rating": rating,
+            "verdict": rating_to_verdict(rating),
+            "url": review.get("url") or "",
+            "publisher": _name(publisher),
+            "date": review.get("reviewDate") or claim.get("claimDate") or "",
+            "language": review.get("languageCode") or "",
+        }
+
+
+def _from_schema_org(review: Dict) -> Iterator[Dict]:
+    rating = review.get("reviewRating") or {}
+    text = rating.get("alternateName") or rating.get("name") or ""
+    yield {
+        "claim": review.get("claimReviewed") or "",
+        "claimant": _name((review.get("itemReviewed") or {}).get("author")),
+        "rating": text,
+        "verdict": rating_to_verdict(text, rating.get("ratingValue"),
+                                     rating.get("bestRating"), rating.get("worstRating")),
+        "url": review.get("url") or "",
+        "publisher": _name(review.get("author") or review.get("publisher")),
+        "date": review.get("datePublished") or "",
+        "language": review.get("inLanguage") or "",
+    }
+
+
+def iter_claim_reviews(obj: Any) -> Iterator[Dict]:
+    """Normalized review records from a parsed dump (any of the supported shapes)."""
+    if isinstance(obj, list):
+        for item in obj:
+            yield from iter_claim_reviews(item)
+    elif isinstance(obj, dict):
+        if isinstance(obj.get("claims"), list):
+            yield from iter_claim_reviews(obj["claims"])
+        elif isinstance(obj.get("@graph"), list):
+            yield from iter_claim_reviews(obj["@graph"])
+        elif "claimReview" in obj:
+            yield from _from_factcheck_api(obj)
+        elif "claimReviewed" in obj:
+            yield from _from_schema_org(obj)
+
+
+def load_dump(path: str) -> Iterator[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read()
+    try:
+        yield from iter_claim_reviews(json.loads(raw))
+    except json.JSONDecodeError:
+        for line in raw.splitlines():
+            if line.strip():
+                yield from iter_claim_reviews(json.loads(line))
+
+
+def build_index(records: Iterable[Dict], path: str) -> Dict[str, Any]:
+    """Write an index for `records` to directory `path`, replacing any existing index."""
+    docs: List[Dict] = []
+    seen = set()
+    for rec in records:
+        tokens = tokenize(rec.get("claim") or "")
+        key = (" ".join(tokens), rec.get("url") or "")
+        if not tokens or key in seen:
+            continue
+        seen.add(key)
+        docs.append(rec)
+    if not docs:
+        raise ValueError("no claims found in the dump(s)")
+
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    doc_len = array("I")
+    for doc_id, rec in enumerate(docs):
+        tokens = tokenize(rec["claim"])
+        doc_len.append(len(tokens))
+        counts: Dict[str, int] = {}
+        for t in tokens:
+            counts[t] = counts.get(t, 0) + 1
+        for t, tf in counts.items():
+            postings.setdefault(t, []).append((doc_id, tf))
+
+    tmp = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    terms = sorted(postings, key=lambda t: t.encode("utf-8"))
+    terms_bin, terms_off = bytearray(), array("Q", [0])
+    post_off, post_doc, post_tf = array("Q", [0]), array("I"), array("I")
+    for t in terms:
+        terms_bin += t.encode("utf-8")
+        terms_off.append(len(terms_bin))
+        for doc_id, tf in postings[t]:
+            post_doc.append(doc_id)
+            post_tf.append(tf)
+        post_off.append(len(post_doc))
+
+    docs_bin, docs_off = bytearray(), array("Q", [0])
+    for rec in docs:
+        docs_bin += json.dumps(rec, ensure_ascii=False).encode("utf-8")
+        docs_off.append(len(docs_bin))
+
+    files = {
+        "terms.bin": bytes(terms_bin), "terms.off": terms_off,
+        "postings.off": post_off, "postings.doc": post_doc, "postings.tf": post_tf,
+        "docs.bin": bytes(docs_bin), "docs.off": docs_off, "docs.len": doc_len,
+    }
+    for name, data in files.items():
+        with open(os.path.join(tmp, name), "wb") as f:
+            f.write(data if isinstance(data, bytes) else data.tobytes())
+    meta = {
+        "version": _VERSION,
+        "byteorder": sys.byteorder,
+        "docs": len(docs),
+        "terms": len(terms),
+        "avgdl": sum(doc_len) / len(doc_len),
+        "built_at": time.time(),
+    }
+    # meta.json last: readers treat a directory without it as incomplete
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    old = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.replace(path, old)
+    os.replace(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+    return meta
+
+
+# ---------------------------------------------------------------------------
+# Query
+# ---------------------------------------------------------------------------
+
+class _Mapped:
+    """One opened index: read-only mmaps viewed as typed arrays."""
+
+    def __init__(self, path: str, meta: Dict[str, Any]):
+        self.meta = meta
+        self._maps = []  # kept alive for the views; unmapped when a rebuilt index replaces this one
+
+        def view(name: str, fmt: str | None = None):
+            with open(os.path.join(path, name), "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mm)
+            mv = memoryview(mm)
+            return mv.cast(fmt) if fmt else mv
+
+        self.terms_bin = view("terms.bin")
+        self.terms_off = view("terms.off", "Q")
+        self.post_off = view("postings.off", "Q")
+        self.post_doc = view("postings.doc", "I")
+        self.post_tf = view("postings.tf", "I")
+        self.docs_bin = view("docs.bin")
+        self.docs_off = view("docs.off", "Q")
+        self.doc_len = view("docs.len", "I")
+        self.n_docs = meta["docs"]
+        self.n_terms = meta["terms"]
+        self.avgdl = meta["avgdl"] or 1.0
+
+    def term_id(self, term: str) -> int:
+        """Binary search over the sorted term table; -1 if absent."""
+        key = term.encode("utf-8")
+        lo, hi = 0, self.n_terms
+        off, blob = self.terms_off, self.terms_bin
+        while lo < hi:
+            mid = (lo + hi) // 2
+            cur = blob[off[mid]:off[mid + 1]].tobytes()
+            if cur < key:
+                lo = mid + 1
+            elif cur > key:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def document(self, doc_id: int) -> Dict:
+        return json.loads(self.docs_bin[self.docs_off[doc_id]:self.docs_off[doc_id + 1]].tobytes())
+
+    def search(self, tokens: List[str], k: int) -> List[Tuple[int, float]]:
+        scores: Dict[int, float] = {}
+        n = self.n_docs
+        for term in set(tokens):
+            tid = self.term_id(term)
+            if tid < 0:
+                continue
+            start, end = self.post_off[tid], self.post_off[tid + 1]
+            df = end - start
+            idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            docs, tfs, lens = self.post_doc[start:end], self.post_tf[start:end], self.doc_len
+            norm = _K1 * (1.0 - _B)
+            per_len = _K1 * _B / self.avgdl
+            for doc_id, tf in zip(docs, tfs):
+                s = idf * tf * (_K1 + 1.0) / (tf + norm + per_len * lens[doc_id])
+                scores[doc_id] = scores.get(doc_id, 0.0) + s
+        return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:k]
+
+
+def _negated(tokens: List[str]) -> bool:
+    """Whether a claim contains any negation. Double negatives count as negated too: a mismatch
+    only sends the claim on to web search, while a wrong match would reuse the wrong rating."""
+    return any(t in _NEGATIONS for t in tokens)
+
+
+def _overlap(query: List[str], claim: List[str]) -> Tuple[float, float]:
+    """(share of the fact-checked claim's tokens found in the query, Dice coefficient)."""
+    sq, sc = set(query), set(claim)
+    if not sq or not sc:
+        return 0.0, 0.0
+    common = len(sq & sc)
+    return common / len(sc), 2.0 * common / (len(sq) + len(sc))
+
+
+class ClaimIndex:
+    def __init__(self, path: str, min_similarity: float = 0.8, reload_seconds: float = 30.0,
+                 confident_dice: float = 0.9):
+        self.path = path
+        self.min_similarity = min_similarity
+        self.confident_dice = confident_dice
+        self.reload_seconds = reload_seconds
+        self._index: Optional[_Mapped] = None
+        self._signature = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+
+    def _current(self) -> Optional[_Mapped]:
+        if time.monotonic() - self._checked_at >= self.reload_seconds:
+            self._reopen()
+        return self._index
+
+    def _reopen(self) -> None:
+        with self._lock:
+            self._checked_at = time.monotonic()
+            meta_path = os.path.join(self.path, "meta.json")
+            try:
+                st = os.stat(meta_path)
+            except OSError:
+                return  # no index built (yet); keep whatever is open
+            signature = (st.st_ino, st.st_mtime_ns)
+            if signature == self._signature:
+                return
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                if meta.get("version") != _VERSION or meta.get("byteorder") != sys.byteorder:
+                    raise ValueError("index built by an incompatible version or platform")
+                index = _Mapped(self.path, meta)
+            except Exception as e:
+                logger.error("Failed to open claim index at %s: %s", self.path, e)
+                self._signature = signature
+                return
+            self._index, self._signature = index, signature
+            logger.info("Opened claim index at %s (%d claims)", self.path, meta["docs"])
+
+    def search(self, text: str, k: int = 5) -> List[Dict]:
+        """Top-k BM25 matches for `text`, each record with "score" and "similarity"."""
+        index = self._current()
+        tokens = tokenize(text)
+        if index is None or not tokens:
+            return []
+        out = []
+        for doc_id, score in index.search(tokens, k):
+            rec = index.document(doc_id)
+            claim_tokens = tokenize(rec["claim"])
+            contained, dice = _overlap(tokens, claim_tokens)
+            rec["score"] = round(score, 4)
+            rec["similarity"] = round(contained, 4)
+            rec["dice"] = round(dice, 4)
+            rec["same_polarity"] = _negated(tokens) == _negated(claim_tokens)
+            out.append(rec)
+        return out
+
+    @metrics.timed("claim_index_lookup")
+    def lookup(self, claim: str) -> Optional[Dict]:
+        """The fact-checked claim that matches `claim`, or None."""
+        self.lookups += 1
+        best = None
+        for rec in self.search(claim, k=5):
+            if (rec["similarity"] < self.min_similarity or rec["dice"] < _MIN_DICE
+                    or not rec["same_polarity"]):
+                continue
+            if best is None or (rec["similarity"], rec["dice"]) > (best["similarity"], best["dice"]):
+                best = rec
+        if best is not None:
+            self.hits += 1
+            best["confident"] = best["dice"] >= self.confident_dice
+        return best
+
+    def stats(self) -> Dict[str, Any]:
+        index = self._current()
+        return {
+            "path": self.path,
+            "claims": index.n_docs if index else 0,
+            "terms": index.n_terms if index else 0,
+            "built_at": index.meta.get("built_at") if index else None,
+            "lookups": self.lookups,
+            "hits": self.hits,
+        }
+
+
+claim_index = ClaimIndex(
+    settings.CLAIM_INDEX_PATH,
+    min_similarity=settings.CLAIM_INDEX_MIN_SIMILARITY,
+    reload_seconds=settings.CLAIM_INDEX_RELOAD_SECONDS,
+    confident_dice=settings.CLAIM_INDEX_CONFIDENT_DICE,
+)
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) < 2 or argv[0] != "build":
+        print("usage: python -m app.services.claim_index build DUMP.json [DUMP.json ...]")
+        return 2
+    records = (rec for p in argv[1:] for rec in load_dump(p))
+    meta = build_index(records, settings.CLAIM_INDEX_PATH)
+    print(f"Indexed {meta['docs']} claims ({meta['terms']} terms) into {settings.CLAIM_INDEX_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,70 @@
+"""
+Runs CPU-bound analysis (NewsAnalyzer / FactChecker rule scans) without stalling the event loop.
+
+CPU_EXECUTOR_MODE selects where the work runs:
+- inline:  directly on the event loop (lowest overhead, blocks other connections while it runs)
+- thread:  a dedicated thread pool (little help: str.lower / re scans over a large text hold the
+           GIL for their whole run, so the loop still stalls behind them)
+- process: a process pool (the default; the loop stays responsive, arguments and results are
+           pickled)
+
+Inputs shorter than CPU_OFFLOAD_MIN_CHARS always run inline: for short texts the hand-off
+costs more than the analysis itself. Functions sent to the process pool must be module-level
+(picklable). See benchmarks/bench_event_loop_stall.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from utils.config import settings
+from . import metrics
+
+
+_POOLS: Dict[str, Executor] = {}
+_LOCK = threading.Lock()
+
+
+def _pool(mode: str) -> Executor:
+    with _LOCK:
+        pool = _POOLS.get(mode)
+        if pool is None:
+            workers = settings.CPU_EXECUTOR_WORKERS or None
+            if mode == "process":
+                # spawn: forking a process that already runs loop/pool threads is unsafe
+                pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                pool = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="cpu-analysis")
+            _POOLS[mode] = pool
+        return pool
+
+
+async def run_cpu(func: Callable[..., Any], *args: Any, size: int = 0, mode: str | None = None) -> Any:
+    """Run `func(*args)` according to the configured executor mode.
+
+    `size` is the input length used against CPU_OFFLOAD_MIN_CHARS; `mode` overrides the setting.
+    """
+    mode = (mode or settings.CPU_EXECUTOR_MODE).lower()
+    if mode not in ("thread", "process") or size < settings.CPU_OFFLOAD_MIN_CHARS:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    # stage timings recorded in the pool are shipped back and replayed here (see metrics.capture)
+    result, events = await loop.run_in_executor(
+        _pool(mode), functools.partial(metrics.capture, func, *args))
+    metrics.replay(events)
+    return result
+
+
+def shutdown() -> None:
+    with _LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,125 @@
+"""
+Domain reputation shared by the OSINT verifier (`score_domain`) and FactChecker source analysis.
+
+Ratings are loaded from a CSV file (DOMAIN_REPUTATION_PATH, `domain,score` per line, `#`
+comments) into a trie keyed by reversed host labels, so a rating covers the domain and all of
+its subdomains and the most specific entry wins: `edition.bbc.com` resolves through `bbc.com`,
+`news.gov.in` through `gov.in`, `cdc.gov` through `gov`. Unrated hosts get DEFAULT_SCORE.
+Hosts containing low-credibility markers are capped at LOW_MARKER_CAP.
+
+Scores are memoized per host. See benchmarks/bench_domain_reputation.py.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+from utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCORE = 0.6
+NO_HOST_SCORE = 0.4
+LOW_MARKERS = ("click", "buzz", "viral", "gossip", "tabloid")
+LOW_MARKER_CAP = 0.45
+# Sources at or above this score count as trusted in FactChecker's source analysis
+TRUSTED_SCORE = 0.9
+
+_SCORE = ""  # trie node key holding a rating (labels are never empty)
+
+
+def hostname(url: str) -> str:
+    """Lowercased host of `url` (or of a bare domain), without "www.", port or credentials."""
+    start = url.find("://")
+    host = url[start + 3:] if start >= 0 else url
+    for sep in "/?#":
+        cut = host.find(sep)
+        if cut >= 0:
+            host = host[:cut]
+    host = host.rpartition("@")[2].partition(":")[0].strip().rstrip(".").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainReputation:
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._trie: Dict = {}
+        self._lock = threading.Lock()
+        self.score_host = lru_cache(maxsize=65536)(self._score_host)
+        if path:
+            self.load(path)
+
+    def load(self, path: str) -> int:
+        """Replace all ratings with those in the CSV at `path`; returns the number loaded."""
+        ratings: Dict[str, float] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.split("#", 1)[0].strip()
+                    if not line:
+                        continue
+                    domain, _, score = line.partition(",")
+                    try:
+                        ratings[hostname(domain)] = max(0.0, min(1.0, float(score.split(",")[0])))
+                    except ValueError:
+                        logger.warning("%s:%d: bad reputation entry %r", path, line_no, line)
+        except OSError as e:
+            logger.error("Domain reputation list %s unavailable, every source scores %.2f: %s",
+                         path, DEFAULT_SCORE, e)
+            return 0
+        self.set_ratings(ratings)
+        self.path = path
+        logger.info("Loaded %d domain ratings from %s", len(ratings), path)
+        return len(ratings)
+
+    def set_ratings(self, ratings: Dict[str, float]) -> None:
+        trie: Dict = {}
+        for domain, score in ratings.items():
+            node = trie
+            for label in reversed(domain.split(".")):
+                node = node.setdefault(label, {})
+            node[_SCORE] = score
+        with self._lock:
+            self._trie = trie
+            self.score_host.cache_clear()
+
+    def _lookup(self, host: str) -> float | None:
+        """Rating of the longest rated suffix of `host`, or None."""
+        node, found = self._trie, None
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get(_SCORE, found)
+        return found
+
+    def _score_host(self, host: str) -> float:
+        if not host:
+            return NO_HOST_SCORE
+        score = self._lookup(host)
+        score = DEFAULT_SCORE if score is None else score
+        if any(m in host for m in LOW_MARKERS):
+            score = min(score, LOW_MARKER_CAP)
+        return score
+
+    def score_url(self, url: str) -> float:
+        return self.score_host(hostname(url))
+
+    def score_urls(self, urls: Iterable[str]) -> List[float]:
+        """Scores for a batch of URLs (each distinct host is resolved once)."""
+        score_host = self.score_host
+        return [score_host(hostname(u)) for u in urls]
+
+    def is_trusted(self, url: str) -> bool:
+        return self.score_url(url) >= TRUSTED_SCORE
+
+    def stats(self) -> Dict:
+        info = self.score_host.cache_info()
+        return {"path": self.path, "memo_hits": info.hits, "memo_misses": info.misses,
+                "memo_size": info.currsize}
+
+
+domain_reputation = DomainReputation(settings.DOMAIN_REPUTATION_PATH)
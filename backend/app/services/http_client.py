@@ -0,0 +1,378 @@
+"""
+Shared HTTP transport for upstream APIs (Tavily, Gemini).
+
+- Uses an `httpx.AsyncClient` with keep-alive connection pools per host when httpx is installed.
+- Falls back to a stdlib (`http.client`) keep-alive pool run in a worker thread, so the app
+  still works without third-party HTTP libraries. Set HTTP_BACKEND=stdlib to force it. httpx is
+  in requirements.txt; the fallback logs a warning when it is first used.
+- Async calls are paced by `upstream_scheduler` and retried on throttling / transient errors.
+
+Public functions:
+- post_json(url, payload, headers, timeout) -> dict   (async)
+- post_json_stream(url, payload, headers, timeout) -> async iterator of dicts (Server-Sent Events)
+- aclose()  close pooled connections on shutdown
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http.client
+import logging
+import queue
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from utils.config import settings
+from . import json_codec, metrics
+from .upstream_scheduler import (
+    RETRIES, backoff_delay, estimate_tokens, retry_after, upstream_scheduler, used_tokens,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamHTTPError(RuntimeError):
+    """Non-2xx response from an upstream API; keeps the status code for callers."""
+
+    def __init__(self, status: int, body: str = "", headers: Dict[str, str] | None = None):
+        super().__init__(f"HTTP Error {status}: {body[:500]}")
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+class _StdlibPool:
+    """Keep-alive `http.client` connections, pooled per (scheme, host, port)."""
+
+    def __init__(self, max_per_host: int):
+        self._max_per_host = max_per_host
+        self._pools: Dict[Tuple[str, str, int], queue.LifoQueue] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, key: Tuple[str, str, int]) -> queue.LifoQueue:
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = queue.LifoQueue(maxsize=self._max_per_host)
+                self._pools[key] = pool
+            return pool
+
+    def _connect(self, key: Tuple[str, str, int], timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def request(self, method: str, url: str, body: bytes, headers: Dict[str, str], timeout: float):
+        parts = urlsplit(url)
+        scheme = parts.scheme or "https"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        pool = self._pool(key)
+        try:
+            conn, reused = pool.get_nowait(), True
+        except queue.Empty:
+            conn, reused = self._connect(key, timeout), False
+
+        for attempt in (0, 1):
+            try:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                # A pooled connection may have been closed by the server; retry once on a fresh one
+                if attempt or not reused:
+                    raise
+                conn = self._connect(key, timeout)
+            except Exception:
+                conn.close()
+                raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            try:
+                pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+        return resp.status, dict(resp.getheaders()), data
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+_STDLIB_POOL = _StdlibPool(settings.HTTP_POOL_MAX_CONNECTIONS)
+
+# httpx clients are bound to the event loop that created them
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+_TRANSPORT: Optional[str] = None
+
+
+def _use_httpx() -> bool:
+    global _TRANSPORT
+    if _TRANSPORT is None:
+        if settings.HTTP_BACKEND == "stdlib":
+            _TRANSPORT = "stdlib"
+            reason = "HTTP_BACKEND=stdlib"
+        else:
+            try:
+                import httpx  # noqa: F401
+                _TRANSPORT = "httpx"
+            except ImportError:
+                _TRANSPORT = "stdlib"
+                reason = "httpx is not installed"
+        if _TRANSPORT == "stdlib":
+            logger.warning("%s: upstream calls use the stdlib connection pool in worker threads, "
+                           "which can exhaust the default thread pool under load", reason)
+    return _TRANSPORT == "httpx"
+
+
+def transport_name() -> str:
+    return "httpx" if _use_httpx() else "stdlib"
+
+
+def _async_client():
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_POOL_MAX_CONNECTIONS * 4,
+            max_keepalive_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+        )
+        client = httpx.AsyncClient(limits=limits)
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+def _decode(status: int, headers: Dict[str, str], data: bytes) -> Dict[str, Any]:
+    if status >= 400:
+        text = data.decode("utf-8", errors="ignore")
+        logger.warning("HTTPError %s: %s", status, text)
+        raise UpstreamHTTPError(status, text, headers)
+    return json_codec.loads(data)
+
+
+def _post_sync(url: str, body: bytes, headers: Dict[str, str] | None, timeout: float) -> Dict[str, Any]:
+    hdrs = {"Content-Type": "application/json", **(headers or {})}
+    try:
+        status, resp_headers, data = _STDLIB_POOL.request(
+            "POST", url, body, hdrs, timeout)
+    except Exception as e:
+        logger.warning("HTTP POST failed: %s", e)
+        raise
+    return _decode(status, resp_headers, data)
+
+
+async def _post(url: str, body: bytes, headers: Dict[str, str] | None, timeout: float) -> Dict[str, Any]:
+    if not _use_httpx():
+        return await asyncio.to_thread(_post_sync, url, body, headers, timeout)
+
+    hdrs = {"Content-Type": "application/json", **(headers or {})}
+    try:
+        resp = await _async_client().post(url, content=body, headers=hdrs, timeout=timeout)
+    except Exception as e:
+        logger.warning("HTTP POST failed: %s", e)
+        raise
+    return _decode(resp.status_code, dict(resp.headers), resp.content)
+
+
+UPSTREAM_SECONDS = metrics.REGISTRY.register(metrics.Histogram(
+    "verinews_upstream_request_seconds", "Upstream API call latency", ["host", "status"]))
+
+# Worth retrying: throttling and transient server errors
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Connection-level failures worth retrying (timeouts are not: the deadline is shared)."""
+    if isinstance(exc, TimeoutError):
+        return False
+    if isinstance(exc, (ConnectionError, http.client.HTTPException)):
+        return True
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(exc, httpx.TransportError) and not isinstance(exc, httpx.TimeoutException)
+
+
+def _retry_delay(exc: Exception, attempt: int, provider) -> Optional[float]:
+    """Seconds to wait before retrying a call that failed with `exc`, or None to give up.
+
+    A 429 with a known provider pauses the whole provider instead, so the delay is 0.
+    """
+    if attempt >= settings.UPSTREAM_MAX_RETRIES:
+        return None
+    if isinstance(exc, UpstreamHTTPError):
+        if exc.status not in _RETRY_STATUSES:
+            return None
+        delay = backoff_delay(attempt)
+        if exc.status == 429:
+            wait = retry_after(exc.headers, exc.body)
+            if provider is not None:
+                # everyone queued for this provider waits, not just this call
+                provider.throttle(wait if wait is not None else delay)
+                return 0.0
+            if wait is not None:
+                return wait
+        return delay
+    return backoff_delay(attempt) if _is_transient(exc) else None
+
+
+async def post_json(url: str, payload: Dict[str, Any], headers: Dict[str, str] | None = None,
+                    timeout: float = 15.0) -> Dict[str, Any]:
+    """POST a JSON payload and decode the JSON response without blocking the event loop.
+
+    Calls are paced by the upstream scheduler (per-provider rate and token budgets) and retried
+    up to UPSTREAM_MAX_RETRIES times on 429/5xx and connection errors with jittered backoff.
+    """
+    body = json_codec.dumps(payload)
+    host = urlsplit(url).hostname or ""
+    provider = upstream_scheduler.provider_for(url)
+    tokens = estimate_tokens(body) if provider is not None and provider.tokens is not None else 0
+
+    attempt = 0
+    while True:
+        await upstream_scheduler.acquire(provider, tokens)
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = await _post(url, body, headers, timeout)
+            status = "200"
+            if provider is not None:
+                provider.settle(tokens, used_tokens(result))
+                provider.recover()
+            return result
+        except Exception as e:
+            if isinstance(e, UpstreamHTTPError):
+                status = str(e.status)
+            delay = _retry_delay(e, attempt, provider)
+            if delay is None:
+                raise
+            reason = status if isinstance(e, UpstreamHTTPError) else type(e).__name__
+        finally:
+            UPSTREAM_SECONDS.observe(time.perf_counter() - start, host=host, status=status)
+
+        attempt += 1
+        RETRIES.inc(provider=provider.name if provider else host, reason=reason)
+        logger.info("Retrying %s (attempt %d) in %.2fs after %s", host, attempt, delay, reason)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def _sse_data(line: str) -> Optional[Dict[str, Any]]:
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    return json_codec.loads(data) if data and data != "[DONE]" else None
+
+
+async def _stream_events(url: str, body: bytes, headers: Dict[str, str] | None,
+                         timeout: float) -> AsyncIterator[Dict[str, Any]]:
+    hdrs = {"Content-Type": "application/json", "Accept": "text/event-stream", **(headers or {})}
+    if not _use_httpx():
+        status, resp_headers, data = await asyncio.to_thread(
+            _STDLIB_POOL.request, "POST", url, body, hdrs, timeout)
+        if status >= 400:
+            _decode(status, resp_headers, data)
+        for line in data.decode("utf-8", errors="ignore").splitlines():
+            event = _sse_data(line)
+            if event is not None:
+                yield event
+        return
+
+    async with _async_client().stream("POST", url, content=body, headers=hdrs, timeout=timeout) as resp:
+        if resp.status_code >= 400:
+            _decode(resp.status_code, dict(resp.headers), await resp.aread())
+        async for line in resp.aiter_lines():
+            event = _sse_data(line)
+            if event is not None:
+                yield event
+
+
+async def post_json_stream(url: str, payload: Dict[str, Any], headers: Dict[str, str] | None = None,
+                           timeout: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+    """POST a JSON payload to a Server-Sent Events endpoint (e.g. Gemini `streamGenerateContent?alt=sse`)
+    and yield the JSON `data` of each event as it arrives.
+
+    Paced and retried like `post_json` until the first event; later failures are raised. With the
+    stdlib transport the whole body is read first, so events arrive together at the end. The
+    token estimate is settled against the last usage seen, also when the caller stops early.
+    """
+    body = json_codec.dumps(payload)
+    host = urlsplit(url).hostname or ""
+    provider = upstream_scheduler.provider_for(url)
+    tokens = estimate_tokens(body) if provider is not None and provider.tokens is not None else 0
+
+    attempt = 0
+    while True:
+        await upstream_scheduler.acquire(provider, tokens)
+        start = time.perf_counter()
+        status = "error"
+        last = None
+        usage = 0
+        events = _stream_events(url, body, headers, timeout)
+        try:
+            async for event in events:
+                status, last = "200", event
+                # usage is cumulative; the final event carries it for the whole response
+                usage = used_tokens(event) or usage
+                yield event
+            return
+        except Exception as e:
+            if isinstance(e, UpstreamHTTPError):
+                status = str(e.status)
+            delay = _retry_delay(e, attempt, provider) if last is None else None
+            if delay is None:
+                raise
+            reason = status if isinstance(e, UpstreamHTTPError) else type(e).__name__
+        finally:
+            # also when the caller stops reading early (aclose) or the stream fails midway:
+            # charge the usage seen so far
+            if provider is not None and last is not None:
+                provider.settle(tokens, usage)
+                provider.recover()
+            await events.aclose()
+            UPSTREAM_SECONDS.observe(time.perf_counter() - start, host=host, status=status)
+
+        attempt += 1
+        RETRIES.inc(provider=provider.name if provider else host, reason=reason)
+        logger.info("Retrying %s (attempt %d) in %.2fs after %s", host, attempt, delay, reason)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def aclose() -> None:
+    """Close pooled connections (call on application shutdown)."""
+    clients = list(_ASYNC_CLIENTS.values())
+    _ASYNC_CLIENTS.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+    _STDLIB_POOL.close()
@@ -0,0 +1,143 @@
+"""
+Image preparation before OCR.
+
+Uploads (phone screenshots, 12 MP photos) are reduced to what text recognition needs:
+1. decode at reduced scale where the format allows it (JPEG draft mode) and apply EXIF rotation;
+2. downscale to OCR_TARGET_DPI when the file records a higher DPI, and to at most OCR_MAX_SIDE
+   pixels on the longest side (never upscaled);
+3. convert to grayscale and stretch contrast;
+4. crop to the text area: the union of every block of rows and columns where edges are much
+   denser than in the background, plus a margin, so separate source/date lines are kept. This
+   drops the blank borders and flat or grainy backgrounds around screenshots, photos and scans;
+   EasyOCR's own detector still finds the lines.
+
+`prepare` feeds local EasyOCR; `encode_for_upload` re-encodes the prepared image as grayscale
+JPEG (OCR_UPLOAD_QUALITY) for Gemini, keeping the original when that isn't smaller or can't be
+decoded. OCR_PREP_ENABLED=false skips all of it. See benchmarks/bench_image_prep.py.
+"""
+
+from __future__ import annotations
+
+import io
+from typing import List, Tuple
+
+from utils.config import settings
+from . import metrics
+
+# Edge strength (0-255) that counts as text/content when looking for the crop box
+_EDGE_THRESHOLD = 48
+_CROP_MARGIN = 16
+# Longest side of the copy the crop box is searched on
+_DETECT_SIDE = 600
+# Minimum share of edge pixels for a row/column of that copy to count as content
+_MIN_EDGE_DENSITY = 0.02
+# Shorter runs of content rows/columns on that copy are noise
+_MIN_BAND_ROWS = 2
+
+
+def _scale(size: Tuple[int, int], dpi: float | None) -> float:
+    scale = 1.0
+    if dpi and dpi > settings.OCR_TARGET_DPI:
+        scale = settings.OCR_TARGET_DPI / dpi
+    longest = max(size)
+    if longest * scale > settings.OCR_MAX_SIDE:
+        scale = settings.OCR_MAX_SIDE / longest
+    return scale
+
+
+def _text_box(image) -> Tuple[int, int, int, int] | None:
+    from PIL import Image, ImageFilter
+
+    if min(image.size) < 3 * _MIN_BAND_ROWS:
+        return None
+    # find edges on a small copy: faster, and the box filter averages away photo grain
+    ratio = min(1.0, _DETECT_SIDE / max(image.size))
+    small = image.resize((max(1, round(image.width * ratio)), max(1, round(image.height * ratio))),
+                         Image.BOX) if ratio < 1.0 else image
+    if min(small.size) < 3 * _MIN_BAND_ROWS:
+        return None
+    edges = small.filter(ImageFilter.FIND_EDGES).point(lambda v: 255 if v >= _EDGE_THRESHOLD else 0)
+    # FIND_EDGES marks the 1-pixel frame of the image itself; ignore it
+    w, h = small.size
+    edges = edges.crop((1, 1, w - 1, h - 1))
+    # content rows: edge pixels clearly denser than the background's (the median row) so that
+    # photo grain doesn't count. Each run of content rows (a text block, or a lone source or
+    # date line) gets its own column span; the box is the union of them all.
+    row_profile = edges.resize((1, edges.height), Image.BOX).tobytes()
+    level = max(255 * _MIN_EDGE_DENSITY, 3 * sorted(row_profile)[len(row_profile) // 2])
+    box = None
+    for top, bottom in _runs(row_profile, level):
+        band = edges.crop((0, top, edges.width, bottom + 1))
+        cols = _runs(band.resize((band.width, 1), Image.BOX).tobytes(), level)
+        if not cols:
+            continue
+        span = (cols[0][0], top, cols[-1][1] + 1, bottom + 1)
+        box = span if box is None else (min(box[0], span[0]), min(box[1], span[1]),
+                                        max(box[2], span[2]), max(box[3], span[3]))
+    if box is None:
+        return None
+    left, top, right, bottom = ((v + 1) / ratio for v in box)
+    return (max(0, int(left) - _CROP_MARGIN), max(0, int(top) - _CROP_MARGIN),
+            min(image.width, int(right) + _CROP_MARGIN), min(image.height, int(bottom) + _CROP_MARGIN))
+
+
+def _runs(profile: bytes, level: float) -> List[Tuple[int, int]]:
+    """(first, last) index of each run of `profile` values at or above `level`, ignoring runs
+    shorter than _MIN_BAND_ROWS (specks of grain rather than text)."""
+    runs, start = [], None
+    for i, v in enumerate(profile):
+        if v >= level:
+            if start is None:
+                start = i
+        elif start is not None:
+            if i - start >= _MIN_BAND_ROWS:
+                runs.append((start, i - 1))
+            start = None
+    if start is not None and len(profile) - start >= _MIN_BAND_ROWS:
+        runs.append((start, len(profile) - 1))
+    return runs
+
+
+@metrics.timed("image_prep")
+def prepare(image_bytes: bytes):
+    """Decode `image_bytes` into a downscaled, grayscale, text-cropped PIL image (mode "L")."""
+    from PIL import Image, ImageOps
+
+    image = Image.open(io.BytesIO(image_bytes))
+    dpi = image.info.get("dpi")
+    dpi = float(dpi[0]) if isinstance(dpi, tuple) and dpi and dpi[0] else None
+    scale = _scale(image.size, dpi)
+    target_side = max(1, round(max(image.size) * scale))
+    if scale < 1.0 and image.format == "JPEG":
+        # let the JPEG decoder skip detail we'd throw away (1/2, 1/4 or 1/8 scale)
+        image.draft("L", (int(image.width * scale), int(image.height * scale)))
+    image = ImageOps.exif_transpose(image).convert("L")
+
+    if max(image.size) > target_side:
+        ratio = target_side / max(image.size)
+        # reducing_gap: integer-box shrink first, Lanczos only for the last 2x
+        image = image.resize((max(1, round(image.width * ratio)), max(1, round(image.height * ratio))),
+                             Image.LANCZOS, reducing_gap=2.0)
+    image = ImageOps.autocontrast(image, cutoff=1)
+
+    box = _text_box(image)
+    if box is not None and box != (0, 0, image.width, image.height):
+        image = image.crop(box)
+    return image
+
+
+def encode_for_upload(image_bytes: bytes, mime_type: str) -> Tuple[bytes, str]:
+    """Compact (bytes, mime type) for a vision API upload; the original if Pillow is missing."""
+    if not settings.OCR_PREP_ENABLED:
+        return image_bytes, mime_type
+    try:
+        image = prepare(image_bytes)
+    except Exception:
+        # no Pillow, or a format it can't read (e.g. HEIC): the vision API may still take it
+        return image_bytes, mime_type
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=settings.OCR_UPLOAD_QUALITY, optimize=True)
+    data = buf.getvalue()
+    if len(data) >= len(image_bytes):
+        return image_bytes, mime_type
+    return data, "image/jpeg"
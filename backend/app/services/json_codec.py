@@ -0,0 +1,55 @@
+"""
+JSON encoding for API responses and upstream calls.
+
+Uses orjson when it is installed (JSON_BACKEND=auto) and the stdlib `json` module otherwise or
+with JSON_BACKEND=stdlib. Both produce compact UTF-8 and stringify values JSON can't represent
+(datetimes, sets, ...), so output is interchangeable.
+
+- dumps(obj) -> bytes
+- loads(bytes | str) -> object
+- JSONResponse: starlette JSONResponse rendered with `dumps`; the app's default response class.
+  Routes that return one directly also skip FastAPI's `jsonable_encoder` pass, which on large
+  nested results costs more than the encoding itself. See benchmarks/bench_json_codec.py.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from starlette.responses import JSONResponse as _StarletteJSONResponse
+
+from utils.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if settings.JSON_BACKEND == "stdlib":
+    orjson = None
+
+backend = "orjson" if orjson is not None else "stdlib"
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str, option=_OPTIONS)
+
+    def loads(data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+else:
+    _ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def dumps(obj: Any) -> bytes:
+        return _ENCODER.encode(obj).encode("utf-8")
+
+    def loads(data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class JSONResponse(_StarletteJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
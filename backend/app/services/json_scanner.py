@@ -0,0 +1,181 @@
+"""
+Extraction of the first JSON object from LLM output, whole or as it streams in.
+
+Gemini is asked for "only JSON" but may wrap it in prose or a ```json fence, leave trailing
+commas, or still be writing it. `JSONObjectScanner` reads the text once, chunk by chunk, and
+tracks string/escape state and bracket nesting with a precompiled character class, so the cost is
+linear in the output length whatever the number of braces. (A greedy `{[\\s\\S]*}` regex spans from
+the first to the last brace and backtracks on every failed end.)
+
+- feed(chunk): scan more text.
+- result: the first balanced `{...}` that parses to an object, with trailing commas removed;
+  balanced prose such as "{sic}" is skipped. None until found; later text is ignored.
+- partial(): while that object is still open, its members whose values are complete (everything
+  before the last top-level comma), so leading fields such as "verdict" can be used early.
+- finish(): end of input.
+
+A "{" that can't be the object (prose like "Use { to start.") would otherwise swallow the rest of
+the text. While scanning, the scanner keeps the outermost balanced `{...}` spans nested in the
+object it is reading. When that object turns out not to be JSON (a mismatched bracket, or still
+open at `finish`), those spans are tried in order. This is the same as rescanning from the next
+"{", without reading any text twice.
+
+`first_object(text)` is the one-shot form.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import json_codec
+
+# Characters that change scanner state inside an object: outside strings, then within one
+_STRUCTURE = re.compile(r'["{}\[\],]')
+_STRING = re.compile(r'["\\]')
+_CLOSERS = {"}": "{", "]": "["}
+
+
+class JSONObjectScanner:
+    def __init__(self):
+        self.result: Optional[Dict[str, Any]] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        # text of the object being scanned, and its length
+        self._parts: List[str] = []
+        self._length = 0
+        self._stack: List[str] = []
+        self._starts: List[int] = []  # offset of each open bracket
+        self._inner: List[Tuple[int, int]] = []  # outermost balanced {...} spans inside the object
+        self._in_string = False
+        self._escape = False
+        self._last = ""            # last structural character or "v" for a value
+        self._comma = 0            # offset of the last comma
+        self._drop: List[int] = []  # offsets of trailing commas to remove
+        self._member_end: Optional[int] = None  # offset of the last top-level comma
+        self._partial: Optional[Dict[str, Any]] = None
+        self._partial_end: Optional[int] = None
+
+    def feed(self, chunk: str) -> None:
+        if self.result is not None or not chunk:
+            return
+        i = seg = 0  # seg: where this chunk's part of the current object starts
+        n = len(chunk)
+        while i < n:
+            if not self._stack:
+                j = chunk.find("{", i)
+                if j < 0:
+                    return
+                self._reset()
+                i = seg = j
+            if self._escape:
+                self._escape = False
+                i += 1
+                continue
+            if self._in_string:
+                m = _STRING.search(chunk, i)
+                if m is None:
+                    break
+                i = m.end()
+                if m.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    self._last = "v"
+                continue
+
+            m = _STRUCTURE.search(chunk, i)
+            end = n if m is None else m.start()
+            if i < end and not chunk[i:end].isspace():
+                self._last = "v"  # number or literal
+            if m is None:
+                break
+            i = m.end()
+            c = m.group()
+            offset = self._length + m.start() - seg
+            if c == '"':
+                self._in_string = True
+            elif c == ",":
+                if self._stack == ["{"]:
+                    self._member_end = offset
+                self._comma = offset
+                self._last = c
+            elif c in "{[":
+                self._stack.append(c)
+                self._starts.append(offset)
+                self._last = c
+            else:
+                if self._last == ",":
+                    self._drop.append(self._comma)
+                start = self._starts.pop()
+                if self._stack.pop() != _CLOSERS[c]:
+                    # mismatched: not JSON, but an object nested in it may be
+                    self._parts.append(chunk[seg:i])
+                    self._stack.clear()
+                    self.result = self._from_inner()
+                    if self.result is not None:
+                        return
+                    continue
+                self._last = c
+                if not self._stack:
+                    self._parts.append(chunk[seg:i])
+                    self.result = self._parse(self._length + i - seg)
+                    if self.result is not None:
+                        return
+                elif c == "}":
+                    while self._inner and self._inner[-1][0] > start:
+                        self._inner.pop()
+                    self._inner.append((start, offset + 1))
+        if self._stack:
+            self._parts.append(chunk[seg:])
+            self._length += n - seg
+
+    def _text(self, end: int, start: int = 0) -> str:
+        text = "".join(self._parts)
+        self._parts = [text]
+        pieces = []
+        for k in range(bisect_left(self._drop, start), len(self._drop)):
+            pos = self._drop[k]
+            if pos >= end:
+                break
+            pieces.append(text[start:pos])
+            start = pos + 1
+        pieces.append(text[start:end])
+        return "".join(pieces)
+
+    def _parse(self, end: int, suffix: str = "", start: int = 0) -> Optional[Dict[str, Any]]:
+        try:
+            value = json_codec.loads(self._text(end, start) + suffix)
+        except ValueError:
+            return None
+        return value if isinstance(value, dict) else None
+
+    def _from_inner(self) -> Optional[Dict[str, Any]]:
+        """First of the balanced spans nested in an object that isn't JSON that parses."""
+        for start, end in self._inner:
+            value = self._parse(end, start=start)
+            if value is not None:
+                return value
+        return None
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        if self.result is None and self._stack:
+            self._stack.clear()
+            self.result = self._from_inner()
+        return self.result
+
+    def partial(self) -> Optional[Dict[str, Any]]:
+        if self.result is not None:
+            return self.result
+        if self._member_end is not None and self._member_end != self._partial_end:
+            self._partial_end = self._member_end
+            self._partial = self._parse(self._member_end, "}")
+        return self._partial
+
+
+def first_object(text: str) -> Optional[Dict[str, Any]]:
+    scanner = JSONObjectScanner()
+    scanner.feed(text or "")
+    return scanner.finish()
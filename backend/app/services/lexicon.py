@@ -0,0 +1,39 @@
+"""
+Shared-lowercase keyword counter for the rule-based analyzers.
+
+`KeywordCounter.scan(text)` lowercases the text once and counts every lexicon keyword in it, so
+the analyzers no longer lowercase the text per helper, and keywords shared by several lexicons
+are searched once. It is not a single-pass matcher: each distinct keyword is still its own
+C-level `str.count` / `in` over the lowered text, so the gain over the old per-helper scans is
+modest (about 1.1-1.2x on ASCII text). Counts are non-overlapping, exactly what
+`text.lower().count(keyword)` gives, so scores are unchanged.
+
+Single-pass alternatives were measured: a combined `re` alternation is several times slower (it
+retries every alternative at each position) and an Aho-Corasick automaton (pyahocorasick) is no
+faster at this lexicon size. See benchmarks/bench_lexicon.py.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable
+
+
+class KeywordCounter:
+    def __init__(self, keywords: Iterable[str], counted: Iterable[str] = ()):
+        """`keywords`: every keyword to match; `counted`: those whose full count is needed.
+        The rest only need presence, so their search stops at the first hit."""
+        self.keywords = list(dict.fromkeys(k.lower() for k in keywords))
+        counted = {k.lower() for k in counted}
+        self._counted = [k for k in self.keywords if k in counted]
+        self._presence = [k for k in self.keywords if k not in counted]
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """Map each keyword to its non-overlapping occurrence count in `text` (case-insensitive).
+
+        Presence-only keywords are reported as 0 or 1.
+        """
+        text_lower = text.lower()
+        hits = {kw: text_lower.count(kw) for kw in self._counted}
+        for kw in self._presence:
+            hits[kw] = 1 if kw in text_lower else 0
+        return hits
@@ -0,0 +1,224 @@
+"""
+Lightweight metrics (Prometheus text format) without a client-library dependency.
+
+- `stage(name)`: context manager timing a pipeline stage into the `verinews_stage_seconds`
+  histogram, and into the current request's breakdown when `collect_timings()` is active.
+- Counters and histograms are process-local; with several uvicorn workers, scrape each worker
+  (or run one) as usual for non-multiprocess Prometheus clients.
+- Collectors registered with `register_collector` are called at scrape time to export state kept
+  elsewhere (model router counters, cache hit ratios).
+
+Work running in an executor (see cpu_executor) is wrapped by `capture`, which records its stage
+timings instead of observing them; the caller replays them on the event loop so timings from a
+process pool are not lost and thread-pool timings reach the right request.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _fmt_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for k, v in labels.items():
+        v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name + "_total", dict(zip(self.labelnames, k)), v) for k, v in items]
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        out: List[Sample] = []
+        for key, row in items:
+            labels = dict(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, row):
+                out.append((self.name + "_bucket", {**labels, "le": _fmt_value(float(bound))}, count))
+            out.append((self.name + "_bucket", {**labels, "le": "+Inf"}, row[-1]))
+            out.append((self.name + "_sum", labels, row[-2]))
+            out.append((self.name + "_count", labels, row[-1]))
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Any] = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, fn: Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]):
+        """`fn()` yields (name, type, help, samples) at scrape time."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        families = [(m.name, m.type, m.help, m.samples()) for m in self._metrics]
+        for fn in self._collectors:
+            try:
+                families.extend(fn())
+            except Exception as e:  # a broken collector must not break the scrape
+                families.append(("verinews_collector_errors", "gauge", f"collector error: {e}",
+                                 [("verinews_collector_errors", {"collector": fn.__name__}, 1)]))
+        lines = []
+        for name, mtype, help_text, samples in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {mtype}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_fmt_labels(labels)} {_fmt_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "verinews_stage_seconds", "Time spent per pipeline stage", ["stage"]))
+STAGE_ERRORS = REGISTRY.register(Counter(
+    "verinews_stage_errors", "Pipeline stages that raised", ["stage"]))
+HTTP_SECONDS = REGISTRY.register(Histogram(
+    "verinews_http_request_seconds", "API request latency", ["method", "route", "status"]))
+
+# Per-request breakdown (stage -> total ms) and executor capture buffer
+_request_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "request_timings", default=None)
+_captured: contextvars.ContextVar[Optional[List[Tuple[str, float, bool]]]] = contextvars.ContextVar(
+    "captured_stages", default=None)
+
+
+def observe_stage(name: str, seconds: float, failed: bool = False) -> None:
+    captured = _captured.get()
+    if captured is not None:
+        captured.append((name, seconds, failed))
+        return
+    STAGE_SECONDS.observe(seconds, stage=name)
+    if failed:
+        STAGE_ERRORS.inc(stage=name)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = round(timings.get(name, 0.0) + seconds * 1000.0, 3)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as pipeline stage `name` (works around `await`s too)."""
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        observe_stage(name, time.perf_counter() - start, failed)
+
+
+def timed(name: str):
+    """Decorator form of `stage` for sync and async functions."""
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, float]]:
+    """Collect a stage -> milliseconds breakdown for the enclosed request.
+
+    Stages that run concurrently (e.g. one search per claim) are summed, so the breakdown can
+    add up to more than the wall time.
+    """
+    timings: Dict[str, float] = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def capture(func: Callable[..., Any], *args: Any) -> Tuple[Any, List[Tuple[str, float, bool]]]:
+    """Run `func(*args)` (in an executor) and return (result, stage timings it recorded)."""
+    events: List[Tuple[str, float, bool]] = []
+    token = _captured.set(events)
+    try:
+        return func(*args), events
+    finally:
+        _captured.reset(token)
+
+
+def replay(events: Iterable[Tuple[str, float, bool]]) -> None:
+    for name, seconds, failed in events:
+        observe_stage(name, seconds, failed)
@@ -0,0 +1,159 @@
+"""
+Shared Gemini model resolution.
+
+Gemini callers share one fallback list per purpose (text, vision). The router remembers how
+each model name behaved so calls don't pay failed round trips for names that no longer exist:
+
+- a model that answered recently (within MODEL_ROUTER_SUCCESS_TTL) is tried first;
+- a model that returned "not found" is parked as unavailable for MODEL_ROUTER_DEAD_TTL;
+- transient failures (429, 5xx, unparsable output) are counted but don't park the model.
+
+The routing table is exposed via `snapshot()` for the admin endpoint.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List
+
+from utils.config import settings
+from . import metrics
+
+
+# Fallback lists; settings.GEMINI_MODEL is always tried first
+GEMINI_TEXT_MODELS = [
+    "gemini-2.5-flash-001",
+    "gemini-2.5-flash-latest",
+    "gemini-2.0-flash",
+    "gemini-2.0-flash-001",
+    "gemini-2.0-flash-latest",
+    "gemini-1.5-flash",
+    "gemini-1.5-flash-001",
+    "gemini-1.5-flash-002",
+    "gemini-1.5-flash-latest",
+]
+
+GEMINI_VISION_MODELS = [
+    "gemini-2.5-flash-001",
+    "gemini-2.5-flash-latest",
+    "gemini-1.5-flash",
+    "gemini-1.5-flash-001",
+    "gemini-1.5-flash-latest",
+]
+
+# Status codes meaning "this model name is not usable", as opposed to a transient error
+_DEAD_STATUSES = {404}
+
+
+class ModelRouter:
+    """Thread-safe record of which models work, shared by all Gemini callers."""
+
+    def __init__(self, success_ttl: float, dead_ttl: float):
+        self.success_ttl = success_ttl
+        self.dead_ttl = dead_ttl
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict[str, Any]] = {}
+
+    def _entry(self, model: str) -> Dict[str, Any]:
+        entry = self._models.get(model)
+        if entry is None:
+            entry = {
+                "successes": 0,
+                "failures": 0,
+                "last_success": None,
+                "last_failure": None,
+                "last_error": None,
+                "unavailable_until": None,
+            }
+            self._models[model] = entry
+        return entry
+
+    def candidates(self, models: List[str]) -> List[str]:
+        """Order `models` for an attempt: recently working first, parked models last."""
+        now = time.time()
+        working, unknown, parked = [], [], []
+        with self._lock:
+            for model in dict.fromkeys(models):
+                entry = self._models.get(model)
+                if entry is None:
+                    unknown.append(model)
+                elif entry["unavailable_until"] and entry["unavailable_until"] > now:
+                    parked.append(model)
+                elif entry["last_success"] and now - entry["last_success"] < self.success_ttl:
+                    working.append((entry["last_success"], model))
+                else:
+                    unknown.append(model)
+        working.sort(reverse=True)
+        ordered = [m for _, m in working] + unknown
+        # If everything is parked, still try them rather than failing without a request
+        return ordered or parked
+
+    def record_success(self, model: str) -> None:
+        with self._lock:
+            entry = self._entry(model)
+            entry["successes"] += 1
+            entry["last_success"] = time.time()
+            entry["unavailable_until"] = None
+
+    def record_failure(self, model: str, error: str, status: int | None = None) -> None:
+        now = time.time()
+        with self._lock:
+            entry = self._entry(model)
+            entry["failures"] += 1
+            entry["last_failure"] = now
+            entry["last_error"] = (error or "")[:200]
+            if status in _DEAD_STATUSES:
+                entry["unavailable_until"] = now + self.dead_ttl
+                entry["last_success"] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            models = {}
+            for model, entry in self._models.items():
+                until = entry["unavailable_until"]
+                models[model] = {
+                    **entry,
+                    "available": not (until and until > now),
+                    "working": bool(entry["last_success"] and now - entry["last_success"] < self.success_ttl),
+                }
+        return {
+            "success_ttl_seconds": self.success_ttl,
+            "dead_ttl_seconds": self.dead_ttl,
+            "routes": {
+                "text": self.candidates(text_models()),
+                "vision": self.candidates(vision_models()),
+            },
+            "models": models,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+def text_models() -> List[str]:
+    return [settings.GEMINI_MODEL or "gemini-2.5-flash", *GEMINI_TEXT_MODELS]
+
+
+def vision_models() -> List[str]:
+    return [settings.GEMINI_MODEL or "gemini-2.5-flash", *GEMINI_VISION_MODELS]
+
+
+gemini_router = ModelRouter(
+    success_ttl=settings.MODEL_ROUTER_SUCCESS_TTL,
+    dead_ttl=settings.MODEL_ROUTER_DEAD_TTL,
+)
+
+
+@metrics.REGISTRY.register_collector
+def _model_metrics():
+    models = gemini_router.snapshot()["models"]
+    yield ("verinews_model_attempts", "counter", "Gemini calls per model and outcome", [
+        ("verinews_model_attempts_total", {"model": m, "outcome": outcome}, e[key])
+        for m, e in models.items() for outcome, key in (("success", "successes"), ("failure", "failures"))
+    ])
+    yield ("verinews_model_available", "gauge", "1 if the model is not parked after a 404", [
+        ("verinews_model_available", {"model": m}, int(e["available"])) for m, e in models.items()
+    ])
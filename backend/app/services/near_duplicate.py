@@ -0,0 +1,139 @@
+"""
+Near-duplicate detection for verification inputs.
+
+Reposted wire stories differ by a headline, trailing share text or tracking URLs, so their exact
+SHA-256 keys never match. This module fingerprints text with a 64-bit SimHash over word shingles
+and keeps an in-memory index that finds earlier inputs within a Hamming-distance budget.
+
+The index splits fingerprints into (max_distance + 1) bands; by pigeonhole, any fingerprint
+within the budget shares at least one band exactly, so lookups only compare against a few
+bucket members instead of every stored fingerprint. Memory is bounded by `max_entries`
+(oldest fingerprints are dropped first).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from utils.config import settings
+
+
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+_WORD_RE = re.compile(r"\w+")
+
+# translate tables: byte -> 1 if bit `k` is set, else 0 (used to count bits column-wise in C)
+_BIT_TABLES = [bytes(((b >> k) & 1) for b in range(256)) for k in range(8)]
+
+
+def _shingles(text: str, size: int = 3) -> List[str]:
+    words = _WORD_RE.findall(_URL_RE.sub(" ", text.lower()))
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def simhash(text: str) -> Tuple[int, int]:
+    """Return (64-bit SimHash fingerprint, number of shingles) for `text`."""
+    shingles = _shingles(text)
+    n = len(shingles)
+    if not n:
+        return 0, 0
+    digests = b"".join(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest()
+                       for s in shingles)
+    fp = 0
+    half = n / 2
+    for byte_idx in range(8):
+        column = digests[byte_idx::8]
+        for bit in range(8):
+            if column.translate(_BIT_TABLES[bit]).count(1) > half:
+                fp |= 1 << (byte_idx * 8 + bit)
+    return fp, n
+
+
+class NearDuplicateIndex:
+    """Bounded in-memory SimHash index mapping fingerprints to cache keys."""
+
+    def __init__(self, threshold: float, max_entries: int):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_distance = max(0, int(64 * (1.0 - threshold)))
+        bands = self.max_distance + 1
+        self._band_bits = 64 // bands
+        self._band_mask = (1 << self._band_bits) - 1
+        self._bands = bands
+        # fingerprint -> cache key (insertion-ordered for FIFO eviction)
+        self._entries: OrderedDict[int, str] = OrderedDict()
+        self._buckets: List[Dict[int, array]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def _band_values(self, fp: int):
+        for i in range(self._bands):
+            yield i, (fp >> (i * self._band_bits)) & self._band_mask
+
+    def add(self, fp: int, key: str) -> None:
+        with self._lock:
+            if fp in self._entries:
+                self._entries[fp] = key
+                self._entries.move_to_end(fp)
+                return
+            self._entries[fp] = key
+            for i, band in self._band_values(fp):
+                self._buckets[i].setdefault(band, array("Q")).append(fp)
+            while len(self._entries) > self.max_entries:
+                old_fp, _ = self._entries.popitem(last=False)
+                self._remove_from_buckets(old_fp)
+
+    def _remove_from_buckets(self, fp: int) -> None:
+        for i, band in self._band_values(fp):
+            bucket = self._buckets[i].get(band)
+            if bucket is None:
+                continue
+            try:
+                bucket.remove(fp)
+            except ValueError:
+                pass
+            if not bucket:
+                del self._buckets[i][band]
+
+    def query(self, fp: int) -> Tuple[str, float] | None:
+        """Best (cache key, similarity) at or above the threshold, or None."""
+        best_fp, best_dist = None, self.max_distance + 1
+        with self._lock:
+            for i, band in self._band_values(fp):
+                bucket = self._buckets[i].get(band)
+                if not bucket:
+                    continue
+                for other in bucket:
+                    dist = (fp ^ other).bit_count()
+                    if dist < best_dist:
+                        best_fp, best_dist = other, dist
+                        if dist == 0:
+                            break
+            if best_fp is None:
+                return None
+            key = self._entries.get(best_fp)
+        if key is None:
+            return None
+        return key, 1.0 - best_dist / 64.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "max_hamming_distance": self.max_distance,
+        }
+
+
+near_duplicates = NearDuplicateIndex(
+    threshold=settings.NEAR_DUP_THRESHOLD,
+    max_entries=settings.NEAR_DUP_MAX_ENTRIES,
+)
@@ -0,0 +1,269 @@
+"""
+EasyOCR reader lifecycle for image checks.
+
+OCR_MODE selects where the reader lives:
+- local:  one reader per API worker process, created once (at startup when warm-up is on) and
+          used from a worker thread, so recognition doesn't block the event loop
+- worker: one reader per host, in a dedicated OCR process. API workers send image bytes over a
+          Unix socket (OCR_WORKER_SOCKET) and the process serves them one at a time. The first
+          API worker that finds no server starts it (a lock file keeps that to one), so N uvicorn
+          workers share one model instead of loading N copies. If the process goes away, the
+          next request starts a new one.
+
+Worker mode refuses to start with the default SECRET_KEY (it authenticates socket clients). The
+socket lives in a directory only the app user can enter (0700), and messages are raw bytes plus
+small JSON headers, never pickles. The API worker that started the OCR process owns it and stops
+it on its own shutdown; other workers only close their connections, and if the owner exits
+first their next request starts a new process.
+
+`read_text` raises when OCR is unavailable (easyocr/Pillow missing, model failed to load); the
+caller then falls back to Gemini OCR.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import queue
+import stat
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict
+
+from utils.config import settings
+from . import image_prep, json_codec
+
+logger = logging.getLogger(__name__)
+
+OCR_LANGUAGES = ['en', 'hi', 'ta', 'te', 'bn']
+_DEFAULT_SECRET_KEY = "your-secret-key-here"
+
+
+class LocalOCR:
+    """An EasyOCR reader in this process, loaded once."""
+
+    mode = "local"
+
+    def __init__(self):
+        self._reader = None
+        self._load_lock = threading.Lock()
+        # one recognition at a time: torch already spreads a single call over all cores
+        self._run_lock = threading.Lock()
+        self.state = "cold"
+        self.error: str | None = None
+
+    def load(self) -> None:
+        if self._reader is not None:
+            return
+        with self._load_lock:
+            if self._reader is None:
+                self.state = "loading"
+                try:
+                    import easyocr
+                    self._reader = easyocr.Reader(OCR_LANGUAGES)
+                except Exception as e:
+                    self.state, self.error = "failed", str(e)
+                    raise
+                self.state, self.error = "ready", None
+
+    def read_text(self, image_bytes: bytes) -> str:
+        self.load()
+        from PIL import Image
+        import numpy as np
+
+        if settings.OCR_PREP_ENABLED:
+            image = np.array(image_prep.prepare(image_bytes))
+        else:
+            image = np.array(Image.open(io.BytesIO(image_bytes)).convert('RGB'))
+        with self._run_lock:
+            results = self._reader.readtext(image)
+        return ' '.join(result[1] for result in results)
+
+    def status(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "state": self.state, "error": self.error}
+
+    def close(self) -> None:
+        pass
+
+
+def _load_quietly(engine: LocalOCR) -> None:
+    try:
+        engine.load()
+    except Exception as e:
+        logger.warning("OCR worker could not load the reader: %s", e)
+
+
+def _handle(engine: LocalOCR, conn) -> None:
+    # request: a JSON header {"op": ...}, followed for "read" by the image bytes
+    # reply: a JSON {"ok": true, "result": ...} or {"ok": false, "error": "..."}
+    with conn:
+        while True:
+            try:
+                op = json_codec.loads(conn.recv_bytes()).get("op")
+                image_bytes = conn.recv_bytes() if op == "read" else None
+            except (EOFError, OSError):
+                return
+            except (ValueError, AttributeError):
+                return  # not our protocol: drop the connection
+            try:
+                if op == "status":
+                    reply = {"ok": True, "result": engine.status()}
+                elif op == "load":
+                    engine.load()
+                    reply = {"ok": True, "result": None}
+                elif op == "read":
+                    reply = {"ok": True, "result": engine.read_text(image_bytes)}
+                else:
+                    reply = {"ok": False, "error": f"unknown op {op!r}"}
+            except Exception as e:
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            conn.send_bytes(json_codec.dumps(reply))
+
+
+def serve(address: str, authkey: bytes) -> None:
+    """OCR process entry point: bind the socket, load the reader in the background, serve."""
+    engine = LocalOCR()
+    listener = Listener(address, family="AF_UNIX", authkey=authkey)
+    threading.Thread(target=_load_quietly, args=(engine,), daemon=True).start()
+    while True:
+        try:
+            conn = listener.accept()
+        except (OSError, multiprocessing.AuthenticationError) as e:
+            logger.warning("OCR worker rejected a connection: %s", e)
+            continue
+        threading.Thread(target=_handle, args=(engine, conn), daemon=True).start()
+
+
+def default_socket_path() -> str:
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(base, f"verinews-{os.getuid()}", "ocr.sock")
+
+
+def _private_dir(path: str) -> None:
+    """Create the socket's directory 0700, or check an existing one is ours and private."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.stat(path)
+    if info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+        raise RuntimeError(f"OCR socket directory {path} must be owned by this user with mode 0700")
+
+
+class WorkerOCR:
+    """Client of the host-wide OCR process (started on demand)."""
+
+    mode = "worker"
+
+    def __init__(self, address: str, authkey: bytes, start_timeout: float):
+        self.address = address
+        self.authkey = authkey
+        self.start_timeout = start_timeout
+        self._idle: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._process = None  # set only in the API worker that started (and owns) the process
+
+    def _connect(self):
+        return Client(self.address, family="AF_UNIX", authkey=self.authkey)
+
+    def _open(self):
+        """Connect to the OCR process, starting it first if nobody has."""
+        try:
+            return self._connect()
+        except (FileNotFoundError, ConnectionRefusedError):
+            pass
+        import fcntl  # worker mode needs a Unix host (AF_UNIX socket, flock)
+
+        _private_dir(os.path.dirname(self.address))
+        with open(self.address + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                return self._connect()
+            except (FileNotFoundError, ConnectionRefusedError):
+                pass
+            if os.path.exists(self.address):
+                os.unlink(self.address)  # left behind by a process that died
+            ctx = multiprocessing.get_context("spawn")
+            self._process = ctx.Process(target=serve, args=(self.address, self.authkey),
+                                        name="ocr-worker", daemon=True)
+            self._process.start()
+            logger.info("Started OCR worker process (pid %s) on %s", self._process.pid, self.address)
+            deadline = time.monotonic() + self.start_timeout
+            while True:
+                try:
+                    return self._connect()
+                except (FileNotFoundError, ConnectionRefusedError):
+                    if time.monotonic() > deadline or not self._process.is_alive():
+                        raise RuntimeError("OCR worker process did not start")
+                    time.sleep(0.05)
+
+    @staticmethod
+    def _exchange(conn, op: str, image_bytes: bytes | None) -> Dict[str, Any]:
+        conn.send_bytes(json_codec.dumps({"op": op}))
+        if image_bytes is not None:
+            conn.send_bytes(image_bytes)
+        return json_codec.loads(conn.recv_bytes())
+
+    def _call(self, op: str, image_bytes: bytes | None = None) -> Any:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        try:
+            reply = self._exchange(conn, op, image_bytes)
+        except (EOFError, OSError):
+            # the OCR process went away (e.g. with the API worker that started it): retry once
+            conn.close()
+            conn = self._open()
+            reply = self._exchange(conn, op, image_bytes)
+        self._idle.put(conn)
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error"))
+        return reply.get("result")
+
+    def load(self) -> None:
+        self._call("load")
+
+    def read_text(self, image_bytes: bytes) -> str:
+        return self._call("read", bytes(image_bytes))
+
+    def status(self) -> Dict[str, Any]:
+        try:
+            return {**self._call("status"), "mode": self.mode}
+        except Exception as e:
+            return {"mode": self.mode, "state": "unreachable", "error": str(e)}
+
+    def close(self) -> None:
+        """Close this worker's connections; call only on this API worker's shutdown.
+
+        Only the owner (the API worker that started the process) also stops the OCR process.
+        Other API workers may still be using it: their next call fails over to `_open`, which
+        starts a new process. Non-owners leave the process running.
+        """
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        process, self._process = self._process, None
+        if process is not None and process.is_alive():
+            process.terminate()
+            process.join(timeout=5)
+
+
+def _make_engine():
+    if settings.OCR_MODE == "worker":
+        if settings.SECRET_KEY == _DEFAULT_SECRET_KEY:
+            raise RuntimeError("OCR_MODE=worker needs SECRET_KEY set: it authenticates the OCR socket")
+        return WorkerOCR(settings.OCR_WORKER_SOCKET or default_socket_path(),
+                         settings.SECRET_KEY.encode(), settings.OCR_WORKER_START_TIMEOUT)
+    return LocalOCR()
+
+
+ocr_engine = _make_engine()
+
+
+async def read_text(image_bytes: bytes) -> str:
+    """OCR an encoded image off the event loop."""
+    return await asyncio.to_thread(ocr_engine.read_text, image_bytes)
@@ -0,0 +1,174 @@
+"""
+Indexed fake-news pattern rules for FactChecker.
+
+Rules live in a JSON file (FACT_PATTERNS_PATH) and are compiled once:
+
+    {"rules": [{"id": "miracle-cure", "keywords": ["miracle", "cure"],
+                "pattern": "\\b(miracle.*cure|cure.*miracle)\\b", "risk": "high"}]}
+
+`keywords` are words the pattern cannot match without, each appearing at the start or end of a
+word (as `\\b` in the pattern requires). Every rule is indexed under one keyword word, its anchor
+(the word the fewest rules share, so common words don't collect long lists). A claim only
+evaluates rules whose anchor is a prefix or suffix of one of its tokens, so the cost per claim
+grows with the claim's length, not the number of rules. Rules without keywords are evaluated
+for every claim.
+
+The file is re-read when its mtime or size changes (checked at most every
+FACT_PATTERNS_RELOAD_SECONDS); a file that fails to load is logged and the previous rules kept.
+See benchmarks/bench_pattern_rules.py.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, NamedTuple, Tuple
+
+from utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+_RISK_ORDER = {"low": 0, "medium": 1, "high": 2}
+
+
+class Rule(NamedTuple):
+    order: int
+    id: str
+    pattern: str
+    regex: re.Pattern
+    keywords: Tuple[str, ...]
+    risk: str
+
+
+class _Compiled(NamedTuple):
+    by_anchor: Dict[str, List[Rule]]
+    anchor_lengths: Tuple[int, ...]
+    unindexed: List[Rule]
+    count: int
+
+
+def _compile(raw_rules: List[Dict]) -> _Compiled:
+    rules: List[Tuple[Rule, set]] = []
+    word_rules: Dict[str, int] = {}
+    for i, raw in enumerate(raw_rules):
+        pattern = raw["pattern"]
+        keywords = tuple(k.lower() for k in raw.get("keywords") or ())
+        rule = Rule(
+            order=i,
+            id=str(raw.get("id") or i),
+            pattern=pattern,
+            regex=re.compile(pattern),
+            keywords=keywords,
+            risk=raw.get("risk", "high"),
+        )
+        words = {w for k in keywords for w in _WORD_RE.findall(k)}
+        for w in words:
+            word_rules[w] = word_rules.get(w, 0) + 1
+        rules.append((rule, words))
+
+    by_anchor: Dict[str, List[Rule]] = {}
+    unindexed: List[Rule] = []
+    for rule, words in rules:
+        if words:
+            # the word fewest rules share (then the longest) keeps candidate lists short
+            anchor = min(words, key=lambda w: (word_rules[w], -len(w), w))
+            by_anchor.setdefault(anchor, []).append(rule)
+        else:
+            unindexed.append(rule)
+    lengths = tuple(sorted({len(a) for a in by_anchor}))
+    return _Compiled(by_anchor, lengths, unindexed, len(raw_rules))
+
+
+class PatternRuleEngine:
+    def __init__(self, path: str, reload_seconds: float = 0.0):
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self._compiled = _compile([])
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self) -> bool:
+        """Load the rule file if it changed since the last load; returns True if rules changed."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                st = os.stat(self.path)
+            except OSError as e:
+                if self._signature != "missing":
+                    logger.error("Pattern rules file %s unavailable, keeping %d rules: %s",
+                                 self.path, self._compiled.count, e)
+                self._signature = "missing"
+                return False
+            signature = (st.st_mtime_ns, st.st_size)
+            if signature == self._signature:
+                return False
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    compiled = _compile(json.load(f).get("rules") or [])
+            except Exception as e:
+                logger.error("Failed to load pattern rules from %s, keeping previous rules: %s",
+                             self.path, e)
+                self._signature = signature
+                return False
+            self._compiled = compiled
+            self._signature = signature
+            logger.info("Loaded %d pattern rules from %s", compiled.count, self.path)
+            return True
+
+    def _maybe_reload(self) -> None:
+        if self.reload_seconds > 0 and time.monotonic() - self._checked_at >= self.reload_seconds:
+            self.reload()
+
+    def candidates(self, text_lower: str) -> List[Rule]:
+        """Rules whose anchor is a prefix or suffix of some token in `text_lower`."""
+        compiled = self._compiled
+        found: Dict[int, Rule] = {}
+        by_anchor = compiled.by_anchor
+        for token in set(_WORD_RE.findall(text_lower)):
+            n = len(token)
+            for length in compiled.anchor_lengths:
+                if length > n:
+                    break
+                for part in (token[:length], token[n - length:]):
+                    rules = by_anchor.get(part)
+                    if rules:
+                        for rule in rules:
+                            found[id(rule)] = rule
+        return sorted(compiled.unindexed + list(found.values()), key=lambda r: r.order)
+
+    def match(self, text: str) -> List[Rule]:
+        """Rules matching `text` (case-insensitive)."""
+        self._maybe_reload()
+        text_lower = text.lower()
+        return [
+            rule for rule in self.candidates(text_lower)
+            if all(k in text_lower for k in rule.keywords) and rule.regex.search(text_lower)
+        ]
+
+    @staticmethod
+    def risk_of(rules: List[Rule]) -> str:
+        if not rules:
+            return "low"
+        return max((r.risk for r in rules), key=lambda r: _RISK_ORDER.get(r, 2))
+
+    def stats(self) -> Dict:
+        compiled = self._compiled
+        return {
+            "path": self.path,
+            "rules": compiled.count,
+            "anchors": len(compiled.by_anchor),
+            "unindexed": len(compiled.unindexed),
+        }
+
+
+pattern_rules = PatternRuleEngine(
+    settings.FACT_PATTERNS_PATH,
+    reload_seconds=settings.FACT_PATTERNS_RELOAD_SECONDS,
+)
@@ -0,0 +1,98 @@
+"""
+Response shaping for check endpoints (`detail` and `fields` query parameters).
+
+- detail=full (default): the payload as produced.
+- detail=compact: same information, without repetition. Evidence from every claim goes into one
+  top-level `evidence` table, deduplicated by URL (items without one are kept apart). Claims reference it by index
+  (`evidence_refs`, `source_refs`) instead of embedding titles and snippets. The whole-text
+  `source_analysis` that FactChecker repeats in every claim appears once under `fact_check`.
+- detail=summary: verdict, confidence and risk only (the history summary projection).
+- fields=a,b.c: keep only these top-level keys or dotted paths (plus `status`), applied after
+  `detail`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .storage import summarize_result
+
+DETAIL_PATTERN = "^(full|compact|summary)$"
+
+# Keys of a check result replaced by the summary projection
+_RESULT_KEYS = ("analysis", "fact_check", "verification", "confidence_score")
+
+
+def compact(payload: Dict[str, Any]) -> Dict[str, Any]:
+    out = dict(payload)
+    table: List[Dict[str, Any]] = []
+    index: Dict[str, int] = {}
+
+    def ref(item: Dict[str, Any]) -> int:
+        url = item.get("url") or ""
+        i = index.get(url) if url else None  # items without a URL are never merged
+        if i is None:
+            i = len(table)
+            if url:
+                index[url] = i
+            table.append({"url": url})
+        # keep the first non-empty title/snippet seen for this URL
+        for k in ("title", "snippet"):
+            if item.get(k) and not table[i].get(k):
+                table[i][k] = item[k]
+        return i
+
+    verification = payload.get("verification")
+    if isinstance(verification, dict) and isinstance(verification.get("per_claim"), list):
+        claims = []
+        for claim in verification["per_claim"]:
+            claim = dict(claim)
+            if isinstance(claim.get("evidence"), list):
+                claim["evidence_refs"] = [ref(ev) for ev in claim.pop("evidence") if isinstance(ev, dict)]
+            if isinstance(claim.get("sources"), list):
+                claim["source_refs"] = [ref({"url": u}) for u in claim.pop("sources") if u]
+            claims.append(claim)
+        out["verification"] = {**verification, "per_claim": claims}
+    if table:
+        out["evidence"] = table
+
+    fact_check = payload.get("fact_check")
+    if isinstance(fact_check, dict) and isinstance(fact_check.get("verification_results"), list):
+        results = [dict(r) for r in fact_check["verification_results"]]
+        shared = [r.pop("source_analysis", None) for r in results]
+        out["fact_check"] = {**fact_check, "verification_results": results}
+        if shared and shared[0] is not None:
+            out["fact_check"]["source_analysis"] = shared[0]
+    return out
+
+
+def summarize(payload: Dict[str, Any]) -> Dict[str, Any]:
+    rest = {k: v for k, v in payload.items() if k not in _RESULT_KEYS}
+    return {**rest, **summarize_result(payload)}
+
+
+def select_fields(payload: Dict[str, Any], fields: str) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"status": payload["status"]} if "status" in payload else {}
+    for path in filter(None, (f.strip() for f in fields.split(","))):
+        parts = path.split(".")
+        value: Any = payload
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            node = out
+            for part in parts[:-1]:
+                node = node.setdefault(part, {})
+            node[parts[-1]] = value
+    return out
+
+
+def shape(payload: Dict[str, Any], detail: str = "full", fields: Optional[str] = None) -> Dict[str, Any]:
+    if detail == "compact":
+        payload = compact(payload)
+    elif detail == "summary":
+        payload = summarize(payload)
+    if fields:
+        payload = select_fields(payload, fields)
+    return payload
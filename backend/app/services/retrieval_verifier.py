@@ -1,26 +1,36 @@
 """
 Retrieval + LLM verification pipeline using Tavily (search) and Gemini (evaluation).
 
-- No third-party HTTP libraries used; relies on Python stdlib (urllib) to avoid new deps.
+- Upstream calls go through the shared async transport in `http_client` (httpx when installed,
+  stdlib keep-alive pool otherwise), so no third-party HTTP library is required.
 - Designed to be resilient: if API keys are missing or network fails, returns a skipped result.
 
 Public functions:
-- verify_with_osint(text: str) -> dict
+- verify_with_osint(text: str, on_event=None) -> dict   (async)
   Orchestrates search + LLM evaluation and returns a structured result with verdict, confidence, reasoning, and sources.
+  `on_event(name, data)` optionally receives progress: "claims" once extracted, "verdict" as soon as a claim's
+  streamed Gemini answer contains verdict and confidence (GEMINI_STREAMING), then "claim" as each one finishes.
+  A caller that joins another's in-flight verification of the same text gets the same events.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import re
 import time
 import logging
-from typing import List, Dict, Any
-from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Optional, Tuple
 import hashlib
-from urllib import request, error
 
 from utils.config import settings
+from . import http_client, metrics
+from .model_router import gemini_router, text_models
+from .verification_cache import make_cache
+from .near_duplicate import near_duplicates, simhash
+from .single_flight import SingleFlight
+from .claim_index import claim_index
+from .domain_reputation import domain_reputation
+from .json_scanner import JSONObjectScanner, first_object
 
 
 logger = logging.getLogger(__name__)
@@ -33,28 +43,90 @@ STOPWORDS = set(
 )
 
 
-# Simple LRU cache for verification results to stabilize outputs and reduce latency
-_CACHE_MAX = 64
-_VERIFY_CACHE: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+# Verification results cache (backend chosen by VERIFY_CACHE_BACKEND) to stabilize outputs and reduce latency.
+# Three tiers: whole-text results, per-claim verdicts and per-query search evidence, so articles
+# that share claims with earlier submissions only spend network calls on the new ones.
+_VERIFY_CACHE = make_cache("verify")
+_CLAIM_CACHE = make_cache("claims")
+_EVIDENCE_CACHE = make_cache("evidence")
 
 
-def _cache_get(key: str) -> Dict[str, Any] | None:
-    try:
-        val = _VERIFY_CACHE.pop(key)
-        # reinsert as most-recently-used
-        _VERIFY_CACHE[key] = val
-        return val
-    except KeyError:
-        return None
+async def _cache_get(cache, key: str) -> Dict[str, Any] | None:
+    if cache.blocking:
+        return await asyncio.to_thread(cache.get, key)
+    return cache.get(key)
+
+
+async def _cache_set(cache, key: str, value: Dict[str, Any]) -> None:
+    if cache.blocking:
+        await asyncio.to_thread(cache.set, key, value)
+    else:
+        cache.set(key, value)
+
+
+# Coalesce concurrent verifications of the same text / claim onto one upstream pipeline run
+_TEXT_FLIGHTS = SingleFlight("texts")
+_CLAIM_FLIGHTS = SingleFlight("claims")
+
+
+def cache_stats() -> Dict[str, Any]:
+    return {
+        "verify": _VERIFY_CACHE.stats(),
+        "claims": _CLAIM_CACHE.stats(),
+        "evidence": _EVIDENCE_CACHE.stats(),
+        "near_duplicates": near_duplicates.stats(),
+        "single_flight": {
+            "texts": _TEXT_FLIGHTS.stats(),
+            "claims": _CLAIM_FLIGHTS.stats(),
+        },
+    }
+
+
+@metrics.REGISTRY.register_collector
+def _cache_metrics():
+    stats = cache_stats()
+    tiers = [(tier, stats[tier]) for tier in ("verify", "claims", "evidence")]
+    for field, mtype, help_text in (
+        ("hits", "counter", "Verification cache hits"),
+        ("misses", "counter", "Verification cache misses"),
+        ("hit_ratio", "gauge", "Verification cache hit ratio since start"),
+        ("entries", "gauge", "Verification cache entries"),
+        ("bytes", "gauge", "Verification cache size in bytes"),
+    ):
+        suffix = "_total" if mtype == "counter" else ""
+        name = f"verinews_cache_{field}"
+        yield (name, mtype, help_text, [
+            (name + suffix, {"tier": tier, "backend": s["backend"]}, s.get(field) or 0)
+            for tier, s in tiers])
+    flights = stats["single_flight"]
+    yield ("verinews_coalesced_requests", "counter", "Requests that joined an in-flight verification", [
+        ("verinews_coalesced_requests_total", {"kind": kind}, f["coalesced"]) for kind, f in flights.items()])
+    yield ("verinews_near_duplicate_entries", "gauge", "Fingerprints in the near-duplicate index", [
+        ("verinews_near_duplicate_entries", {}, stats["near_duplicates"]["entries"])])
+    index = claim_index.stats()
+    yield ("verinews_claim_index_lookups", "counter", "Local fact-check index lookups and hits", [
+        ("verinews_claim_index_lookups_total", {"outcome": "hit"}, index["hits"]),
+        ("verinews_claim_index_lookups_total", {"outcome": "miss"}, index["lookups"] - index["hits"])])
+
 
+def text_cache_key(text: str) -> str:
+    """Content address of an input text (the whole-text cache key)."""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
 
-def _cache_set(key: str, value: Dict[str, Any]) -> None:
-    if key in _VERIFY_CACHE:
-        _VERIFY_CACHE.pop(key)
-    elif len(_VERIFY_CACHE) >= _CACHE_MAX:
-        # pop least-recently-used
-        _VERIFY_CACHE.popitem(last=False)
-    _VERIFY_CACHE[key] = value
+
+def normalize_claim(claim: str) -> str:
+    """Case-, whitespace- and punctuation-insensitive form of a claim."""
+    return " ".join(re.sub(r"[^\w\s]", " ", claim.lower()).split())
+
+
+def _claim_cache_key(claim: str, max_results: int) -> str:
+    return hashlib.sha256(f"{max_results}:{normalize_claim(claim)}".encode("utf-8")).hexdigest()
+
+
+def _evidence_cache_key(query: str, max_results: int) -> str:
+    # extract_queries orders terms by score; the set of terms is what Tavily sees
+    terms = " ".join(sorted(set(normalize_claim(query).split())))
+    return hashlib.sha256(f"{max_results}:{terms}".encode("utf-8")).hexdigest()
 
 
 def extract_queries(text: str, max_terms: int = 8) -> str:
@@ -83,29 +155,12 @@ def extract_queries(text: str, max_terms: int = 8) -> str:
     return text[:200]
 
 
-def _http_post_json(url: str, payload: Dict[str, Any], headers: Dict[str, str], timeout: float = 15.0) -> Dict[str, Any]:
-    data = json.dumps(payload).encode("utf-8")
-    req = request.Request(url, data=data, headers={
-                          "Content-Type": "application/json", **headers}, method="POST")
-    try:
-        with request.urlopen(req, timeout=timeout) as resp:
-            body = resp.read().decode("utf-8")
-            return json.loads(body)
-    except error.HTTPError as e:
-        err_txt = ""
-        try:
-            err_txt = e.read().decode("utf-8", errors="ignore")
-        except Exception:
-            err_txt = ""
-        logger.warning("HTTPError %s: %s", e.code, err_txt)
-        # propagate details upstream for better diagnostics
-        raise RuntimeError(f"HTTP Error {e.code}: {err_txt[:500]}")
-    except Exception as e:
-        logger.warning("HTTP POST failed: %s", e)
-        raise
+async def _http_post_json(url: str, payload: Dict[str, Any], headers: Dict[str, str], timeout: float = 15.0) -> Dict[str, Any]:
+    return await http_client.post_json(url, payload, headers=headers, timeout=timeout)
 
 
-def tavily_search(query: str, max_results: int = 5, search_depth: str = "advanced") -> Dict[str, Any]:
+@metrics.timed("search")
+async def tavily_search(query: str, max_results: int = 5, search_depth: str = "advanced") -> Dict[str, Any]:
     api_key = settings.TAVILY_API_KEY
     if not api_key:
         return {"status": "skipped", "reason": "TAVILY_API_KEY not set", "results": []}
@@ -120,7 +175,7 @@ def tavily_search(query: str, max_results: int = 5, search_depth: str = "advance
         "include_images": False,
     }
     try:
-        res = _http_post_json(url, payload, headers={})
+        res = await _http_post_json(url, payload, headers={})
         results = res.get("results") or []
         # Normalize items to have title, url, content/snippet
         norm = []
@@ -186,89 +241,37 @@ If no claims, return {{"claims": []}}.
     return prompt
 
 
-def _hostname(url: str) -> str:
-    try:
-        # simple hostname extraction
-        return re.sub(r"^www\.", "", re.sub(r"^https?://", "", url)).split("/")[0].lower()
-    except Exception:
-        return ""
-
-
-# Lightweight domain reputation map; 0..1 where 1 is highly credible
-_DOMAIN_REPUTATION: Dict[str, float] = {
-    # International outlets
-    "reuters.com": 0.95,
-    "apnews.com": 0.95,
-    "bbc.com": 0.93,
-    "nytimes.com": 0.92,
-    "washingtonpost.com": 0.9,
-    "theguardian.com": 0.9,
-    "npr.org": 0.9,
-    "bloomberg.com": 0.9,
-    "aljazeera.com": 0.85,
-    # Fact-checkers
-    "snopes.com": 0.95,
-    "factcheck.org": 0.95,
-    "politifact.com": 0.93,
-    # Government/education will be boosted via TLD rule
-}
+def score_domain(url: str) -> float:
+    """Source credibility 0..1 (see domain_reputation)."""
+    return domain_reputation.score_url(url)
 
 
-def score_domain(url: str) -> float:
-    host = _hostname(url)
-    if not host:
-        return 0.4
-    score = _DOMAIN_REPUTATION.get(host, 0.6)
-    # TLD heuristics
-    if host.endswith(".gov") or host.endswith(".gov.in"):
-        score = max(score, 0.92)
-    if host.endswith(".edu"):
-        score = max(score, 0.88)
-    # common low-credibility heuristics
-    low_markers = ["click", "buzz", "viral", "gossip", "tabloid"]
-    if any(m in host for m in low_markers):
-        score = min(score, 0.45)
-    return max(0.0, min(1.0, score))
-
-
-def gemini_extract_claims(text: str) -> List[str] | None:
+@metrics.timed("claim_extraction")
+async def gemini_extract_claims(text: str) -> List[str] | None:
     api_key = settings.GOOGLE_API_KEY
-    preferred = settings.GEMINI_MODEL or "gemini-2.5-flash"
-    models = [
-        preferred,
-        "gemini-2.5-flash-001",
-        "gemini-2.5-flash-latest",
-        "gemini-2.0-flash",
-        "gemini-1.5-flash",
-    ]
     if not api_key:
         return None
 
     prompt = build_claim_extraction_prompt(text)
-    for model in models:
+    for model in gemini_router.candidates(text_models()):
         url = f"https://generativelanguage.googleapis.com/v1/models/{model}:generateContent?key={api_key}"
         payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
         try:
-            res = _http_post_json(url, payload, headers={})
-            out_text = ""
-            try:
-                cand = (res.get("candidates") or [{}])[0]
-                parts = (cand.get("content") or {}).get("parts") or []
-                if parts:
-                    out_text = parts[0].get("text") or ""
-            except Exception:
-                out_text = ""
-            data = _extract_json_from_text(out_text) or {}
-            claims_arr = data.get("claims") or []
-            claims = []
-            for item in claims_arr:
-                t = (item.get("text") if isinstance(
-                    item, dict) else str(item)).strip()
-                if t:
-                    claims.append(t)
-            return claims[:5]
-        except Exception:
+            res = await _http_post_json(url, payload, headers={})
+        except Exception as e:
+            gemini_router.record_failure(
+                model, str(e), getattr(e, "status", None))
             continue
+        gemini_router.record_success(model)
+        data = _extract_json_from_text(_candidate_text(res)) or {}
+        claims_arr = data.get("claims") or []
+        claims = []
+        for item in claims_arr:
+            t = (item.get("text") if isinstance(
+                item, dict) else str(item)).strip()
+            if t:
+                claims.append(t)
+        return claims[:5]
     return None
 
 
@@ -288,8 +291,7 @@ def _aggregate_claim_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
         conf = float(r.get("confidence", 0.5))
         sources = r.get("sources") or []
         if sources:
-            sc = sum(score_domain(u)
-                     for u in sources[:3]) / min(len(sources[:3]), 3)
+            sc = sum(domain_reputation.score_urls(sources[:3])) / min(len(sources[:3]), 3)
         else:
             sc = 0.6
         weights.append(max(0.1, conf * (0.5 + 0.5 * sc)))
@@ -328,148 +330,370 @@ def _aggregate_claim_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
-def gemini_generate_json(prompt: str) -> Dict[str, Any]:
+def _candidate_text(res: Dict[str, Any]) -> str:
+    """Text of the first candidate in a Gemini (stream) response."""
+    try:
+        candidates = res.get("candidates") or []
+        if candidates:
+            parts = (candidates[0].get("content") or {}).get("parts") or []
+            if parts:
+                return parts[0].get("text") or ""
+    except Exception:
+        pass
+    return ""
+
+
+async def _generate_streamed(url: str, payload: Dict[str, Any],
+                             on_partial: Callable[[Dict[str, Any]], None]) -> Dict[str, Any] | None:
+    """Read a streamGenerateContent answer, passing its completed leading members to `on_partial`."""
+    scanner = JSONObjectScanner()
+    seen = None
+    chunks = http_client.post_json_stream(url, payload)
+    try:
+        async for chunk in chunks:
+            scanner.feed(_candidate_text(chunk))
+            if scanner.result is not None:
+                # the object is complete; whatever the model adds after it is not needed
+                break
+            partial = scanner.partial()
+            if partial is not None and partial is not seen:
+                seen = partial
+                on_partial(partial)
+        else:
+            scanner.finish()
+    finally:
+        await chunks.aclose()
+    return scanner.result
+
+
+@metrics.timed("llm_evaluation")
+async def gemini_generate_json(prompt: str,
+                               on_partial: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Ask Gemini for a JSON object, trying models in router order.
+
+    With `on_partial` (and GEMINI_STREAMING) the answer is streamed and `on_partial` receives the
+    members parsed so far each time another one completes.
+    """
     api_key = settings.GOOGLE_API_KEY
-    preferred = settings.GEMINI_MODEL or "gemini-2.5-flash"
-    candidates = [
-        preferred,
-        "gemini-2.5-flash-001",
-        "gemini-2.5-flash-latest",
-        "gemini-2.0-flash",
-        "gemini-2.0-flash-001",
-        "gemini-2.0-flash-latest",
-        "gemini-1.5-flash",
-        "gemini-1.5-flash-001",
-        "gemini-1.5-flash-002",
-        "gemini-1.5-flash-latest",
-    ]
     if not api_key:
         return {"status": "skipped", "reason": "GOOGLE_API_KEY not set"}
 
+    stream = on_partial is not None and settings.GEMINI_STREAMING
+    method = "streamGenerateContent?alt=sse&" if stream else "generateContent?"
+    candidates = gemini_router.candidates(text_models())
     last_err: str | None = None
     for model in candidates:
-        url = f"https://generativelanguage.googleapis.com/v1/models/{model}:generateContent?key={api_key}"
+        url = f"https://generativelanguage.googleapis.com/v1/models/{model}:{method}key={api_key}"
         payload = {
             "contents": [
                 {"role": "user", "parts": [{"text": prompt}]}
             ]
         }
         try:
-            res = _http_post_json(url, payload, headers={})
-            # Try to extract text
-            text = ""
-            try:
-                candidates_resp = res.get("candidates") or []
-                if candidates_resp:
-                    content = candidates_resp[0].get("content") or {}
-                    parts = content.get("parts") or []
-                    if parts:
-                        text = parts[0].get("text") or ""
-            except Exception:
-                text = ""
-            parsed = _extract_json_from_text(text)
-            if parsed is None:
-                # Model responded but not JSON — treat as error and try next model
-                last_err = "Could not parse JSON from model output"
-                continue
-            return {"status": "ok", "data": parsed, "model_used": model}
+            if stream:
+                parsed = await _generate_streamed(url, payload, on_partial)
+            else:
+                res = await _http_post_json(url, payload, headers={})
+                parsed = _extract_json_from_text(_candidate_text(res))
         except Exception as e:
             last_err = str(e)
+            gemini_router.record_failure(
+                model, last_err, getattr(e, "status", None))
             # try next model
             continue
+        if parsed is None:
+            # Model responded but not JSON — treat as error and try next model
+            last_err = "Could not parse JSON from model output"
+            gemini_router.record_failure(model, last_err)
+            continue
+        gemini_router.record_success(model)
+        return {"status": "ok", "data": parsed, "model_used": model}
 
     return {"status": "error", "reason": last_err or "all models failed", "tried_models": candidates}
 
 
 def _extract_json_from_text(text: str) -> Dict[str, Any] | None:
-    if not text:
-        return None
-    # Look for fenced code block first
-    m = re.search(r"```(?:json)?\s*({[\s\S]*?})\s*```", text)
-    if not m:
-        # fallback: first JSON object
-        m = re.search(r"({[\s\S]*})", text)
-    if not m:
-        return None
-    snippet = m.group(1)
+    """First JSON object in model output (see json_scanner), fenced or not."""
+    return first_object(text)
+
+
+async def _search_evidence(query: str, max_results: int) -> Dict[str, Any]:
+    """Tavily search with results reused across claims that produce the same query."""
+    key = _evidence_cache_key(query, max_results)
+    cached = await _cache_get(_EVIDENCE_CACHE, key)
+    if cached is not None:
+        return cached
+    search_res = await tavily_search(query, max_results=max_results)
+    if search_res.get("status") == "ok" and search_res.get("results"):
+        await _cache_set(_EVIDENCE_CACHE, key, search_res)
+    return search_res
+
+
+def _known_evidence(known: Dict[str, Any]) -> Dict[str, Any]:
+    """A published fact-check from the local claim index, as an evidence item for Gemini."""
+    publisher = known.get("publisher") or "a fact-checker"
+    return {"title": f"{publisher}: {known.get('rating', '')}".strip(),
+            "url": known.get("url") or "",
+            "snippet": f"Fact-check of the claim \"{known.get('claim', '')}\", rated "
+                       f"{known.get('rating') or known.get('verdict') or 'unrated'}."}
+
+
+def _known_claim_result(claim: str, known: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-claim result built from a published fact-check alone: a confident index match, or any
+    match when Gemini can't weigh it."""
+    verdict = known.get("verdict") or "uncertain"
+    similarity = float(known.get("similarity", 0.0))
+    publisher = known.get("publisher") or "a fact-checker"
+    url = known.get("url") or ""
+    return {
+        "claim": claim,
+        "status": "ok",
+        "verdict": verdict,
+        "confidence": round((0.95 if verdict != "uncertain" else 0.6) * similarity, 4),
+        "reasoning": f"Previously fact-checked by {publisher}: \"{known.get('claim', '')}\" rated "
+                     f"{known.get('rating') or verdict}.",
+        "sources": [url] if url else [],
+        "model_used": None,
+        "evidence": [_known_evidence(known)],
+        "known_fact_check": known,
+    }
+
+
+async def _verify_claim(claim: str, max_results: int,
+                        on_verdict: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Verify a single claim, reusing an earlier verdict for the same normalized claim."""
+    # Already fact-checked? A confident match is the answer, with no network call. A looser one
+    # is evidence for Gemini, which also sees whether the claim agrees with or contradicts the
+    # checked one; without Gemini it is the answer too.
+    known = claim_index.lookup(claim)
+    if known is not None and (known.get("confident") or not settings.GOOGLE_API_KEY):
+        return _known_claim_result(claim, known)
+
+    key = _claim_cache_key(claim, max_results)
+    cached = await _cache_get(_CLAIM_CACHE, key)
+    if cached is not None:
+        return {**cached, "claim": claim, "cached": True}
+
+    async def run(emit: Callable[..., None]) -> Dict[str, Any]:
+        # early verdicts go to every caller sharing the flight
+        result = await _verify_claim_uncached(claim, max_results,
+                                              emit if on_verdict is not None else None, known)
+        if result.get("status") == "ok":
+            await _cache_set(_CLAIM_CACHE, key, result)
+        return result
+
+    # callers that want early verdicts only share flights that stream them
+    flight = f"{key}:streamed" if on_verdict is not None else key
+    result, shared = await _CLAIM_FLIGHTS.do(flight, run, on_verdict)
+    if shared:
+        return {**result, "claim": claim, "coalesced": True}
+    return result
+
+
+def _verdict_fields(data: Dict[str, Any]) -> Tuple[str, float]:
+    """Normalized (verdict, confidence) from the model's answer."""
+    verdict = str(data.get("verdict", "uncertain")).lower()
+    if verdict not in ("true", "false", "uncertain"):
+        verdict = "uncertain"
     try:
-        return json.loads(snippet)
+        confidence = float(data.get("confidence", 0.5))
     except Exception:
-        # try to sanitize common issues: trailing commas
-        snippet2 = re.sub(r",\s*([}\]])", r"\1", snippet)
-        try:
-            return json.loads(snippet2)
-        except Exception:
-            return None
+        confidence = 0.5
+    return verdict, max(0.0, min(1.0, confidence))
+
+
+def _early_verdict(on_verdict: Callable[[Dict[str, Any]], None]) -> Callable[[Dict[str, Any]], None]:
+    """on_partial callback reporting verdict and confidence as soon as both have streamed in.
+
+    Each model attempt streams its own answer: if one fails after its verdict was reported and
+    the next model's verdict differs, the new one is reported as a correction.
+    """
+    sent: Optional[Tuple[str, float]] = None
+
+    def report(data: Dict[str, Any]) -> None:
+        nonlocal sent
+        if "verdict" in data and "confidence" in data:
+            fields = _verdict_fields(data)
+            if fields != sent:
+                sent = fields
+                verdict, confidence = fields
+                on_verdict({"verdict": verdict, "confidence": confidence})
+
+    return report
+
+
+@metrics.timed("claim_verification")
+async def _verify_claim_uncached(claim: str, max_results: int,
+                                 on_verdict: Optional[Callable[[Dict[str, Any]], None]] = None,
+                                 known: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Search evidence for a single claim and have Gemini judge it (with `known`, a matching
+    published fact-check, as the first piece of evidence)."""
+    query = extract_queries(claim)
+    search_res = await _search_evidence(query, max_results)
+    evidence = search_res.get("results", [])[:max_results] if search_res.get("status") == "ok" else []
+    if known is not None:
+        evidence.insert(0, _known_evidence(known))
+    if not evidence:
+        return {
+            "claim": claim,
+            "status": "skipped",
+            "reason": search_res.get("reason") or "no evidence",
+            "sources": [],
+            "evidence": evidence,
+        }
 
+    prompt = build_factcheck_prompt(claim, evidence)
+    eval_res = await gemini_generate_json(
+        prompt, on_partial=_early_verdict(on_verdict) if on_verdict is not None else None)
+    if eval_res.get("status") != "ok":
+        if known is not None:
+            return _known_claim_result(claim, known)
+        return {
+            "claim": claim,
+            "status": "error",
+            "reason": eval_res.get("reason"),
+            "sources": [ev.get("url", "") for ev in evidence if ev.get("url")],
+            "evidence": evidence,
+        }
 
-def verify_with_osint(text: str, max_results: int = 5) -> Dict[str, Any]:
-    """Run claim extraction, Tavily search and Gemini evaluation to verify text with calibrated metrics."""
-    started = time.time()
-    if not text or not text.strip():
-        return {"status": "skipped", "reason": "empty text"}
+    data = eval_res.get("data") or {}
+    verdict, confidence = _verdict_fields(data)
+    reasoning = str(data.get("reasoning", "")).strip()
+    sources = data.get("sources") or [ev.get(
+        "url", "") for ev in evidence if ev.get("url")]
 
-    # Cache
-    key = hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
-    cached = _cache_get(key)
-    if cached is not None:
-        return {**cached, "cached": True}
+    return {
+        "claim": claim,
+        "status": "ok",
+        "verdict": verdict,
+        "confidence": confidence,
+        "reasoning": reasoning,
+        "sources": sources[:max_results],
+        "model_used": eval_res.get("model_used"),
+        "evidence": evidence,
+        **({"known_fact_check": known} if known is not None else {}),
+    }
+
+
+_DEADLINE_REASON = "verification deadline exceeded"
+
+
+# Progress callback: on_event(event_name, data)
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+
+async def _verify_claims_concurrently(claims: List[str], max_results: int, deadline: float,
+                                      on_event: Optional[ProgressCallback] = None) -> List[Dict[str, Any]]:
+    """Fan out `_verify_claim` as asyncio tasks, at most VERIFY_MAX_PARALLEL at a time.
 
-    # 1) Extract claims (best-effort). If unavailable, treat entire text as single claim
-    claims = gemini_extract_claims(text) or []
+    Claims that have not finished by `deadline` (a `time.time()` timestamp) are
+    cancelled and reported with status "error" instead of holding up the whole request.
+    """
     if not claims:
-        claims = [text.strip()]
+        return []
+    sem = asyncio.Semaphore(max(1, settings.VERIFY_MAX_PARALLEL))
+
+    async def run(index: int, claim: str) -> Dict[str, Any]:
+        on_verdict = None
+        if on_event is not None:
+            def on_verdict(data: Dict[str, Any]) -> None:
+                on_event("verdict", {"index": index, "claim": claim, **data})
+        async with sem:
+            result = await _verify_claim(claim, max_results, on_verdict)
+        if on_event is not None:
+            on_event("claim", {"index": index, **result})
+        return result
+
+    tasks = [asyncio.ensure_future(run(i, c)) for i, c in enumerate(claims)]
+    await asyncio.wait(tasks, timeout=max(0.0, deadline - time.time()))
 
     per_claim: List[Dict[str, Any]] = []
-    # 2) Verify each claim
-    for claim in claims[:5]:
-        query = extract_queries(claim)
-        search_res = tavily_search(query, max_results=max_results)
-        evidence = search_res.get("results", [])[:max_results]
-        if search_res.get("status") != "ok" or not evidence:
+    for claim, task in zip(claims, tasks):
+        if not task.done():
+            task.cancel()
             per_claim.append({
                 "claim": claim,
-                "status": "skipped",
-                "reason": search_res.get("reason") or "no evidence",
+                "status": "error",
+                "reason": _DEADLINE_REASON,
                 "sources": [],
-                "evidence": evidence,
+                "evidence": [],
             })
             continue
-
-        prompt = build_factcheck_prompt(claim, evidence)
-        eval_res = gemini_generate_json(prompt)
-        if eval_res.get("status") != "ok":
+        try:
+            per_claim.append(task.result())
+        except Exception as e:
+            logger.warning("Claim verification failed: %s", e)
             per_claim.append({
                 "claim": claim,
                 "status": "error",
-                "reason": eval_res.get("reason"),
-                "sources": [ev.get("url", "") for ev in evidence if ev.get("url")],
-                "evidence": evidence,
+                "reason": str(e),
+                "sources": [],
+                "evidence": [],
             })
-            continue
+    return per_claim
 
-        data = eval_res.get("data") or {}
-        verdict = str(data.get("verdict", "uncertain")).lower()
-        if verdict not in ("true", "false", "uncertain"):
-            verdict = "uncertain"
-        try:
-            confidence = float(data.get("confidence", 0.5))
-        except Exception:
-            confidence = 0.5
-        reasoning = str(data.get("reasoning", "")).strip()
-        sources = data.get("sources") or [ev.get(
-            "url", "") for ev in evidence if ev.get("url")]
-
-        per_claim.append({
-            "claim": claim,
-            "status": "ok",
-            "verdict": verdict,
-            "confidence": max(0.0, min(1.0, confidence)),
-            "reasoning": reasoning,
-            "sources": sources[:max_results],
-            "model_used": eval_res.get("model_used"),
-            "evidence": evidence,
-        })
+
+@metrics.timed("verification")
+async def verify_with_osint(text: str, max_results: int = 5,
+                            on_event: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """Run claim extraction, Tavily search and Gemini evaluation to verify text with calibrated metrics."""
+    started = time.time()
+    if not text or not text.strip():
+        return {"status": "skipped", "reason": "empty text"}
+
+    # Cache
+    key = text_cache_key(text)
+    cached = await _cache_get(_VERIFY_CACHE, key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    # progress events go to every caller sharing the flight (see single_flight); callers that
+    # want them only share flights that report them
+    flight = f"{key}:events" if on_event is not None else key
+    result, shared = await _TEXT_FLIGHTS.do(
+        flight, lambda emit: _verify_text(text, key, started, max_results, emit if on_event else None),
+        on_event)
+    if shared:
+        return {**result, "coalesced": True}
+    return result
+
+
+async def _verify_text(text: str, key: str, started: float, max_results: int,
+                       on_event: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """Uncached path of `verify_with_osint`; runs once per in-flight text key."""
+    # Near-duplicate of an earlier input (reposted story with small edits)?
+    fingerprint = None
+    if settings.NEAR_DUP_ENABLED:
+        fp, n_shingles = simhash(text)
+        if n_shingles >= settings.NEAR_DUP_MIN_SHINGLES:
+            fingerprint = fp
+            match = near_duplicates.query(fp)
+            if match is not None:
+                match_key, similarity = match
+                cached = await _cache_get(_VERIFY_CACHE, match_key)
+                if cached is not None:
+                    # seed the exact key so the next identical repost is a direct hit
+                    await _cache_set(_VERIFY_CACHE, key, cached)
+                    return {**cached, "cached": True, "near_duplicate": {"similarity": round(similarity, 4)}}
+
+    # 1) Extract claims (best-effort). If unavailable or too slow, treat entire text as single
+    #    claim: extraction gets a share of the deadline so the claims keep the rest of it.
+    deadline = started + settings.VERIFY_DEADLINE_SECONDS
+    budget = min(settings.VERIFY_DEADLINE_SECONDS * settings.VERIFY_EXTRACTION_SHARE,
+                 deadline - time.time())
+    try:
+        claims = await asyncio.wait_for(gemini_extract_claims(text), timeout=max(0.0, budget)) or []
+    except asyncio.TimeoutError:
+        logger.warning("Claim extraction exceeded its %.1fs budget; checking the text as one claim", budget)
+        claims = []
+    if not claims:
+        claims = [text.strip()]
+    if on_event is not None:
+        on_event("claims", {"claims": claims[:5]})
+
+    # 2) Verify claims concurrently within the remaining budget; results keep the original claim order
+    per_claim = await _verify_claims_concurrently(
+        claims[:5], max_results, deadline=deadline, on_event=on_event)
 
     duration_ms = int((time.time() - started) * 1000)
 
@@ -485,11 +709,17 @@ def verify_with_osint(text: str, max_results: int = 5) -> Dict[str, Any]:
         "fake_risk": agg["fake_risk"],
         "overall_credibility": agg["overall_credibility"],
         "claims_found": len(claims),
+        "claim_cache_hits": sum(1 for r in per_claim if r.get("cached")),
+        "known_fact_checks": sum(1 for r in per_claim if r.get("known_fact_check")),
         "per_claim": per_claim,
         # include union of top sources from ok claims
         "sources": list({u for r in ok_results for u in (r.get("sources") or [])})[:max_results],
         "duration_ms": duration_ms,
     }
 
-    _cache_set(key, result)
+    # Don't pin a partial answer in the cache when claims ran out of time
+    if not any(r.get("reason") == _DEADLINE_REASON for r in per_claim):
+        await _cache_set(_VERIFY_CACHE, key, result)
+        if fingerprint is not None:
+            near_duplicates.add(fingerprint, key)
     return result
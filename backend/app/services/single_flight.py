@@ -0,0 +1,109 @@
+"""
+Request coalescing ("single flight") for the verification pipeline.
+
+When a rumor goes viral many users submit the same text within seconds; every one of them misses
+the cache because the first verification hasn't finished yet. `SingleFlight.do` lets the first
+caller for a key run the work while later callers for the same key await its result.
+
+Progress events are shared too: the work reports them through the `emit` callback it is given,
+and every caller that passed a `listener` receives them, including those emitted before it
+joined (they are replayed), so a streaming client that joins a flight still sees every step.
+
+Coalescing is per process (per event loop); the shared caches cover repeats across workers.
+
+A flight's upstream calls run at the priority of the caller that started it (see
+upstream_scheduler). So that an interactive request never waits behind batch-priority calls, it
+only joins flights started by interactive callers; batch callers join either kind.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .upstream_scheduler import INTERACTIVE, current_priority
+
+logger = logging.getLogger(__name__)
+
+Emit = Callable[..., None]
+
+
+class _Flight:
+    __slots__ = ("task", "listeners", "events")
+
+    def __init__(self):
+        self.task: Optional[asyncio.Future] = None
+        self.listeners: List[Emit] = []
+        self.events: List[tuple] = []
+
+    def emit(self, *event: Any) -> None:
+        self.events.append(event)
+        for listener in list(self.listeners):
+            _notify(listener, event)
+
+
+def _notify(listener: Emit, event: tuple) -> None:
+    # one caller's failing listener must not break the work shared with the others
+    try:
+        listener(*event)
+    except Exception as e:
+        logger.warning("Single-flight listener failed: %s", e)
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Tuple[str, str], _Flight] = {}  # (priority, key) -> work
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[Emit], Awaitable[Any]],
+                 listener: Optional[Emit] = None) -> Tuple[Any, bool]:
+        """Run `fn(emit)` once per in-flight `key`; returns (result, shared).
+
+        `shared` is True for callers that joined an existing flight. `listener` receives every
+        event the work emits while this caller waits. The work is shielded, so a caller that is
+        cancelled (e.g. client disconnect, deadline) doesn't cancel it for others.
+        """
+        level = current_priority()
+        own = (level, key)
+        for name in dict.fromkeys([(INTERACTIVE, key), own]):
+            flight = self._inflight.get(name)
+            if flight is not None:
+                self.coalesced += 1
+                return await self._wait(flight, listener), True
+
+        flight = _Flight()
+        flight.task = asyncio.ensure_future(fn(flight.emit))
+        self._inflight[own] = flight
+        self.started += 1
+
+        def _done(t: asyncio.Future) -> None:
+            if self._inflight.get(own) is flight:
+                del self._inflight[own]
+            # retrieve the exception so an unobserved failure isn't logged as "never retrieved"
+            if not t.cancelled():
+                t.exception()
+
+        flight.task.add_done_callback(_done)
+        return await self._wait(flight, listener), False
+
+    @staticmethod
+    async def _wait(flight: _Flight, listener: Optional[Emit]) -> Any:
+        if listener is None:
+            return await asyncio.shield(flight.task)
+        for event in list(flight.events):
+            _notify(listener, event)
+        flight.listeners.append(listener)
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.listeners.remove(listener)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
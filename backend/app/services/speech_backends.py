@@ -0,0 +1,202 @@
+"""
+Speech recognition engines for SpeechProcessor.
+
+Backends (SPEECH_BACKEND, overridable per language with SPEECH_LANGUAGE_BACKENDS="hi:google,en:vosk"):
+- google:  Google Web Speech through `speech_recognition` (network, no local model)
+- vosk:    offline Kaldi models (needs `vosk` and a model per language under VOSK_MODEL_DIR/<lang>)
+- whisper: offline multilingual Whisper on CPU through `faster-whisper` (WHISPER_MODEL)
+
+Engines are created once per process and their models stay loaded, so only the first segment
+pays the load cost (or none, after `warm_up`). A backend that cannot be loaded for a language
+(package or model missing) falls back to google. Every backend takes 16 kHz mono s16le PCM.
+See benchmarks/bench_speech_backends.py for real-time factor and latency on CPU.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable
+
+from utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+
+class _BaseBackend(ABC):
+    name = "base"
+
+    def __init__(self):
+        self.load_seconds = 0.0
+
+    def load(self, language: str) -> None:
+        """Load whatever `language` needs; raises if the backend can't serve it."""
+
+    @abstractmethod
+    def transcribe(self, pcm: bytes, language: str, locale: str) -> str:
+        ...
+
+
+class GoogleBackend(_BaseBackend):
+    name = "google"
+
+    def __init__(self):
+        super().__init__()
+        import speech_recognition as sr
+
+        self._sr = sr
+        self._recognizer = sr.Recognizer()
+
+    def transcribe(self, pcm: bytes, language: str, locale: str) -> str:
+        sr = self._sr
+        try:
+            return self._recognizer.recognize_google(
+                sr.AudioData(pcm, SAMPLE_RATE, SAMPLE_WIDTH), language=locale)
+        except sr.UnknownValueError:
+            return ""  # segment had no intelligible speech
+
+
+class VoskBackend(_BaseBackend):
+    name = "vosk"
+
+    def __init__(self, model_dir: str):
+        super().__init__()
+        import vosk
+
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self.model_dir = model_dir
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def load(self, language: str) -> None:
+        self._model(language)
+
+    def _model(self, language: str):
+        model = self._models.get(language)
+        if model is None:
+            with self._lock:
+                model = self._models.get(language)
+                if model is None:
+                    path = os.path.join(self.model_dir, language)
+                    if not os.path.isdir(path):
+                        raise FileNotFoundError(f"no Vosk model for '{language}' at {path}")
+                    start = time.perf_counter()
+                    model = self._models[language] = self._vosk.Model(path)
+                    self.load_seconds += time.perf_counter() - start
+        return model
+
+    def transcribe(self, pcm: bytes, language: str, locale: str) -> str:
+        # Models are shared; recognizers are cheap and not thread-safe, so one per segment
+        rec = self._vosk.KaldiRecognizer(self._model(language), SAMPLE_RATE)
+        rec.AcceptWaveform(pcm)
+        return json.loads(rec.FinalResult()).get("text", "")
+
+
+class WhisperBackend(_BaseBackend):
+    name = "whisper"
+
+    def __init__(self, model: str, compute_type: str, workers: int):
+        super().__init__()
+        import numpy as np
+        from faster_whisper import WhisperModel
+
+        self._np = np
+        start = time.perf_counter()
+        # num_workers lets concurrent segments of one recording run in parallel
+        self._model = WhisperModel(model, device="cpu", compute_type=compute_type,
+                                   num_workers=max(1, workers))
+        self.load_seconds = time.perf_counter() - start
+
+    def transcribe(self, pcm: bytes, language: str, locale: str) -> str:
+        audio = self._np.frombuffer(pcm, dtype=self._np.int16).astype(self._np.float32) / 32768.0
+        segments, _ = self._model.transcribe(audio, language=language, beam_size=1,
+                                             vad_filter=False, condition_on_previous_text=False)
+        return " ".join(s.text.strip() for s in segments)
+
+
+def parse_language_backends(value: str) -> Dict[str, str]:
+    """"hi:google,en:vosk" -> {"hi": "google", "en": "vosk"}"""
+    mapping = {}
+    for part in value.split(","):
+        lang, _, backend = part.partition(":")
+        if lang.strip() and backend.strip():
+            mapping[lang.strip().lower()] = backend.strip().lower()
+    return mapping
+
+
+def _make_backend(name: str) -> _BaseBackend:
+    if name == "google":
+        return GoogleBackend()
+    if name == "vosk":
+        return VoskBackend(settings.VOSK_MODEL_DIR)
+    if name == "whisper":
+        return WhisperBackend(settings.WHISPER_MODEL, settings.WHISPER_COMPUTE_TYPE,
+                              settings.SPEECH_MAX_PARALLEL)
+    raise ValueError(f"unknown speech backend '{name}'")
+
+
+class SpeechBackends:
+    """Per-language backend selection over engines that are loaded once and kept warm."""
+
+    def __init__(self, default: str, per_language: Dict[str, str]):
+        self.default = default
+        self.per_language = per_language
+        self._engines: Dict[str, _BaseBackend] = {}
+        self._resolved: Dict[str, _BaseBackend] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def configured(self, language: str) -> str:
+        return self.per_language.get(language, self.default)
+
+    def _engine(self, name: str) -> _BaseBackend:
+        engine = self._engines.get(name)
+        if engine is None:
+            engine = self._engines[name] = _make_backend(name)
+        return engine
+
+    def for_language(self, language: str) -> _BaseBackend:
+        backend = self._resolved.get(language)
+        if backend is not None:
+            return backend
+        with self._lock:
+            backend = self._resolved.get(language)
+            if backend is None:
+                name = self.configured(language)
+                try:
+                    backend = self._engine(name)
+                    backend.load(language)
+                except Exception as e:
+                    if name == "google":
+                        raise
+                    logger.warning("Speech backend %s unavailable for '%s' (%s); using google",
+                                   name, language, e)
+                    self._errors[f"{name}:{language}"] = str(e)
+                    backend = self._engine("google")
+                self._resolved[language] = backend
+        return backend
+
+    def warm_up(self, languages: Iterable[str]) -> Dict[str, str]:
+        """Load the backends for `languages` now; returns language -> backend name in use."""
+        return {lang: self.for_language(lang).name for lang in languages}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "default": self.default,
+            "per_language": dict(self.per_language),
+            "resolved": {lang: b.name for lang, b in self._resolved.items()},
+            "load_seconds": {name: round(e.load_seconds, 3) for name, e in self._engines.items()},
+            "errors": dict(self._errors),
+        }
+
+
+speech_backends = SpeechBackends(settings.SPEECH_BACKEND,
+                                 parse_language_backends(settings.SPEECH_LANGUAGE_BACKENDS))
@@ -1,12 +1,143 @@
-import io
-import tempfile
-import os
+"""
+Speech-to-text for /check-voice.
+
+The upload is streamed through ffmpeg (stdin -> 16 kHz mono 16-bit PCM on stdout) without
+temporary files. PCM is cut into segments at pauses (or every SPEECH_MAX_SEGMENT_SECONDS), and
+each segment is recognized in a worker thread as soon as it is complete, up to
+SPEECH_MAX_PARALLEL at a time, by the engine configured for the language (see speech_backends).
+Decoding pauses while that many segments are in flight, so memory stays bounded by a few
+segments regardless of recording length.
+"""
+
+import array
+import asyncio
+import math
+import shutil
+import warnings
+from typing import AsyncIterator, Dict, List, Optional
+
+from utils.config import settings
+from . import metrics
+from .speech_backends import SAMPLE_RATE, SAMPLE_WIDTH, speech_backends
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    try:
+        import audioop  # C RMS; removed in Python 3.13
+    except ImportError:
+        audioop = None
+
+FRAME_MS = 30
+_FRAME_BYTES = SAMPLE_RATE * SAMPLE_WIDTH * FRAME_MS // 1000
+_UPLOAD_CHUNK = 64 * 1024
+_PCM_CHUNK = 64 * 1024
+
+
+def _rms(frame: bytes) -> float:
+    if audioop is not None:
+        return audioop.rms(frame, SAMPLE_WIDTH)
+    samples = array.array("h", frame)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class SilenceSegmenter:
+    """Splits a PCM stream into speech segments at pauses.
+
+    A segment ends after `min_silence_ms` of frames quieter than `silence_rms`, or when it
+    reaches `max_segment_s`. Segments without any voiced frame are dropped.
+    """
+
+    def __init__(self, silence_rms: float, min_silence_ms: int, max_segment_s: float):
+        self.silence_rms = silence_rms
+        self.min_silence_frames = max(1, min_silence_ms // FRAME_MS)
+        self.max_segment_bytes = int(max_segment_s * 1000 / FRAME_MS) * _FRAME_BYTES
+        self._pending = b""
+        self._segment = bytearray()
+        self._silent_run = 0
+        self._voiced = False
+
+    def feed(self, pcm: bytes) -> List[bytes]:
+        data = self._pending + pcm
+        usable = len(data) - len(data) % _FRAME_BYTES
+        self._pending = data[usable:]
+        done = []
+        for off in range(0, usable, _FRAME_BYTES):
+            frame = data[off:off + _FRAME_BYTES]
+            silent = _rms(frame) < self.silence_rms
+            self._segment += frame
+            if silent:
+                self._silent_run += 1
+            else:
+                self._silent_run = 0
+                self._voiced = True
+            if (self._voiced and self._silent_run >= self.min_silence_frames) or \
+                    len(self._segment) >= self.max_segment_bytes:
+                segment = self._cut()
+                if segment:
+                    done.append(segment)
+        return done
+
+    def flush(self) -> Optional[bytes]:
+        self._segment += self._pending
+        self._pending = b""
+        return self._cut()
+
+    def _cut(self) -> Optional[bytes]:
+        segment, voiced = bytes(self._segment), self._voiced
+        self._segment = bytearray()
+        self._silent_run = 0
+        self._voiced = False
+        return segment if voiced else None
+
+
+async def decode_to_pcm(audio_file) -> AsyncIterator[bytes]:
+    """Stream an uploaded file (anything ffmpeg reads) as 16 kHz mono s16le PCM chunks."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is required to decode audio uploads")
+    proc = await asyncio.create_subprocess_exec(
+        ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0", "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1",
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def pump_upload():
+        try:
+            while True:
+                chunk = await audio_file.read(_UPLOAD_CHUNK)
+                if not chunk:
+                    break
+                proc.stdin.write(chunk)
+                await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg stopped reading (bad input); its exit status reports why
+        finally:
+            proc.stdin.close()
+
+    writer = asyncio.create_task(pump_upload())
+    try:
+        while True:
+            pcm = await proc.stdout.read(_PCM_CHUNK)
+            if not pcm:
+                break
+            yield pcm
+        await writer
+        stderr = await proc.stderr.read()
+        if await proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode('utf-8', 'ignore').strip()[:300]}")
+    finally:
+        writer.cancel()
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
 
 
 class SpeechProcessor:
     def __init__(self):
-        # Defer creation of the recognizer to avoid import-time errors
-        self.recognizer = None
         self.supported_languages = {
             'en': 'en-US',
             'hi': 'hi-IN',
@@ -16,38 +147,53 @@ class SpeechProcessor:
             'mr': 'mr-IN'
         }
 
-    async def speech_to_text(self, audio_file, language: str = 'en') -> str:
-        """Convert speech to text with multilingual support"""
-        try:
-            # Local imports to avoid import-time dependency errors
-            import speech_recognition as sr
-            from pydub import AudioSegment
-            # Convert uploaded audio to WAV format
-            audio_data = await audio_file.read()
-            audio = AudioSegment.from_file(io.BytesIO(audio_data))
-
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                audio.export(temp_file.name, format="wav")
+    def warm_up(self) -> Dict[str, str]:
+        """Load the recognizer for every supported language; returns language -> backend."""
+        return speech_backends.warm_up(self.supported_languages)
 
-                with sr.AudioFile(temp_file.name) as source:
-                    # Ensure recognizer exists
-                    if self.recognizer is None:
-                        self.recognizer = sr.Recognizer()
+    def _recognize_segment(self, pcm: bytes, language: str) -> str:
+        """Recognize one PCM segment (blocking; runs in a worker thread)."""
+        backend = speech_backends.for_language(language)
+        with metrics.stage(f"speech_recognition_{backend.name}"):
+            return backend.transcribe(pcm, language, self.supported_languages[language])
 
-                    recorded = self.recognizer.record(source)
-
-                    # Use Google Speech Recognition
-                    language_code = self.supported_languages.get(
-                        language, 'en-US')
-                    text = self.recognizer.recognize_google(
-                        recorded, language=language_code)
+    @metrics.timed("speech_to_text")
+    async def speech_to_text(self, audio_file, language: str = 'en') -> str:
+        """Convert speech to text with multilingual support"""
+        if language not in self.supported_languages:
+            language = 'en'
+        segmenter = SilenceSegmenter(
+            silence_rms=settings.SPEECH_SILENCE_RMS,
+            min_silence_ms=settings.SPEECH_MIN_SILENCE_MS,
+            max_segment_s=settings.SPEECH_MAX_SEGMENT_SECONDS,
+        )
+        sem = asyncio.Semaphore(max(1, settings.SPEECH_MAX_PARALLEL))
+        tasks: List[asyncio.Task] = []
 
-                # Clean up
-                os.unlink(temp_file.name)
+        async def recognize(pcm: bytes) -> str:
+            try:
+                return await asyncio.to_thread(self._recognize_segment, pcm, language)
+            finally:
+                sem.release()
 
-            return text
+        async def submit(pcm: bytes) -> None:
+            # blocks decoding while SPEECH_MAX_PARALLEL segments are being recognized
+            await sem.acquire()
+            tasks.append(asyncio.create_task(recognize(pcm)))
 
+        try:
+            async for pcm in decode_to_pcm(audio_file):
+                for segment in segmenter.feed(pcm):
+                    await submit(segment)
+            last = segmenter.flush()
+            if last:
+                await submit(last)
+            texts = await asyncio.gather(*tasks)
         except Exception as e:
+            for task in tasks:
+                task.cancel()
             # speech_recognition-specific exceptions may not be importable if
             # package missing; normalize to a generic exception
             raise Exception(f"Error processing audio: {e}")
+
+        return " ".join(t.strip() for t in texts if t and t.strip())
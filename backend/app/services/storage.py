@@ -0,0 +1,385 @@
+"""
+Persistent users and check history at settings.DATABASE_URL.
+
+SQLite (`sqlite:///path/to.db`) in WAL mode, so every uvicorn worker on the host shares the same
+data and it survives restarts:
+- a small connection pool (DATABASE_POOL_SIZE); calls are blocking, routes run them in a thread;
+- history rows are indexed on (user_id, timestamp, id) and read newest first with keyset
+  pagination: a page costs one index range scan however deep the client has paged, where
+  OFFSET would walk every skipped row;
+- history writes go through a single writer thread that commits everything queued since its
+  last commit in one transaction (up to HISTORY_WRITE_BATCH rows), so concurrent checks share
+  one fsync instead of taking turns on the write lock. Callers get the row id once committed.
+  `close()` commits whatever is still queued before closing the pool;
+- results of checks run through the API are stored once in check_results, keyed by language,
+  the verifier's text hash and a hash of the result itself (`result_key`), and history rows
+  reference them. Rows are never updated: a re-check that produces a different result (or a
+  partial/error one) gets its own row, so every history entry keeps the verdict its user saw.
+  The summary view reads a precomputed projection without the per-claim evidence.
+
+Timestamps are stored as UTC ISO-8601 strings with microseconds, so string order is time order.
+See benchmarks/bench_history_store.py.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+_USER_COLUMNS = ("email", "phone", "name", "preferred_language", "created_at")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT,
+    phone TEXT,
+    name TEXT,
+    preferred_language TEXT NOT NULL DEFAULT 'en',
+    created_at TEXT NOT NULL,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS check_history (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    input_text TEXT NOT NULL,
+    input_type TEXT NOT NULL,
+    result TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS check_history_user_time ON check_history(user_id, timestamp, id);
+CREATE TABLE IF NOT EXISTS check_results (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+# Result fields kept by the "summary" history view (everything but per-claim evidence)
+_SUMMARY_VERIFICATION_FIELDS = ("status", "verdict", "confidence", "fake_risk",
+                                "overall_credibility", "claims_found", "sources")
+
+
+def sqlite_path(url: str) -> str:
+    """File path from a `sqlite:///relative.db` or `sqlite:////absolute.db` URL."""
+    prefix = "sqlite:///"
+    if not url.startswith(prefix):
+        raise ValueError(f"Unsupported DATABASE_URL {url!r}: only sqlite:/// URLs are supported")
+    return url[len(prefix):] or ":memory:"
+
+
+def normalize_timestamp(value: Any = None) -> str:
+    """UTC `YYYY-MM-DDTHH:MM:SS.ffffff` for an ISO string or datetime (now if missing/invalid)."""
+    when = None
+    if isinstance(value, datetime):
+        when = value
+    elif isinstance(value, str) and value:
+        try:
+            when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            when = None
+    if when is None:
+        when = datetime.now(timezone.utc)
+    if when.tzinfo is not None:
+        when = when.astimezone(timezone.utc).replace(tzinfo=None)
+    return when.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def result_key(prefix: str, result: Dict[str, Any]) -> str:
+    """Content address of a check result: `prefix` (language and text hash) plus a result digest."""
+    blob = json.dumps(result, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return f"{prefix}:{hashlib.sha256(blob).hexdigest()[:16]}"
+
+
+def summarize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Headline fields of a check result: verdict, confidence and risk without per-claim evidence."""
+    if not isinstance(result, dict):
+        return {}
+    analysis = result.get("analysis") or {}
+    verification = result.get("verification") or {}
+    summary = {
+        "confidence_score": result.get("confidence_score"),
+        "risk_level": analysis.get("risk_level"),
+        "fake_news_probability": analysis.get("fake_news_probability"),
+    }
+    if isinstance(verification, dict) and verification:
+        summary["verification"] = {k: verification[k] for k in _SUMMARY_VERIFICATION_FIELDS
+                                   if k in verification}
+    return summary
+
+
+def encode_cursor(timestamp: str, row_id: int) -> str:
+    raw = json.dumps([timestamp, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return str(timestamp), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class ConnectionPool:
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.uri = False
+        if path == ":memory:":
+            # one shared in-memory database for all pooled connections
+            self.path, self.uri = f"file:verinews-{id(self)}?mode=memory&cache=shared", True
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._size = max(1, size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False,
+                               isolation_level=None, uri=self.uri)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._created < self._size
+                if grow:
+                    self._created += 1
+            conn = self._open() if grow else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class Storage:
+    def __init__(self, url: str, pool_size: int, write_batch: int):
+        self.pool = ConnectionPool(sqlite_path(url), pool_size)
+        self.write_batch = max(1, write_batch)
+        # None is the writer's stop signal, queued by close()
+        self._writes: "queue.Queue[Optional[Tuple[Dict[str, Any], Future]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._closed = False
+        self._batches = 0
+        self._rows_written = 0
+        with self.pool.connection() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {r[1] for r in conn.execute("PRAGMA table_info(check_history)")}
+            if "result_key" not in columns:
+                conn.execute("ALTER TABLE check_history ADD COLUMN result_key TEXT")
+
+    # -- users -------------------------------------------------------------------------------
+
+    def add_user(self, user: Dict[str, Any]) -> bool:
+        """Insert `user`; False if the id is already registered."""
+        extra = {k: v for k, v in user.items() if k != "id" and k not in _USER_COLUMNS}
+        with self.pool.connection() as conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO users (id, email, phone, name, preferred_language, created_at, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (user["id"], user.get("email"), user.get("phone"), user.get("name"),
+                 user.get("preferred_language") or "en",
+                 user.get("created_at") or normalize_timestamp(), json.dumps(extra, default=str)))
+            return cur.rowcount > 0
+
+    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                f"SELECT id, {', '.join(_USER_COLUMNS)}, extra FROM users WHERE id = ?",
+                (user_id,)).fetchone()
+        if row is None:
+            return None
+        user = {"id": row[0], **dict(zip(_USER_COLUMNS, row[1:-1]))}
+        return {**json.loads(row[-1]), **user}
+
+    def update_user(self, user_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Merge `changes` into the user (unknown keys are kept as extra preferences)."""
+        columns = {k: v for k, v in changes.items() if k in _USER_COLUMNS}
+        extra = {k: v for k, v in changes.items() if k != "id" and k not in _USER_COLUMNS}
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT extra FROM users WHERE id = ?", (user_id,)).fetchone()
+                if row is None:
+                    conn.execute("ROLLBACK")
+                    return None
+                merged = {**json.loads(row[0]), **extra}
+                assignments = "".join(f"{k} = ?, " for k in columns)
+                conn.execute(f"UPDATE users SET {assignments}extra = ? WHERE id = ?",
+                             (*columns.values(), json.dumps(merged, default=str), user_id))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self.get_user(user_id)
+
+    # -- history -----------------------------------------------------------------------------
+
+    def add_history(self, entry: Dict[str, Any]) -> Future:
+        """Queue a history row for the next group commit; the future resolves to its id.
+
+        With a `result_key` (see `result_key()`), `result` is stored once in check_results under
+        that key (kept as first written) and the history row only references it.
+        """
+        fut: Future = Future()
+        with self._writer_lock:
+            if self._closed:
+                fut.set_exception(RuntimeError("storage is closed"))
+                return fut
+            self._writes.put((entry, fut))
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="history-writer",
+                                                daemon=True)
+                self._writer.start()
+        return fut
+
+    def _write_loop(self) -> None:
+        stop = False
+        while not stop:
+            batch = []
+            item = self._writes.get()
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.write_batch:
+                    break
+                try:
+                    item = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+            if not batch:
+                continue
+            try:
+                ids = self._insert_history([entry for entry, _ in batch])
+            except Exception as e:
+                logger.warning("History write of %d rows failed: %s", len(batch), e)
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            for (_, fut), row_id in zip(batch, ids):
+                fut.set_result(row_id)
+
+    def _insert_history(self, entries: List[Dict[str, Any]]) -> List[int]:
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = normalize_timestamp()
+                shared = {e["result_key"]: e.get("result") or {} for e in entries if e.get("result_key")}
+                if shared:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO check_results (key, result, summary, updated_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(key, json.dumps(result, default=str),
+                          json.dumps(summarize_result(result), default=str), now)
+                         for key, result in shared.items()])
+                # ids are assigned here, under the write lock, so the batch is one executemany
+                first = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM check_history").fetchone()[0]
+                ids = list(range(first, first + len(entries)))
+                conn.executemany(
+                    "INSERT INTO check_history (id, user_id, input_text, input_type, result, timestamp, result_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(row_id, e["user_id"], e.get("input_text") or "", e.get("input_type") or "text",
+                      "null" if e.get("result_key") else json.dumps(e.get("result") or {}, default=str),
+                      normalize_timestamp(e.get("timestamp")), e.get("result_key"))
+                     for row_id, e in zip(ids, entries)])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        self._batches += 1
+        self._rows_written += len(entries)
+        return ids
+
+    def history_page(self, user_id: str, limit: int, cursor: Optional[str] = None,
+                     view: str = "full") -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Newest-first page of a user's history and the cursor of the next page (None at the end).
+
+        view="summary" returns `summarize_result` of each result instead of the full payload.
+        """
+        params: List[Any] = [user_id]
+        after = ""
+        if cursor:
+            timestamp, row_id = decode_cursor(cursor)
+            after = " AND (h.timestamp, h.id) < (?, ?)"
+            params += [timestamp, row_id]
+        shared = "r.summary" if view == "summary" else "r.result"
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT h.id, h.user_id, h.input_text, h.input_type, h.result, h.timestamp, "
+                f"h.result_key, {shared} FROM check_history h "
+                f"LEFT JOIN check_results r ON r.key = h.result_key WHERE h.user_id = ?{after} "
+                "ORDER BY h.timestamp DESC, h.id DESC LIMIT ?", (*params, limit + 1)).fetchall()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        items = []
+        for r in rows:
+            if r[6] is not None:
+                result = json.loads(r[7]) if r[7] is not None else None
+            else:
+                result = json.loads(r[4])
+                if view == "summary":
+                    result = summarize_result(result)
+            items.append({"id": r[0], "user_id": r[1], "input_text": r[2], "input_type": r[3],
+                          "result": result, "result_key": r[6], "timestamp": r[5]})
+        next_cursor = encode_cursor(rows[-1][5], rows[-1][0]) if more else None
+        return items, next_cursor
+
+    def get_result(self, key: str) -> Optional[Dict[str, Any]]:
+        """Full shared check result stored under `key`."""
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT result FROM check_results WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.pool.path, "pending_writes": self._writes.qsize(),
+                "write_batches": self._batches, "rows_written": self._rows_written}
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Commit the history rows still queued, stop the writer, then close the pool.
+
+        Rows queued before `close` are written (the stop signal queues behind them); later
+        `add_history` calls fail. The writer is a daemon thread, so a stuck database only delays
+        shutdown by `timeout`.
+        """
+        with self._writer_lock:
+            self._closed = True
+            writer = self._writer
+            if writer is not None:
+                self._writes.put(None)
+        if writer is not None:
+            writer.join(timeout)
+            if writer.is_alive():
+                logger.warning("History writer did not finish within %.0fs; %d rows not written",
+                               timeout, self._writes.qsize())
+        self.pool.close()
+
+
+storage = Storage(settings.DATABASE_URL, settings.DATABASE_POOL_SIZE, settings.HISTORY_WRITE_BATCH)
@@ -0,0 +1,266 @@
+"""
+Rate-limit-aware scheduling of upstream API calls (Tavily, Gemini).
+
+Every call through `http_client.post_json` first acquires budget from its provider's token
+buckets: requests per second and (for LLMs) tokens per minute, configured per provider. Waiting
+calls are served in priority order: interactive requests (the default) before batch work, which
+the batch endpoint marks with `priority("batch")`.
+
+On 429 the provider is paused for Retry-After (or the backoff delay when the header is missing)
+and its request rate is halved, then recovers gradually on successes. Other retryable failures
+back off with full jitter. Calls wait for budget instead of failing against the quota and
+falling through to the next model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import email.utils
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from utils.config import settings
+from . import metrics
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+_PRIORITY_ORDER = {INTERACTIVE: 0, BATCH: 1}
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("upstream_priority", default=INTERACTIVE)
+
+# provider name -> host suffix
+_PROVIDER_HOSTS = {
+    "tavily": "api.tavily.com",
+    "gemini": "generativelanguage.googleapis.com",
+}
+
+_RETRY_DELAY_RE = re.compile(r'"retryDelay"\s*:\s*"(\d+(?:\.\d+)?)s"')
+
+QUEUE_SECONDS = metrics.REGISTRY.register(metrics.Histogram(
+    "verinews_upstream_queue_seconds", "Time upstream calls waited for rate-limit budget",
+    ["provider", "priority"]))
+RETRIES = metrics.REGISTRY.register(metrics.Counter(
+    "verinews_upstream_retries", "Upstream calls retried", ["provider", "reason"]))
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def priority(level: str) -> Iterator[None]:
+    """Run upstream calls made inside the block (and tasks created in it) at `level`."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class _Bucket:
+    """Token bucket refilled continuously at `rate` per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+
+class _Waiter:
+    __slots__ = ("loop", "future", "tokens")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, tokens: float):
+        self.loop = loop
+        self.future: Optional[asyncio.Future] = None
+        self.tokens = tokens
+
+
+class ProviderLimiter:
+    def __init__(self, name: str, rps: float, tpm: float):
+        self.name = name
+        self.max_rps = rps
+        self.requests = _Bucket(rps, max(1.0, rps)) if rps > 0 else None
+        self.tokens = _Bucket(tpm / 60.0, tpm) if tpm > 0 else None
+        self.paused_until = 0.0
+        self._queue: List[tuple] = []  # heap of (priority, seq, waiter)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def limited(self) -> bool:
+        return self.requests is not None or self.tokens is not None
+
+    def _wait_time(self, tokens: float, now: float) -> float:
+        wait = max(0.0, self.paused_until - now)
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+    def _wake_head(self) -> None:
+        if self._queue:
+            waiter = self._queue[0][2]
+            fut = waiter.future
+            if fut is not None and not fut.done():
+                waiter.loop.call_soon_threadsafe(lambda f=fut: f.done() or f.set_result(None))
+
+    async def acquire(self, tokens: float, level: str) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop, tokens)
+        entry = (_PRIORITY_ORDER.get(level, 0), next(self._seq), waiter)
+        with self._lock:
+            heapq.heappush(self._queue, entry)
+        try:
+            while True:
+                with self._lock:
+                    if self._queue[0] is entry:
+                        wait = self._wait_time(tokens, time.monotonic())
+                        if wait <= 0:
+                            heapq.heappop(self._queue)
+                            if self.requests is not None:
+                                self.requests.take(1)
+                            if self.tokens is not None and tokens:
+                                self.tokens.take(tokens)
+                            self._wake_head()
+                            return
+                        waiter.future = None
+                    else:
+                        # not our turn: sleep until the waiter ahead of us is served
+                        wait = None
+                        waiter.future = loop.create_future()
+                if wait is None:
+                    await waiter.future
+                else:
+                    # head of the queue: sleep until the buckets refill (a higher-priority
+                    # arrival may take over meanwhile; then we fall back to waiting our turn)
+                    await asyncio.sleep(wait)
+        except BaseException:
+            with self._lock:
+                if entry in self._queue:
+                    was_head = self._queue[0] is entry
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    if was_head:
+                        self._wake_head()
+            raise
+
+    def settle(self, estimated: float, actual: float) -> None:
+        """Charge the difference once the real token usage is known."""
+        if self.tokens is not None and actual:
+            with self._lock:
+                self.tokens.tokens -= actual - estimated
+
+    def throttle(self, pause: float) -> None:
+        """Quota exceeded: stop sending for `pause` seconds and halve the request rate."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+            if self.requests is not None:
+                self.requests.rate = max(self.max_rps * 0.1, self.requests.rate * 0.5)
+
+    def recover(self) -> None:
+        if self.requests is not None and self.requests.rate < self.max_rps:
+            with self._lock:
+                self.requests.rate = min(self.max_rps, self.requests.rate + self.max_rps * 0.05)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "queued": len(self._queue),
+                "max_rps": self.max_rps,
+                "current_rps": self.requests.rate if self.requests else None,
+                "tpm": self.tokens.capacity if self.tokens else None,
+                "paused_for": max(0.0, self.paused_until - now),
+            }
+
+
+class UpstreamScheduler:
+    def __init__(self, limits: Dict[str, Dict[str, float]]):
+        self.providers = {name: ProviderLimiter(name, cfg.get("rps", 0), cfg.get("tpm", 0))
+                          for name, cfg in limits.items()}
+
+    def provider_for(self, url: str) -> Optional[ProviderLimiter]:
+        host = urlsplit(url).hostname or ""
+        for name, suffix in _PROVIDER_HOSTS.items():
+            if host == suffix or host.endswith("." + suffix):
+                return self.providers.get(name)
+        return None
+
+    async def acquire(self, provider: Optional[ProviderLimiter], tokens: float = 0) -> None:
+        if provider is None or not provider.limited:
+            return
+        level = current_priority()
+        start = time.perf_counter()
+        await provider.acquire(tokens, level)
+        QUEUE_SECONDS.observe(time.perf_counter() - start, provider=provider.name, priority=level)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: p.stats() for name, p in self.providers.items()}
+
+
+def estimate_tokens(body: bytes) -> int:
+    """Rough prompt size (about 4 bytes per token) charged against a TPM budget up front."""
+    return max(1, len(body) // 4)
+
+
+def used_tokens(response: Dict[str, Any]) -> int:
+    """Actual token usage reported by Gemini (0 if absent)."""
+    usage = response.get("usageMetadata") if isinstance(response, dict) else None
+    try:
+        return int((usage or {}).get("totalTokenCount") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def retry_after(headers: Dict[str, str], body: str = "") -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta or HTTP date) or Gemini's retryDelay."""
+    value = None
+    for k, v in (headers or {}).items():
+        if k.lower() == "retry-after":
+            value = v
+            break
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                when = email.utils.parsedate_to_datetime(value)
+                return max(0.0, when.timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    m = _RETRY_DELAY_RE.search(body or "")
+    return float(m.group(1)) if m else None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    cap = min(settings.UPSTREAM_BACKOFF_MAX, settings.UPSTREAM_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+upstream_scheduler = UpstreamScheduler({
+    "tavily": {"rps": settings.TAVILY_RPS, "tpm": 0},
+    "gemini": {"rps": settings.GEMINI_RPS, "tpm": settings.GEMINI_TPM},
+})
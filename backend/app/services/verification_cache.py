@@ -0,0 +1,311 @@
+"""
+Pluggable result cache for the verification pipeline.
+
+Backends (selected with VERIFY_CACHE_BACKEND):
+- memory: in-process LRU (the previous behaviour, now bounded by bytes instead of entry count)
+- sqlite: on-disk file shared by every worker on the host and kept across restarts
+- redis:  any Redis-compatible server, shared across hosts (needs the optional `redis` package)
+
+All backends store JSON-serializable dicts, honour a per-entry TTL, evict by total byte size
+and keep hit/miss counters for `stats()`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from utils.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class _BaseCache(ABC):
+    backend = "base"
+    # True when get/set may block on I/O and should run off the event loop
+    blocking = False
+
+    def __init__(self, namespace: str, max_bytes: int, default_ttl: float):
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._counters = {"hits": 0, "misses": 0,
+                          "sets": 0, "evictions": 0, "expired": 0}
+        self._counter_lock = threading.Lock()
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._counter_lock:
+            self._counters[name] += n
+
+    @abstractmethod
+    def get(self, key: str) -> Dict[str, Any] | None:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any], ttl: float | None = None) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def _usage(self) -> Tuple[int, int]:
+        """(entries, bytes) currently stored."""
+        return 0, 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        entries, size = self._usage()
+        return {
+            "backend": self.backend,
+            "namespace": self.namespace,
+            **counters,
+            "hit_ratio": (counters["hits"] / lookups) if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class MemoryCache(_BaseCache):
+    """Process-local LRU bounded by the JSON size of its values.
+
+    Values are kept as JSON text, so each `get` returns a fresh copy like the shared backends do:
+    callers can't alter the cached entry by mutating a result.
+    """
+
+    backend = "memory"
+
+    def __init__(self, namespace: str, max_bytes: int, default_ttl: float):
+        super().__init__(namespace, max_bytes, default_ttl)
+        # key -> (expires_at, size, JSON text of the value)
+        self._data: OrderedDict[str, Tuple[float, int, str]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] <= time.time():
+                self._data.pop(key)
+                self._bytes -= item[1]
+                self._count("expired")
+                item = None
+            if item is None:
+                self._count("misses")
+                return None
+            # mark as most-recently-used
+            self._data.move_to_end(key)
+        self._count("hits")
+        return json.loads(item[2])
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float | None = None) -> None:
+        text = json.dumps(value, default=str)
+        size = len(text)
+        expires_at = time.time() + (ttl or self.default_ttl)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._data[key] = (expires_at, size, text)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._data:
+                # pop least-recently-used
+                _, (_, old_size, _) = self._data.popitem(last=False)
+                self._bytes -= old_size
+                self._count("evictions")
+        self._count("sets")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _usage(self) -> Tuple[int, int]:
+        with self._lock:
+            return len(self._data), self._bytes
+
+
+class SQLiteCache(_BaseCache):
+    """On-disk cache in a single SQLite file (WAL mode, safe across worker processes).
+
+    Total size is maintained by triggers so eviction doesn't need a table scan.
+    """
+
+    backend = "sqlite"
+    blocking = True
+
+    def __init__(self, namespace: str, max_bytes: int, default_ttl: float, path: str):
+        super().__init__(namespace, max_bytes, default_ttl)
+        self.path = path
+        self._table = f"cache_{namespace}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        t = self._table
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS {t} (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS {t}_accessed ON {t}(accessed_at);
+            CREATE TABLE IF NOT EXISTS {t}_meta (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL);
+            INSERT OR IGNORE INTO {t}_meta (id, total) VALUES (0, 0);
+            CREATE TRIGGER IF NOT EXISTS {t}_ins AFTER INSERT ON {t}
+                BEGIN UPDATE {t}_meta SET total = total + NEW.size WHERE id = 0; END;
+            CREATE TRIGGER IF NOT EXISTS {t}_del AFTER DELETE ON {t}
+                BEGIN UPDATE {t}_meta SET total = total - OLD.size WHERE id = 0; END;
+            CREATE TRIGGER IF NOT EXISTS {t}_upd AFTER UPDATE OF size ON {t}
+                BEGIN UPDATE {t}_meta SET total = total - OLD.size + NEW.size WHERE id = 0; END;
+        """)
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        t = self._table
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {t} WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] <= now:
+                self._conn.execute(f"DELETE FROM {t} WHERE key = ?", (key,))
+                self._count("expired")
+                row = None
+            if row is None:
+                self._count("misses")
+                return None
+            self._conn.execute(
+                f"UPDATE {t} SET accessed_at = ? WHERE key = ?", (now, key))
+        self._count("hits")
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float | None = None) -> None:
+        blob = json.dumps(value, default=str).encode("utf-8")
+        if len(blob) > self.max_bytes:
+            return
+        t = self._table
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {t} (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, len(blob), now + (ttl or self.default_ttl), now))
+                evicted = self._evict(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._count("sets")
+        if evicted:
+            self._count("evictions", evicted)
+
+    def _evict(self, now: float) -> int:
+        t = self._table
+        self._conn.execute(f"DELETE FROM {t} WHERE expires_at <= ?", (now,))
+        evicted = 0
+        while True:
+            total = self._conn.execute(
+                f"SELECT total FROM {t}_meta WHERE id = 0").fetchone()[0]
+            if total <= self.max_bytes:
+                return evicted
+            # drop the least-recently-used rows in small batches
+            cur = self._conn.execute(
+                f"DELETE FROM {t} WHERE key IN (SELECT key FROM {t} ORDER BY accessed_at LIMIT 16)")
+            if cur.rowcount <= 0:
+                return evicted
+            evicted += cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self._table}")
+
+    def _usage(self) -> Tuple[int, int]:
+        t = self._table
+        with self._lock:
+            entries = self._conn.execute(
+                f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+            total = self._conn.execute(
+                f"SELECT total FROM {t}_meta WHERE id = 0").fetchone()[0]
+        return entries, total
+
+
+class RedisCache(_BaseCache):
+    """Redis-compatible backend. TTLs map to key expiry; byte-size eviction is left to the
+    server's `maxmemory` / `maxmemory-policy allkeys-lru` settings."""
+
+    backend = "redis"
+    blocking = True
+
+    def __init__(self, namespace: str, max_bytes: int, default_ttl: float, url: str):
+        import redis  # optional dependency
+
+        super().__init__(namespace, max_bytes, default_ttl)
+        self._client = redis.Redis.from_url(
+            url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        self._prefix = f"verinews:{namespace}:"
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        try:
+            raw = self._client.get(self._prefix + key)
+        except Exception as e:
+            logger.warning("Redis cache get failed: %s", e)
+            raw = None
+        if raw is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return json.loads(raw)
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float | None = None) -> None:
+        blob = json.dumps(value, default=str).encode("utf-8")
+        if len(blob) > self.max_bytes:
+            return
+        try:
+            self._client.set(self._prefix + key, blob,
+                             px=int((ttl or self.default_ttl) * 1000))
+        except Exception as e:
+            logger.warning("Redis cache set failed: %s", e)
+            return
+        self._count("sets")
+
+    def clear(self) -> None:
+        for k in self._client.scan_iter(match=self._prefix + "*", count=500):
+            self._client.delete(k)
+
+    def _usage(self) -> Tuple[int, int]:
+        try:
+            used = int(self._client.info("memory").get("used_memory", 0))
+        except Exception:
+            used = 0
+        return -1, used
+
+
+def make_cache(namespace: str, default_ttl: float | None = None) -> _BaseCache:
+    """Build the configured cache backend for `namespace` (falls back to memory on errors)."""
+    backend = settings.VERIFY_CACHE_BACKEND
+    max_bytes = settings.VERIFY_CACHE_MAX_BYTES
+    ttl = default_ttl or settings.VERIFY_CACHE_TTL
+    try:
+        if backend == "sqlite":
+            return SQLiteCache(namespace, max_bytes, ttl, settings.VERIFY_CACHE_PATH)
+        if backend == "redis":
+            return RedisCache(namespace, max_bytes, ttl, settings.VERIFY_CACHE_REDIS_URL)
+    except Exception as e:
+        logger.warning(
+            "Cache backend %s unavailable (%s); using in-memory cache", backend, e)
+    return MemoryCache(namespace, max_bytes, ttl)
@@ -0,0 +1,54 @@
+"""
+Background warm-up of slow-loading models (OCR reader, speech engines) at startup.
+
+Each component loads in a worker thread while the API already serves requests; `/health`
+reports per-component state (loading, ready, unavailable, failed) and whether warm-up is done.
+A component that fails to load doesn't block anything: its callers load lazily or fall back
+(e.g. Gemini OCR) as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    def __init__(self):
+        self._components: Dict[str, Dict[str, Any]] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, name: str, load: Callable[[], Any]) -> asyncio.Task:
+        """Run blocking `load()` in a thread; its return value (if any) is reported as detail."""
+        self._components[name] = {"state": "loading"}
+
+        async def run():
+            start = time.perf_counter()
+            try:
+                detail = await asyncio.to_thread(load)
+            except ImportError as e:
+                state = {"state": "unavailable", "error": str(e)}
+            except Exception as e:
+                logger.warning("Warm-up of %s failed: %s", name, e)
+                state = {"state": "failed", "error": str(e)}
+            else:
+                state = {"state": "ready", **({"detail": detail} if detail else {})}
+            self._components[name] = {**state, "seconds": round(time.perf_counter() - start, 3)}
+
+        task = asyncio.create_task(run())
+        self._tasks.append(task)
+        return task
+
+    @property
+    def done(self) -> bool:
+        return all(c["state"] != "loading" for c in self._components.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"ready": self.done, "components": {k: dict(v) for k, v in self._components.items()}}
+
+
+warmup = Warmup()
@@ -0,0 +1,79 @@
+"""
+Benchmark: domain reputation lookups (target: >= 100k lookups/sec).
+
+Loads 50k synthetic ratings and scores source URLs on hosts that are mostly subdomains of rated
+domains: a first pass that fills the per-host memo, then a warm pass (the production steady state).
+
+Run from backend/:  python -m benchmarks.bench_domain_reputation
+                    (or as a script: python benchmarks/bench_domain_reputation.py)
+"""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # run as a script: make `app` and `benchmarks` importable from backend/
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import tempfile
+import time
+
+from app.services.domain_reputation import DomainReputation
+
+
+def make_ratings(n: int, rng: random.Random):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    tlds = ["com", "org", "net", "in", "co.uk", "gov.in", "com.au"]
+    return [f"{''.join(rng.choice(letters) for _ in range(rng.randint(4, 12)))}.{rng.choice(tlds)}"
+            for _ in range(n)]
+
+
+def make_urls(domains, n: int, rng: random.Random):
+    subs = ["", "www.", "edition.", "news.", "m.", "amp.live."]
+    urls = []
+    for i in range(n):
+        domain = rng.choice(domains) if rng.random() < 0.8 else f"unrated{i % 2000}.example.net"
+        urls.append(f"https://{rng.choice(subs)}{domain}/2024/05/{i}/story.html?utm_source=x")
+    return urls
+
+
+def main():
+    rng = random.Random(0)
+    domains = make_ratings(50_000, rng)
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+        f.write("\n".join(f"{d},{rng.random():.2f}" for d in domains))
+    try:
+        rep = DomainReputation()
+        t0 = time.perf_counter()
+        rep.load(f.name)
+        load_ms = (time.perf_counter() - t0) * 1000
+    finally:
+        os.unlink(f.name)
+
+    # sources cluster on a few thousand outlets; keep the host set within the memo size
+    urls = make_urls(domains[:5000], 200_000, rng)
+    t0 = time.perf_counter()
+    for u in urls:
+        rep.score_url(u)
+    cold = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for u in urls:
+        rep.score_url(u)
+    warm = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for i in range(0, len(urls), 3):
+        rep.score_urls(urls[i:i + 3])
+    batch = time.perf_counter() - t0
+
+    print(f"load 50k ratings: {load_ms:.1f} ms")
+    print(f"first pass:     {len(urls) / cold:>12,.0f} /s")
+    print(f"warm pass:      {len(urls) / warm:>12,.0f} /s")
+    print(f"batches of 3:   {len(urls) / batch:>12,.0f} URLs/s")
+    print(rep.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: event-loop stall under mixed load for each CPU_EXECUTOR_MODE.
+
+A heartbeat task ticks every 5 ms (standing in for the other connections on the loop) while a
+steady stream of small requests arrives with a few large pasted articles mixed in. Reports the
+worst, p99 and median heartbeat lag plus the wall time for the whole mix.
+
+Run from backend/:  python -m benchmarks.bench_event_loop_stall
+                    (or as a script: python benchmarks/bench_event_loop_stall.py)
+"""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # run as a script: make `app` and `benchmarks` importable from backend/
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import statistics
+import time
+
+from app.services import cpu_executor
+from app.services.ai_analyzer import run_analysis
+from app.services.fact_checker import run_fact_check
+from benchmarks.bench_lexicon import make_article
+
+TICK = 0.005
+
+
+async def heartbeat(lags, stop: asyncio.Event):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - t0 - TICK)
+
+
+async def check(text: str, mode: str, delay: float):
+    await asyncio.sleep(delay)
+    await asyncio.gather(
+        cpu_executor.run_cpu(run_analysis, text, "en", size=len(text), mode=mode),
+        cpu_executor.run_cpu(run_fact_check, text, size=len(text), mode=mode),
+    )
+
+
+async def run_mix(mode: str, large, small):
+    lags = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(TICK * 4)
+    t0 = time.perf_counter()
+    await asyncio.gather(
+        *(check(t, mode, i * 0.05) for i, t in enumerate(large)),
+        *(check(t, mode, i * 0.002) for i, t in enumerate(small)),
+    )
+    wall = time.perf_counter() - t0
+    stop.set()
+    await beat
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+    return wall, max(lags, default=0.0), p99, statistics.median(lags) if lags else 0.0
+
+
+def main():
+    large = [make_article(500_000, seed=i) for i in range(8)]
+    small = [make_article(2_000, seed=100 + i) for i in range(200)]
+    print(f"8 x 500KB + 200 x 2KB articles, offload threshold "
+          f"{cpu_executor.settings.CPU_OFFLOAD_MIN_CHARS} chars")
+    print(f"{'mode':>8} {'wall ms':>9} {'max lag ms':>11} {'p99 lag ms':>11} {'median lag ms':>14}")
+    for mode in ("inline", "thread", "process"):
+        asyncio.run(run_mix(mode, large[:1], small[:1]))  # warm the pool
+        wall, worst, p99, median = asyncio.run(run_mix(mode, large, small))
+        print(f"{mode:>8} {wall * 1000:>9.1f} {worst * 1000:>11.1f} {p99 * 1000:>11.1f} {median * 1000:>14.2f}")
+    cpu_executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
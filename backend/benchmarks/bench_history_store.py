@@ -0,0 +1,80 @@
+"""
+Benchmark: history storage at scale (batched writes, keyset vs OFFSET paging).
+
+Writes N history rows (default 1,000,000) spread over 10k users through the group-commit
+writer, then reads pages of 20 for the heaviest user: the first page, and a deep page reached
+by following cursors compared with the same page fetched with LIMIT/OFFSET.
+
+Run from backend/:  python -m benchmarks.bench_history_store [rows]
+                    (or as a script: python benchmarks/bench_history_store.py [rows])
+"""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # run as a script: make `app` and `benchmarks` importable from backend/
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import statistics
+import tempfile
+import time
+
+from app.services.storage import Storage
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(0)
+    tmp = tempfile.mkdtemp()
+    store = Storage(f"sqlite:///{os.path.join(tmp, 'history.db')}", pool_size=4, write_batch=500)
+    users = [f"user{i}@example.com" for i in range(10_000)]
+    heavy = users[0]
+    result = {"analysis": {"risk_level": "low"}, "confidence_score": 0.8}
+
+    start = time.perf_counter()
+    futures = []
+    for i in range(rows):
+        user = heavy if i % 50 == 0 else rng.choice(users)
+        futures.append(store.add_history({"user_id": user, "input_text": f"claim {i}",
+                                          "result": result}))
+    for fut in futures:
+        fut.result()
+    elapsed = time.perf_counter() - start
+    print(f"wrote {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s, "
+          f"{store.stats()['write_batches']:,} transactions)")
+
+    with store.pool.connection() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM check_history WHERE user_id = ? AND (timestamp, id) < (?, ?) "
+            "ORDER BY timestamp DESC, id DESC LIMIT 21", (heavy, "9999", 0)).fetchall()
+        total = conn.execute("SELECT COUNT(*) FROM check_history WHERE user_id = ?", (heavy,)).fetchone()[0]
+    print("plan:", "; ".join(r[-1] for r in plan))
+
+    def timed(fn, repeat=20):
+        times = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            out = fn()
+            times.append(time.perf_counter() - t)
+        return statistics.median(times) * 1000, out
+
+    first_ms, (page, cursor) = timed(lambda: store.history_page(heavy, 20))
+    print(f"{heavy}: {total:,} rows; first page {first_ms:.2f} ms")
+
+    depth = total // 20 - 1
+    for _ in range(depth - 1):
+        page, cursor = store.history_page(heavy, 20, cursor)
+    keyset_ms, (page, _) = timed(lambda: store.history_page(heavy, 20, cursor))
+    with store.pool.connection() as conn:
+        offset_ms, offset_page = timed(lambda: conn.execute(
+            "SELECT id FROM check_history WHERE user_id = ? ORDER BY timestamp DESC, id DESC "
+            "LIMIT 20 OFFSET ?", (heavy, depth * 20)).fetchall())
+    assert [r[0] for r in offset_page] == [h["id"] for h in page]
+    print(f"page {depth + 1}: keyset {keyset_ms:.2f} ms, OFFSET {offset_ms:.2f} ms")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: OCR image preparation (payload size and OCR latency against accuracy).
+
+For each image reports the preparation time, the prepared size in pixels, the Gemini upload
+payload (base64) before and after preparation and, when easyocr is installed, OCR latency and
+accuracy (similarity of the recognized words to the ground truth) on the raw and the prepared
+image. Without arguments it renders synthetic uploads: a phone screenshot, a 12 MP photo of a
+printed page, pages with a source or date line set apart from the body text (which the crop must
+keep) and a 600 DPI scan. Real files can be given instead; accuracy is reported for those
+that have a `<name>.txt` ground-truth file next to them.
+
+Run from backend/:  python -m benchmarks.bench_image_prep [image ...]
+                    (or as a script: python benchmarks/bench_image_prep.py [image ...])
+"""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # run as a script: make `app` and `benchmarks` importable from backend/
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import base64
+import difflib
+import io
+import random
+import statistics
+import time
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+from app.services import image_prep
+
+TEXT = [
+    "BREAKING: Government announces free electricity for all households from next month.",
+    "Officials say the scheme will be funded by a new tax on imported luxury goods.",
+    "Forward this message to ten groups before it is deleted.",
+    "Experts have not confirmed the claim and no circular has been published.",
+]
+SOURCE = "Source: PIB Fact Check"
+DATE = "12 March 2024"
+
+
+def _font(size: int):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has only the small bitmap font
+        return ImageFont.load_default()
+
+
+def render(size, text_size, background, margin, fmt, dpi=None, noise=0, extra=()):
+    rng = random.Random(0)
+    image = Image.new("RGB", size, background)
+    if noise:
+        image = Image.effect_noise(size, noise).convert("RGB")
+        image = Image.blend(image, Image.new("RGB", size, background), 0.7)
+    draw = ImageDraw.Draw(image)
+    font = _font(text_size)
+    x, y = margin
+    for line in TEXT:
+        draw.text((x + rng.randint(0, 4), y), line, fill=(20, 20, 20), font=font)
+        y += int(text_size * 1.6)
+    # separate blocks (source or date lines) away from the body text
+    for (ex, ey), line, line_size in extra:
+        draw.text((ex, ey), line, fill=(20, 20, 20), font=_font(line_size))
+    if noise:
+        image = image.filter(ImageFilter.GaussianBlur(1))
+    buf = io.BytesIO()
+    image.save(buf, format=fmt, quality=92, **({"dpi": (dpi, dpi)} if dpi else {}))
+    return buf.getvalue()
+
+
+def synthetic():
+    return [
+        ("screenshot 1170x2532 png", render((1170, 2532), 38, (255, 255, 255), (60, 900), "PNG"),
+         " ".join(TEXT)),
+        ("photo 4032x3024 jpeg", render((4032, 3024), 80, (200, 196, 188), (300, 1100), "JPEG",
+                                        noise=40), " ".join(TEXT)),
+        ("page 1200x1600 png + source line", render((1200, 1600), 24, (255, 255, 255), (40, 40), "PNG",
+                                                     extra=[((800, 1500), SOURCE, 24)]),
+         " ".join(TEXT + [SOURCE])),
+        ("photo 4032x3024 jpeg + corner date", render((4032, 3024), 80, (200, 196, 188), (300, 600), "JPEG",
+                                                      noise=40, extra=[((3400, 2850), DATE, 48)]),
+         " ".join(TEXT + [DATE])),
+        ("scan 4960x7016 png 600dpi", render((4960, 7016), 110, (255, 255, 255), (400, 600), "PNG",
+                                             dpi=600), " ".join(TEXT)),
+    ]
+
+
+def from_files(paths):
+    cases = []
+    for path in paths:
+        truth_path = os.path.splitext(path)[0] + ".txt"
+        truth = open(truth_path, encoding="utf-8").read() if os.path.exists(truth_path) else None
+        with open(path, "rb") as f:
+            cases.append((os.path.basename(path), f.read(), truth))
+    return cases
+
+
+def accuracy(found: str, truth: str) -> float:
+    norm = lambda s: " ".join("".join(c for c in s.lower() if c.isalnum() or c.isspace()).split())
+    return difflib.SequenceMatcher(None, norm(found), norm(truth)).ratio()
+
+
+def timed(fn, repeat=3):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    cases = from_files(sys.argv[1:]) if len(sys.argv) > 1 else synthetic()
+    try:
+        import easyocr
+        import numpy as np
+        reader = easyocr.Reader(["en"])
+    except ImportError:
+        reader = None
+        print("easyocr not installed: reporting preparation and payload only\n")
+
+    for name, data, truth in cases:
+        original = Image.open(io.BytesIO(data))
+        prep_s, prepared = timed(lambda: image_prep.prepare(data))
+        upload, _ = image_prep.encode_for_upload(data, "image/png")
+        print(f"{name}: {original.width}x{original.height} {len(data) / 1024:.0f} KB")
+        print(f"  prepare {prep_s * 1000:6.0f} ms -> {prepared.width}x{prepared.height} gray")
+        print(f"  gemini payload {len(base64.b64encode(data)) / 1024:8.0f} KB -> "
+              f"{len(base64.b64encode(upload)) / 1024:6.0f} KB base64")
+        if reader is None:
+            continue
+        for label, array in (("raw", np.array(original.convert("RGB"))), ("prepared", np.array(prepared))):
+            ocr_s, results = timed(lambda: reader.readtext(array), repeat=1)
+            text = " ".join(r[1] for r in results)
+            acc = f"  accuracy {accuracy(text, truth):.3f}" if truth else ""
+            print(f"  ocr {label:8s} {ocr_s:6.2f} s{acc}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: JSON encoding of check responses and upstream bodies (stdlib json vs orjson).
+
+Payloads are built like the real ones: the rule-based analysis and pattern fact-check of a
+pasted article, plus an OSINT verification of 5 claims with 5 evidence snippets each, in
+English and in Hindi. For each it reports per-call CPU time and median latency of:
+- response: FastAPI's default path (jsonable_encoder + json.dumps), the same with the
+  json_codec response class, and a json_codec.JSONResponse returned directly by the route
+  (no jsonable_encoder pass), both rendered and end to end through a test client;
+- upstream: encoding a Gemini OCR request with a base64 image and decoding a Tavily response.
+
+Run from backend/:  python -m benchmarks.bench_json_codec
+                    (or as a script: python benchmarks/bench_json_codec.py)
+"""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # run as a script: make `app` and `benchmarks` importable from backend/
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import base64
+import json
+import random
+import statistics
+import time
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse as StarletteJSONResponse
+
+from app.services import json_codec
+from app.services.ai_analyzer import run_analysis
+from app.services.fact_checker import run_fact_check
+from benchmarks.bench_lexicon import make_article
+
+
+def verification(rng: random.Random, script: str):
+    per_claim = []
+    for c in range(5):
+        evidence = [{
+            "title": make_article(80, seed=rng.random(), script=script),
+            "url": f"https://news{rng.randint(1, 40)}.example.com/2024/story-{c}-{e}",
+            "snippet": make_article(400, seed=rng.random(), script=script),
+        } for e in range(5)]
+        per_claim.append({
+            "claim": make_article(120, seed=rng.random(), script=script),
+            "status": "ok",
+            "verdict": rng.choice(["true", "false", "uncertain"]),
+            "confidence": rng.random(),
+            "reasoning": make_article(300, seed=rng.random(), script=script),
+            "sources": [ev["url"] for ev in evidence],
+            "model_used": "gemini-2.0-flash",
+            "evidence": evidence,
+        })
+    return {"status": "ok", "verdict": "uncertain", "confidence": 0.62, "fake_risk": 0.41,
+            "overall_credibility": 0.7, "claims_found": len(per_claim), "per_claim": per_claim}
+
+
+def check_payload(script: str):
+    rng = random.Random(0)
+    text = make_article(3000, script=script)
+    return {"status": "success", "analysis": run_analysis(text), "fact_check": run_fact_check(text),
+            "verification": verification(rng, script), "confidence_score": 0.62}
+
+
+def measure(fn, repeat):
+    """(CPU ms per call, p50 ms)"""
+    times = []
+    cpu = time.process_time()
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return (time.process_time() - cpu) * 1000 / repeat, statistics.median(times) * 1000
+
+
+def report(label, fn, repeat=300):
+    fn()
+    cpu_ms, p50_ms = measure(fn, repeat)
+    print(f"  {label:42s} cpu {cpu_ms:7.3f} ms   p50 {p50_ms:7.3f} ms")
+
+
+def main():
+    print(f"json_codec backend: {json_codec.backend}")
+    for script in ("ascii", "hindi"):
+        payload = check_payload(script)
+        size = len(json_codec.dumps(payload))
+        print(f"\ncheck response ({script}, {size / 1024:.0f} KB)")
+        report("default (jsonable_encoder + json)", lambda: StarletteJSONResponse(jsonable_encoder(payload)))
+        report("default class (jsonable_encoder + codec)",
+               lambda: json_codec.JSONResponse(jsonable_encoder(payload)))
+        report("returned directly (codec)", lambda: json_codec.JSONResponse(payload))
+
+        app = FastAPI()
+        app.get("/stdlib")(lambda: payload)
+        app.get("/default", response_class=json_codec.JSONResponse)(lambda: payload)
+        app.get("/direct")(lambda: json_codec.JSONResponse(payload))
+        client = TestClient(app)
+        for route in ("stdlib", "default", "direct"):
+            report(f"end to end /{route}", lambda: client.get(f"/{route}"), repeat=200)
+
+    image = base64.b64encode(os.urandom(150 * 1024)).decode()
+    gemini = {"contents": [{"role": "user", "parts": [
+        {"text": "Extract all readable text present in this image."},
+        {"inlineData": {"mimeType": "image/jpeg", "data": image}}]}]}
+    print("\nupstream")
+    report("gemini ocr request json.dumps", lambda: json.dumps(gemini).encode("utf-8"))
+    report("gemini ocr request codec", lambda: json_codec.dumps(gemini))
+    rng = random.Random(1)
+    tavily = json_codec.dumps({"query": "claim", "results": [
+        {"title": make_article(80, seed=i), "url": f"https://site{i}.example.com/a",
+         "content": make_article(800, seed=i, script="hindi"), "score": rng.random()} for i in range(5)]})
+    report("tavily response json.loads", lambda: json.loads(tavily.decode("utf-8", errors="ignore")))
+    report("tavily response codec", lambda: json_codec.loads(tavily))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: per-lexicon keyword scans vs. the shared-lowercase KeywordCounter.
+
+Run from backend/:  python -m benchmarks.bench_lexicon
+                    (or as a script: python benchmarks/bench_lexicon.py)
+"""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # run as a script: make `app` and `benchmarks` importable from backend/
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+
+from app.services.ai_analyzer import (
+    LEXICON, NewsAnalyzer, POSITIVE_WORDS, NEGATIVE_WORDS, SENSATIONAL_WORDS, VAGUE_PHRASES,
+    EMOTIONAL_APPEAL_WORDS, CREDIBLE_SOURCES, URGENCY_WORDS, EMOTIONAL_WORDS, VAGUE_WORDS,
+    RISK_KEYWORDS,
+)
+
+
+def legacy_scan(text: str):
+    """The previous approach: every helper lowercases the text and scans each keyword itself."""
+    out = []
+    t = text.lower()
+    out.append(sum(1 for w in POSITIVE_WORDS if w in t))
+    out.append(sum(1 for w in NEGATIVE_WORDS if w in t))
+    t = text.lower()
+    out.append(sum(1 for w in SENSATIONAL_WORDS if w in t))
+    out.append(sum(1 for w in VAGUE_PHRASES if w in t))
+    out.append(sum(1 for w in EMOTIONAL_APPEAL_WORDS if w in t))
+    out.append(sum(1 for w in CREDIBLE_SOURCES if w in t))
+    t = text.lower()
+    out.append(sum(t.count(w) for w in URGENCY_WORDS))
+    out.append(sum(t.count(w) for w in EMOTIONAL_WORDS))
+    out.append(sum(t.count(w) for w in VAGUE_WORDS))
+    out.append(any(w in t for w in URGENCY_WORDS[:3]))
+    t = text.lower()
+    out.append(sum(t.count(w) for w in RISK_KEYWORDS['high']))
+    out.append(sum(t.count(w) for w in RISK_KEYWORDS['medium']))
+    return out
+
+
+def matcher_scan(text: str):
+    hits = LEXICON.scan(text)
+    return [
+        sum(1 for w in POSITIVE_WORDS if hits[w]),
+        sum(1 for w in NEGATIVE_WORDS if hits[w]),
+        sum(1 for w in SENSATIONAL_WORDS if hits[w]),
+        sum(1 for w in VAGUE_PHRASES if hits[w]),
+        sum(1 for w in EMOTIONAL_APPEAL_WORDS if hits[w]),
+        sum(1 for w in CREDIBLE_SOURCES if hits[w]),
+        sum(hits[w] for w in URGENCY_WORDS),
+        sum(hits[w] for w in EMOTIONAL_WORDS),
+        sum(hits[w] for w in VAGUE_WORDS),
+        any(hits[w] for w in URGENCY_WORDS[:3]),
+        sum(hits[w] for w in RISK_KEYWORDS['high']),
+        sum(hits[w] for w in RISK_KEYWORDS['medium']),
+    ]
+
+
+# Extra filler per script: CPython stores text as 1, 2 or 4 bytes per char depending on the widest
+# character, which changes how fast substring search runs.
+SCRIPTS = {
+    "ascii": "",
+    "hindi": "सरकार ने सोमवार को कहा कि रिपोर्ट समीक्षा के बाद प्रकाशित की जाएगी",
+    "emoji": "😱 🔥 👉 share now 🙏",
+}
+
+
+def make_article(size: int, seed: int = 0, script: str = "ascii") -> str:
+    rng = random.Random(seed)
+    filler = ("the minister said on monday that the report would be published after a review "
+              "of regional data and consultations with local officials in several districts").split()
+    filler += SCRIPTS[script].split()
+    lexicon = LEXICON.keywords
+    words = []
+    length = 0
+    while length < size:
+        w = rng.choice(lexicon) if rng.random() < 0.03 else rng.choice(filler)
+        if rng.random() < 0.05:
+            w = w.capitalize() + "."
+        words.append(w)
+        length += len(w) + 1
+    return " ".join(words)[:size]
+
+
+def best_of(fn, arg, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    analyzer = NewsAnalyzer()
+    print(f"{'text':>6} {'size':>7} {'legacy ms':>10} {'matcher ms':>11} {'speedup':>8} {'analyze_text ms':>16}")
+    for script in SCRIPTS:
+        for size in (50_000, 200_000, 500_000):
+            text = make_article(size, seed=size, script=script)
+            assert legacy_scan(text) == matcher_scan(text), "lexicon scores differ"
+            legacy = best_of(legacy_scan, text)
+            matcher = best_of(matcher_scan, text)
+            full = best_of(analyzer.analyze_text, text)
+            print(f"{script:>6} {size // 1000:>5}KB {legacy:>10.2f} {matcher:>11.2f} "
+                  f"{legacy / matcher:>7.1f}x {full:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: FactChecker pattern rules, one regex search per rule vs. the anchor-indexed engine.
+
+Run from backend/:  python -m benchmarks.bench_pattern_rules
+                    (or as a script: python benchmarks/bench_pattern_rules.py)
+"""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # run as a script: make `app` and `benchmarks` importable from backend/
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import random
+import re
+import tempfile
+import time
+
+from app.services.pattern_rules import PatternRuleEngine
+from benchmarks.bench_lexicon import make_article
+
+
+def make_rules(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(n)]
+    rules = [
+        {"id": "vaccine-death", "keywords": ["vaccine", "death"],
+         "pattern": r"\b(vaccine.*death|death.*vaccine)\b"},
+        {"id": "miracle-cure", "keywords": ["miracle", "cure"],
+         "pattern": r"\b(miracle.*cure|cure.*miracle)\b"},
+    ]
+    for i in range(n - len(rules)):
+        a, b = words[i], rng.choice(("report", "study", "minister", "officials"))
+        rules.append({"id": f"r{i}", "keywords": [a, b], "pattern": rf"\b({a}.*{b}|{b}.*{a})\b"})
+    return rules
+
+
+def naive_match(compiled, claim: str):
+    claim_lower = claim.lower()
+    return [p for p, rx in compiled if rx.search(claim_lower)]
+
+
+def make_claims(count: int):
+    claims = [s.strip() for s in re.split(r"[.!?]+", make_article(count * 200, seed=7)) if s.strip()]
+    claims += ["The miracle cure doctors hid for years", "Officials deny vaccine deaths report"]
+    return claims[:count]
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    claims = make_claims(200)
+    print(f"{'rules':>6} {'naive ms/claim':>15} {'engine ms/claim':>16} {'speedup':>8}")
+    for n in (4, 100, 1000, 5000):
+        rules = make_rules(n)
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"rules": rules}, f)
+        try:
+            engine = PatternRuleEngine(f.name)
+        finally:
+            os.unlink(f.name)
+        compiled = [(r["pattern"], re.compile(r["pattern"])) for r in rules]
+        for claim in claims:
+            assert naive_match(compiled, claim) == [r.pattern for r in engine.match(claim)], claim
+        naive = best_of(lambda: [naive_match(compiled, c) for c in claims])
+        indexed = best_of(lambda: [engine.match(c) for c in claims])
+        print(f"{n:>6} {naive / len(claims) * 1000:>15.3f} {indexed / len(claims) * 1000:>16.3f} "
+              f"{naive / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: speech backends on CPU (real-time factor and latency).
+
+Splits a recording into segments the way /check-voice does, then for each backend reports the
+model load time, per-segment latency (p50/p95, first segment after load), the real-time factor
+(processing time / audio duration, sequential) and the wall time with SPEECH_MAX_PARALLEL
+segments in flight. Backends whose package or model is missing are reported and skipped.
+
+Run from backend/:
+    python -m benchmarks.bench_speech_backends sample.wav [--language en] [--backends google,vosk,whisper]
+    (or as a script: python benchmarks/bench_speech_backends.py sample.wav ...)
+
+WAV files in 16 kHz mono 16-bit are read directly; anything else is decoded with ffmpeg.
+"""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # run as a script: make `app` and `benchmarks` importable from backend/
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import statistics
+import subprocess
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.speech_backends import SAMPLE_RATE, SAMPLE_WIDTH, _make_backend
+from app.services.speech_processor import SilenceSegmenter, SpeechProcessor
+from utils.config import settings
+
+
+def read_pcm(path: str) -> bytes:
+    try:
+        with wave.open(path, "rb") as w:
+            if (w.getframerate(), w.getnchannels(), w.getsampwidth()) == (SAMPLE_RATE, 1, SAMPLE_WIDTH):
+                return w.readframes(w.getnframes())
+    except (wave.Error, EOFError):
+        pass
+    return subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", path, "-f", "s16le",
+         "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        check=True, stdout=subprocess.PIPE).stdout
+
+
+def segment(pcm: bytes):
+    seg = SilenceSegmenter(settings.SPEECH_SILENCE_RMS, settings.SPEECH_MIN_SILENCE_MS,
+                           settings.SPEECH_MAX_SEGMENT_SECONDS)
+    segments = seg.feed(pcm)
+    last = seg.flush()
+    return segments + [last] if last else segments
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def bench(name: str, segments, language: str, locale: str, audio_seconds: float):
+    start = time.perf_counter()
+    try:
+        backend = _make_backend(name)
+        backend.load(language)
+    except Exception as e:
+        print(f"{name:8s} unavailable: {e}")
+        return
+    load = time.perf_counter() - start
+
+    latencies = []
+    for pcm in segments:
+        t = time.perf_counter()
+        backend.transcribe(pcm, language, locale)
+        latencies.append(time.perf_counter() - t)
+    busy = sum(latencies)
+
+    parallel = max(1, settings.SPEECH_MAX_PARALLEL)
+    t = time.perf_counter()
+    with ThreadPoolExecutor(parallel) as pool:
+        list(pool.map(lambda pcm: backend.transcribe(pcm, language, locale), segments))
+    wall = time.perf_counter() - t
+
+    print(f"{name:8s} load {load:6.2f}s  first {latencies[0] * 1000:7.0f} ms  "
+          f"p50 {statistics.median(latencies) * 1000:7.0f} ms  p95 {percentile(latencies, 0.95) * 1000:7.0f} ms  "
+          f"RTF {busy / audio_seconds:5.2f}  x{parallel} wall {wall:6.2f}s (RTF {wall / audio_seconds:5.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("audio")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--backends", default="google,vosk,whisper")
+    args = parser.parse_args()
+
+    locale = SpeechProcessor().supported_languages.get(args.language, "en-US")
+    pcm = read_pcm(args.audio)
+    audio_seconds = len(pcm) / (SAMPLE_RATE * SAMPLE_WIDTH)
+    segments = segment(pcm)
+    if not segments:
+        raise SystemExit("no speech found in the recording")
+    print(f"{audio_seconds:.1f}s of audio, {len(segments)} segments, language {args.language}")
+    for name in args.backends.split(","):
+        bench(name.strip(), segments, args.language, locale, audio_seconds)
+
+
+if __name__ == "__main__":
+    main()
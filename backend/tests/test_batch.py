@@ -0,0 +1,33 @@
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("WARMUP_ON_STARTUP", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+URL = "/api/v1/news/check-batch"
+
+
+@pytest.mark.parametrize("body", [b"1", b'"x"', b"null", b"true", b"{bad", b"\xff"])
+def test_non_object_json_body_is_rejected(body):
+    r = client.post(URL, content=body, headers={"content-type": "application/json"})
+    assert r.status_code == 400
+
+
+@pytest.mark.parametrize("body", [b'{"text": "a"}\n1\n', b'"x"\n', b'[{"text": "a"}]\n'])
+def test_ndjson_lines_must_be_objects(body):
+    r = client.post(URL, content=body, headers={"content-type": "application/x-ndjson"})
+    assert r.status_code == 400
+
+
+def test_valid_batch_streams_one_line_per_item():
+    r = client.post(URL, json={"items": [{"text": "a b c", "id": "1"}, {"text": "a b c"}], "verify": False})
+    assert r.status_code == 200
+    lines = r.text.splitlines()
+    assert len(lines) == 2
+    assert '"duplicate_of":0' in lines[1]
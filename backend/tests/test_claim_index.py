@@ -0,0 +1,73 @@
+import asyncio
+
+from app.services import http_client, retrieval_verifier
+from app.services.claim_index import ClaimIndex, build_index
+
+FACT_CHECKS = [
+    {"claim": "Vaccines cause autism", "rating": "False", "verdict": "false",
+     "publisher": "Health Feedback", "url": "https://example.org/vaccines-autism"},
+    {"claim": "The Earth is flat", "rating": "False", "verdict": "false",
+     "publisher": "Science Check", "url": "https://example.org/flat-earth"},
+    {"claim": "Drinking hot water cures COVID-19", "rating": "False", "verdict": "false",
+     "publisher": "PIB Fact Check", "url": "https://example.org/hot-water"},
+]
+
+
+def make_index(tmp_path):
+    build_index(FACT_CHECKS, str(tmp_path))
+    return ClaimIndex(str(tmp_path), min_similarity=0.8, reload_seconds=0)
+
+
+def test_same_claim_matches(tmp_path):
+    index = make_index(tmp_path)
+    assert index.lookup("Vaccines cause autism")["url"] == "https://example.org/vaccines-autism"
+    assert index.lookup("drinking hot water cures covid-19!")["verdict"] == "false"
+
+
+def test_negated_claims_do_not_match(tmp_path):
+    index = make_index(tmp_path)
+    assert index.lookup("Vaccines do not cause autism") is None
+    assert index.lookup("Vaccines don't cause autism") is None
+    assert index.lookup("The Earth is not flat") is None
+
+
+def test_contradicting_claims_do_not_match(tmp_path):
+    index = make_index(tmp_path)
+    assert index.lookup("Scientists confirm vaccines never cause autism") is None
+    assert index.lookup("It is a myth that the Earth is flat") is None
+
+
+def test_claim_inside_longer_text_does_not_match(tmp_path):
+    index = make_index(tmp_path)
+    assert index.lookup("Officials in three districts said on Monday that a new report "
+                        "shows vaccines cause autism in children") is None
+
+
+def test_confident_hit_makes_no_upstream_call(tmp_path, monkeypatch):
+    async def no_network(*args, **kwargs):
+        raise AssertionError("upstream call on a confident index hit")
+
+    monkeypatch.setattr(retrieval_verifier, "claim_index", make_index(tmp_path))
+    monkeypatch.setattr(retrieval_verifier.settings, "GOOGLE_API_KEY", "test-key")
+    monkeypatch.setattr(http_client, "post_json", no_network)
+    monkeypatch.setattr(http_client, "post_json_stream", no_network)
+    result = asyncio.run(retrieval_verifier._verify_claim("Vaccines cause autism", 3))
+    assert result["verdict"] == "false"
+    assert result["known_fact_check"]["confident"] is True
+    assert result["model_used"] is None
+
+
+def test_loose_hit_is_evidence_for_gemini(tmp_path, monkeypatch):
+    index = make_index(tmp_path)
+    index.confident_dice = 1.01
+    calls = []
+
+    async def fake_uncached(claim, max_results, on_verdict=None, known=None):
+        calls.append(known)
+        return {"claim": claim, "status": "error", "reason": "test"}
+
+    monkeypatch.setattr(retrieval_verifier, "claim_index", index)
+    monkeypatch.setattr(retrieval_verifier.settings, "GOOGLE_API_KEY", "test-key")
+    monkeypatch.setattr(retrieval_verifier, "_verify_claim_uncached", fake_uncached)
+    asyncio.run(retrieval_verifier._verify_claim("Vaccines cause autism", 3))
+    assert calls and calls[0]["confident"] is False
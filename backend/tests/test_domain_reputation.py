@@ -0,0 +1,45 @@
+from app.services.domain_reputation import (
+    DEFAULT_SCORE, LOW_MARKER_CAP, TRUSTED_SCORE, DomainReputation, domain_reputation,
+)
+from app.services.fact_checker import FactChecker
+
+
+def make_reputation():
+    reputation = DomainReputation()
+    reputation.set_ratings({"bbc.co.uk": 0.93, "co.uk": 0.5, "gov": 0.92, "edu": 0.88,
+                            "example.gov": 0.3, "reuters.com": TRUSTED_SCORE})
+    return reputation
+
+
+def test_rating_covers_subdomains_by_label():
+    reputation = make_reputation()
+    assert reputation.score_url("https://bbc.co.uk/news") == 0.93
+    assert reputation.score_url("https://www.sub.bbc.co.uk/a?b=c") == 0.93
+    # a suffix match is by whole labels, never by substring
+    assert reputation.score_url("https://notbbc.co.uk") == 0.5
+    assert reputation.score_url("https://bbc.co.uk.evil.com") == DEFAULT_SCORE
+
+
+def test_most_specific_rating_wins():
+    reputation = make_reputation()
+    assert reputation.score_url("https://cdc.gov") == 0.92
+    assert reputation.score_url("https://data.example.gov") == 0.3
+
+
+def test_trusted_threshold():
+    reputation = make_reputation()
+    assert reputation.is_trusted("https://reuters.com")  # exactly TRUSTED_SCORE
+    assert reputation.is_trusted("https://cdc.gov")
+    assert not reputation.is_trusted("https://mit.edu")  # 0.88
+    assert not reputation.is_trusted("https://notreuters.com")
+    assert reputation.score_url("https://viral-news.gov") == LOW_MARKER_CAP
+
+
+def test_fact_checker_trusts_every_highly_rated_source():
+    # trusted = rated >= TRUSTED_SCORE in the shared list, not just the four domains FactChecker
+    # used to hard-code; unrated look-alikes of those domains are no longer trusted
+    sources = FactChecker()._analyze_sources(
+        "See https://www.reuters.com/a and https://edition.bbc.com/b and https://snopes.com/c "
+        "and https://cdc.gov/d, not https://notreuters.com/e")
+    assert sources["trusted_sources_count"] == 4
+    assert domain_reputation.is_trusted("https://cdc.gov")
@@ -0,0 +1,51 @@
+import time
+
+from app.services.json_scanner import JSONObjectScanner, first_object
+from app.services.retrieval_verifier import _early_verdict
+
+
+def test_object_after_prose():
+    assert first_object('Sure: {"verdict": "true", "confidence": 0.9,}') == {"verdict": "true", "confidence": 0.9}
+    assert first_object('{sic} ```json\n{"verdict": "false"}\n```') == {"verdict": "false"}
+
+
+def test_unclosed_brace_does_not_swallow_the_rest():
+    assert first_object('Use { to start. {"verdict": "false"}') == {"verdict": "false"}
+    assert first_object('a { b { {"x": {"y": 1}} c') == {"x": {"y": 1}}
+    assert first_object('{"verdict": "true"') is None
+
+
+def test_object_nested_in_mismatched_brackets():
+    assert first_object('{ see [ {"verdict": "true",} ] here') == {"verdict": "true"}
+    assert first_object('{ x {sic} {"q": 1}') == {"q": 1}
+
+
+def test_unbalanced_input_is_linear():
+    for text in ("{" * 20000, "{ [" * 20000, "{ " + "{sic} " * 20000):
+        start = time.perf_counter()
+        assert first_object(text) is None
+        assert time.perf_counter() - start < 1.0
+        scanner = JSONObjectScanner()
+        start = time.perf_counter()
+        for i in range(0, len(text), 64):
+            scanner.feed(text[i:i + 64])
+        assert scanner.finish() is None
+        assert time.perf_counter() - start < 1.0
+
+
+def test_streamed_in_chunks():
+    scanner = JSONObjectScanner()
+    for ch in 'Use { to start. {"verdict": "false", "confidence": 0.8, "reasoning": "x"}':
+        scanner.feed(ch)
+    assert scanner.result is None
+    assert scanner.finish() == {"verdict": "false", "confidence": 0.8, "reasoning": "x"}
+
+
+def test_early_verdict_reports_each_model_attempt():
+    sent = []
+    report = _early_verdict(sent.append)
+    report({"verdict": "true", "confidence": 0.9})
+    report({"verdict": "true", "confidence": 0.9, "reasoning": "..."})
+    # the first model failed; the next one streams a different answer
+    report({"verdict": "false", "confidence": 0.7})
+    assert sent == [{"verdict": "true", "confidence": 0.9}, {"verdict": "false", "confidence": 0.7}]
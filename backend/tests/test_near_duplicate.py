@@ -0,0 +1,76 @@
+import asyncio
+
+from app.services import retrieval_verifier
+from app.services.near_duplicate import NearDuplicateIndex, simhash
+
+ARTICLE = ("The health ministry said on Tuesday that the new vaccination drive will cover every "
+           "district in the state by the end of March, with mobile clinics reaching remote villages "
+           "and schools hosting weekend camps for children and the elderly. Officials added that "
+           "more than two thousand health workers have been trained for the campaign, that doses "
+           "will be stored in new cold chain centres in each block, and that residents can book a "
+           "slot through the state portal or walk in at any primary health centre. The minister "
+           "urged families not to believe rumours circulating on messaging apps about side effects "
+           "and said a helpline would answer questions in five languages from next week.")
+
+
+def flip(fp, bits):
+    for bit in range(bits):
+        fp ^= 1 << (bit * 7 % 64)
+    return fp
+
+
+def test_hamming_bound():
+    index = NearDuplicateIndex(threshold=0.9, max_entries=10)
+    fp, _ = simhash(ARTICLE)
+    index.add(fp, "article")
+    assert index.query(fp) == ("article", 1.0)
+    at_bound = index.query(flip(fp, index.max_distance))
+    assert at_bound == ("article", 1.0 - index.max_distance / 64)
+    assert index.query(flip(fp, index.max_distance + 1)) is None
+
+
+def test_fifo_eviction_at_size_cap():
+    index = NearDuplicateIndex(threshold=0.9, max_entries=3)
+    fps = [0, 0xFFFF, 0xFFFF << 16, 0xFFFF << 32]  # 16+ bits apart: no two are near-duplicates
+    for i, fp in enumerate(fps):
+        index.add(fp, f"k{i}")
+    assert len(index) == 3
+    assert index.query(fps[0]) is None
+    assert [index.query(fp)[0] for fp in fps[1:]] == ["k1", "k2", "k3"]
+
+
+def _run_with(monkeypatch, index, cache, text):
+    monkeypatch.setattr(retrieval_verifier, "near_duplicates", index)
+    monkeypatch.setattr(retrieval_verifier, "_VERIFY_CACHE", cache)
+    monkeypatch.setattr(retrieval_verifier.settings, "GOOGLE_API_KEY", "")
+    monkeypatch.setattr(retrieval_verifier.settings, "TAVILY_API_KEY", "")
+    return asyncio.run(retrieval_verifier.verify_with_osint(text))
+
+
+def test_repost_returns_cached_verdict_with_similarity(monkeypatch):
+    from app.services.verification_cache import MemoryCache
+
+    cache = MemoryCache("test", 1 << 20, 60)
+    index = NearDuplicateIndex(threshold=0.9, max_entries=10)
+    cache.set("original", {"status": "ok", "verdict": "false", "confidence": 0.9})
+    index.add(simhash(ARTICLE)[0], "original")
+
+    repost = ARTICLE + " Share: https://t.co/abc123"
+    distance = (simhash(repost)[0] ^ simhash(ARTICLE)[0]).bit_count()
+    assert distance <= index.max_distance
+    result = _run_with(monkeypatch, index, cache, repost)
+    assert result["verdict"] == "false"
+    assert result["near_duplicate"]["similarity"] == round(1.0 - distance / 64, 4)
+
+
+def test_text_past_the_bound_is_verified_afresh(monkeypatch):
+    from app.services.verification_cache import MemoryCache
+
+    cache = MemoryCache("test", 1 << 20, 60)
+    index = NearDuplicateIndex(threshold=0.9, max_entries=10)
+    cache.set("original", {"status": "ok", "verdict": "false", "confidence": 0.9})
+    index.add(flip(simhash(ARTICLE)[0], index.max_distance + 1), "original")
+
+    result = _run_with(monkeypatch, index, cache, ARTICLE)
+    assert "near_duplicate" not in result
+    assert not result.get("cached")
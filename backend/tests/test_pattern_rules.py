@@ -0,0 +1,58 @@
+import json
+import os
+import random
+
+from app.services.pattern_rules import PatternRuleEngine
+from utils.config import settings
+from benchmarks.bench_lexicon import make_article
+
+WORDS = ["vaccine", "death", "cure", "miracle", "government", "cover-up", "celebrity", "dead",
+         "alien", "secret", "5g", "tower", "chip", "microchip", "banned", "leaked"]
+
+
+def write_rules(path, rules):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"rules": rules}, f)
+
+
+def random_rules(rng, n):
+    rules = []
+    for i in range(n):
+        a, b = rng.sample(WORDS, 2)
+        rules.append({"id": f"r{i}", "keywords": [a, b], "pattern": f"\\b({a}.*{b}|{b}.*{a})\\b"})
+    rules.append({"id": "no-keywords", "pattern": r"\bshocking truth\b"})
+    return rules
+
+
+def test_bundled_rules_load_from_any_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert PatternRuleEngine(settings.FACT_PATTERNS_PATH).stats()["rules"] > 0
+
+
+def test_prefilter_matches_full_scan(tmp_path):
+    rng = random.Random(7)
+    path = tmp_path / "rules.json"
+    write_rules(path, random_rules(rng, 60))
+    engine = PatternRuleEngine(str(path))
+    all_rules = sorted(engine._compiled.unindexed
+                       + [r for rules in engine._compiled.by_anchor.values() for r in rules],
+                       key=lambda r: r.order)
+    for seed in range(200):
+        words = rng.sample(WORDS, 3) + ["antidead", "deadline", "shocking truth"][seed % 3:seed % 3 + 1]
+        text = make_article(200, seed=seed) + " " + " ".join(rng.sample(words, len(words)))
+        full = [r.id for r in all_rules if r.regex.search(text.lower())]
+        assert [r.id for r in engine.match(text)] == full
+
+
+def test_changed_file_is_reloaded(tmp_path):
+    path = tmp_path / "rules.json"
+    write_rules(path, [{"id": "a", "keywords": ["miracle"], "pattern": r"\bmiracle\b"}])
+    engine = PatternRuleEngine(str(path), reload_seconds=0.0)
+    assert [r.id for r in engine.match("a miracle")] == ["a"]
+
+    write_rules(path, [{"id": "b", "keywords": ["miracle"], "pattern": r"\bmiracle\b"}])
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert engine.reload() is True
+    assert [r.id for r in engine.match("a miracle")] == ["b"]
+    assert engine.reload() is False  # unchanged since
@@ -0,0 +1,76 @@
+import copy
+
+from app.services.response_shaping import compact, select_fields, shape
+
+A = {"title": "Reuters", "url": "https://reuters.com/a", "snippet": "Officials denied it."}
+B = {"title": "AP", "url": "https://apnews.com/b", "snippet": "No such order exists."}
+KNOWN = {"title": "PIB Fact Check: False", "url": "", "snippet": "Fact-check of the claim."}
+OTHER = {"title": "Blog", "url": "", "snippet": "Unrelated."}
+SOURCE_ANALYSIS = {"domains_found": ["reuters.com"], "trusted_sources_count": 1}
+
+PAYLOAD = {
+    "status": "success",
+    "analysis": {"risk_level": "high"},
+    "fact_check": {"verification_results": [
+        {"claim": "c1", "source_analysis": SOURCE_ANALYSIS},
+        {"claim": "c2", "source_analysis": SOURCE_ANALYSIS},
+    ]},
+    "verification": {"status": "ok", "verdict": "false", "per_claim": [
+        {"claim": "c1", "verdict": "false", "evidence": [A, B, KNOWN],
+         "sources": ["https://reuters.com/a", "https://example.org/x"]},
+        {"claim": "c2", "verdict": "false", "evidence": [B, OTHER], "sources": ["https://apnews.com/b"]},
+    ]},
+    "confidence_score": 0.8,
+}
+
+
+def expand(payload):
+    """Rebuild the full payload from its compact form."""
+    out = copy.deepcopy(payload)
+    table = out.pop("evidence", [])
+    for claim in out["verification"]["per_claim"]:
+        claim["evidence"] = [table[i] for i in claim.pop("evidence_refs")]
+        claim["sources"] = [table[i]["url"] for i in claim.pop("source_refs")]
+    shared = out["fact_check"].pop("source_analysis")
+    for result in out["fact_check"]["verification_results"]:
+        result["source_analysis"] = shared
+    return out
+
+
+def test_compact_round_trips():
+    original = copy.deepcopy(PAYLOAD)
+    small = compact(PAYLOAD)
+    assert PAYLOAD == original  # input untouched
+    assert expand(small) == PAYLOAD
+
+
+def test_evidence_is_deduplicated_by_url_and_refs_point_to_it():
+    small = compact(PAYLOAD)
+    table = small["evidence"]
+    urls = [e["url"] for e in table if e["url"]]
+    assert len(urls) == len(set(urls)) == 3  # reuters, apnews, example.org
+    c1, c2 = small["verification"]["per_claim"]
+    assert [table[i] for i in c1["evidence_refs"]] == [A, B, KNOWN]
+    assert [table[i] for i in c2["evidence_refs"]] == [B, OTHER]
+    assert c1["evidence_refs"][1] == c2["evidence_refs"][0]  # shared entry for B
+    assert [table[i]["url"] for i in c1["source_refs"]] == ["https://reuters.com/a", "https://example.org/x"]
+    assert c1["source_refs"][0] == c1["evidence_refs"][0]
+    assert "evidence" not in c1 and "sources" not in c1
+    assert small["fact_check"]["source_analysis"] == SOURCE_ANALYSIS
+    assert all("source_analysis" not in r for r in small["fact_check"]["verification_results"])
+
+
+def test_select_fields():
+    assert select_fields(PAYLOAD, "verification.verdict, analysis,missing.path") == {
+        "status": "success", "verification": {"verdict": "false"}, "analysis": {"risk_level": "high"}}
+    assert select_fields(PAYLOAD, "confidence_score") == {"status": "success", "confidence_score": 0.8}
+    assert select_fields({"a": 1}, "a") == {"a": 1}
+
+
+def test_fields_apply_after_detail():
+    shaped = shape(PAYLOAD, "compact", "evidence,verification.per_claim")
+    assert set(shaped) == {"status", "evidence", "verification"}
+    assert "evidence_refs" in shaped["verification"]["per_claim"][0]
+    summary = shape(PAYLOAD, "summary", "risk_level,verification")
+    assert summary["risk_level"] == "high"
+    assert "per_claim" not in summary["verification"]
@@ -0,0 +1,83 @@
+import asyncio
+
+from app.services.single_flight import SingleFlight
+from app.services.upstream_scheduler import BATCH, priority
+
+
+def test_followers_share_the_result_and_events():
+    async def main():
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+        runs, leader_events, follower_events = [], [], []
+
+        async def work(emit):
+            runs.append(1)
+            emit("claims", {"claims": ["a"]})
+            await release.wait()
+            emit("claim", {"index": 0})
+            return {"verdict": "true"}
+
+        leader = asyncio.ensure_future(flight.do("k", work, lambda *e: leader_events.append(e)))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", work, lambda *e: follower_events.append(e)))
+        await asyncio.sleep(0)
+        release.set()
+        assert await leader == ({"verdict": "true"}, False)
+        assert await follower == ({"verdict": "true"}, True)
+        assert len(runs) == 1
+        # the follower joined after "claims" was emitted: it is replayed
+        assert follower_events == leader_events == [("claims", {"claims": ["a"]}), ("claim", {"index": 0})]
+
+    asyncio.run(main())
+
+
+def test_interactive_callers_do_not_join_batch_flights():
+    async def main():
+        flight = SingleFlight("test")
+        runs = []
+
+        async def work(emit, tag):
+            runs.append(tag)
+            await asyncio.sleep(0.01)
+            return tag
+
+        async def batch(tag):
+            with priority(BATCH):
+                return await flight.do("k", lambda emit: work(emit, tag))
+
+        first = asyncio.ensure_future(batch("batch"))
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(flight.do("k", lambda emit: work(emit, "interactive")))
+        await asyncio.sleep(0)
+        late_batch = asyncio.ensure_future(batch("late"))
+        results = await asyncio.gather(first, interactive, late_batch)
+        assert runs == ["batch", "interactive"]
+        assert results == [("batch", False), ("interactive", False), ("interactive", True)]
+
+    asyncio.run(main())
+
+
+def test_cancelled_leader_does_not_cancel_the_work():
+    async def main():
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+        follower_events = []
+
+        async def work(emit):
+            await release.wait()
+            emit("claim", {"index": 0})
+            return "done"
+
+        leader = asyncio.ensure_future(flight.do("k", work, lambda *e: None))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", work, lambda *e: follower_events.append(e)))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await follower == ("done", True)
+        assert leader.cancelled()
+        assert follower_events == [("claim", {"index": 0})]
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(main())
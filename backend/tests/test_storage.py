@@ -0,0 +1,49 @@
+from app.services.storage import Storage
+
+
+def make_storage(tmp_path, write_batch=500):
+    return Storage(f"sqlite:///{tmp_path}/history.db", pool_size=2, write_batch=write_batch)
+
+
+def test_cursor_pages_through_equal_timestamps(tmp_path):
+    storage = make_storage(tmp_path)
+    same = "2024-05-01T10:00:00"
+    futures = [storage.add_history({"user_id": "u", "input_text": str(i), "timestamp": same})
+               for i in range(5)]
+    futures.append(storage.add_history({"user_id": "u", "input_text": "new",
+                                        "timestamp": "2024-05-02T10:00:00"}))
+    storage.add_history({"user_id": "other", "input_text": "x", "timestamp": same}).result()
+    ids = [f.result() for f in futures]
+
+    seen, cursor = [], None
+    while True:
+        items, cursor = storage.history_page("u", limit=2, cursor=cursor)
+        seen += [item["id"] for item in items]
+        if cursor is None:
+            break
+    # newest first, then equal timestamps by descending id, each row exactly once
+    assert seen == [ids[5]] + sorted(ids[:5], reverse=True)
+    storage.close()
+
+
+def test_group_commit_assigns_consecutive_ids(tmp_path):
+    storage = make_storage(tmp_path, write_batch=3)
+    futures = [storage.add_history({"user_id": "u", "input_text": str(i)}) for i in range(10)]
+    ids = [f.result() for f in futures]
+    assert ids == list(range(ids[0], ids[0] + 10))
+    items, _ = storage.history_page("u", limit=10)
+    assert {item["id"]: item["input_text"] for item in items} == {row_id: str(i) for i, row_id in enumerate(ids)}
+    storage.close()
+
+
+def test_close_writes_queued_rows(tmp_path):
+    storage = make_storage(tmp_path)
+    futures = [storage.add_history({"user_id": "u", "input_text": str(i)}) for i in range(200)]
+    storage.close()
+    assert all(f.done() and not f.exception() for f in futures)
+    assert storage.add_history({"user_id": "u", "input_text": "late"}).exception() is not None
+
+    reopened = make_storage(tmp_path)
+    items, _ = reopened.history_page("u", limit=500)
+    assert len(items) == 200
+    reopened.close()
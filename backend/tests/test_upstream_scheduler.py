@@ -0,0 +1,67 @@
+import asyncio
+import email.utils
+import time
+
+import pytest
+
+from app.services.upstream_scheduler import BATCH, INTERACTIVE, ProviderLimiter, retry_after
+
+
+def drained(rps=20.0):
+    limiter = ProviderLimiter("test", rps=rps, tpm=0)
+    limiter.requests.tokens = 0.0
+    return limiter
+
+
+def test_interactive_served_before_batch():
+    async def main():
+        limiter = drained()
+        order = []
+
+        async def call(name, level):
+            await limiter.acquire(0, level)
+            order.append(name)
+
+        tasks = [asyncio.ensure_future(call("batch-1", BATCH)),
+                 asyncio.ensure_future(call("batch-2", BATCH))]
+        await asyncio.sleep(0.01)
+        tasks.append(asyncio.ensure_future(call("interactive", INTERACTIVE)))
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=2)
+        assert order == ["interactive", "batch-1", "batch-2"]
+
+    asyncio.run(main())
+
+
+def test_cancelling_the_head_wakes_the_next_waiter():
+    async def main():
+        limiter = drained(rps=5.0)
+        head = asyncio.ensure_future(limiter.acquire(0, INTERACTIVE))
+        await asyncio.sleep(0.01)
+        nxt = asyncio.ensure_future(limiter.acquire(0, INTERACTIVE))
+        await asyncio.sleep(0.01)
+        head.cancel()
+        await asyncio.wait_for(nxt, timeout=1)  # one token refills in 0.2s
+        assert limiter.stats()["queued"] == 0
+
+    asyncio.run(main())
+
+
+def test_throttle_pauses_halves_and_recovers():
+    limiter = ProviderLimiter("test", rps=10, tpm=0)
+    limiter.throttle(5)
+    assert limiter.stats()["paused_for"] == pytest.approx(5, abs=0.1)
+    assert limiter.requests.rate == 5
+    limiter.recover()
+    assert limiter.requests.rate == pytest.approx(5.5)
+    for _ in range(20):
+        limiter.recover()
+    assert limiter.requests.rate == 10
+
+
+def test_retry_after_forms():
+    assert retry_after({"Retry-After": "3"}) == 3.0
+    when = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert retry_after({"retry-after": when}) == pytest.approx(30, abs=2)
+    body = '{"error": {"details": [{"@type": "RetryInfo", "retryDelay": "7s"}]}}'
+    assert retry_after({}, body) == 7.0
+    assert retry_after({"Retry-After": "soon"}, "") is None
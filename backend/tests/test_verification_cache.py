@@ -0,0 +1,18 @@
+import pytest
+
+from app.services.verification_cache import MemoryCache, _BaseCache
+
+
+def test_memory_cache_returns_copies():
+    cache = MemoryCache("test", max_bytes=1 << 20, default_ttl=60)
+    value = {"verdict": "false", "per_claim": [{"claim": "x"}]}
+    cache.set("k", value)
+    value["per_claim"].append({"claim": "y"})
+    got = cache.get("k")
+    got["per_claim"][0]["claim"] = "changed"
+    assert cache.get("k") == {"verdict": "false", "per_claim": [{"claim": "x"}]}
+
+
+def test_base_cache_is_abstract():
+    with pytest.raises(TypeError):
+        _BaseCache("test", 1, 1)
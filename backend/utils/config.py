@@ -1,8 +1,17 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# backend/: bundled data files resolve against it, not the working directory
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _backend_path(name: str, default: str) -> str:
+    """Path from env var `name` (or `default`); relative paths are relative to backend/."""
+    return str(BACKEND_DIR / os.getenv(name, default))
+
 
 class Settings:
     # API Settings
@@ -17,12 +26,134 @@ class Settings:
 
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./fake_news.db")
+    DATABASE_POOL_SIZE: int = int(os.getenv("DATABASE_POOL_SIZE", "4"))
+    # Most history rows committed in one transaction by the history writer
+    HISTORY_WRITE_BATCH: int = int(os.getenv("HISTORY_WRITE_BATCH", "500"))
 
     # External APIs
     GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
     FACT_CHECK_API_KEY: str = os.getenv("FACT_CHECK_API_KEY", "")
     TAVILY_API_KEY: str = os.getenv("TAVILY_API_KEY", "")
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+    # How long a model stays "known good", and how long a 404'd model is skipped
+    MODEL_ROUTER_SUCCESS_TTL: float = float(
+        os.getenv("MODEL_ROUTER_SUCCESS_TTL", "600"))
+    MODEL_ROUTER_DEAD_TTL: float = float(
+        os.getenv("MODEL_ROUTER_DEAD_TTL", "3600"))
+    # Stream claim verdicts from Gemini (streamGenerateContent) when a caller wants them early
+    GEMINI_STREAMING: bool = os.getenv(
+        "GEMINI_STREAMING", "True").lower() == "true"
+
+    # Upstream HTTP transport: "auto" uses httpx when installed, "stdlib" forces the http.client fallback
+    HTTP_BACKEND: str = os.getenv("HTTP_BACKEND", "auto").lower()
+    HTTP_POOL_MAX_CONNECTIONS: int = int(
+        os.getenv("HTTP_POOL_MAX_CONNECTIONS", "10"))
+
+    # JSON encoding of responses and upstream bodies: "auto" uses orjson when installed, "stdlib" forces json
+    JSON_BACKEND: str = os.getenv("JSON_BACKEND", "auto").lower()
+
+    # Upstream quotas (0 = unlimited) and retry policy for 429/5xx/connection errors
+    TAVILY_RPS: float = float(os.getenv("TAVILY_RPS", "5"))
+    GEMINI_RPS: float = float(os.getenv("GEMINI_RPS", "5"))
+    GEMINI_TPM: float = float(os.getenv("GEMINI_TPM", "0"))
+    UPSTREAM_MAX_RETRIES: int = int(os.getenv("UPSTREAM_MAX_RETRIES", "3"))
+    UPSTREAM_BACKOFF_BASE: float = float(
+        os.getenv("UPSTREAM_BACKOFF_BASE", "0.5"))
+    UPSTREAM_BACKOFF_MAX: float = float(os.getenv("UPSTREAM_BACKOFF_MAX", "8"))
+
+    # Verification pipeline
+    VERIFY_MAX_PARALLEL: int = int(os.getenv("VERIFY_MAX_PARALLEL", "5"))
+    VERIFY_DEADLINE_SECONDS: float = float(
+        os.getenv("VERIFY_DEADLINE_SECONDS", "45"))
+    # Share of that deadline claim extraction may use before the whole text is checked as one claim
+    VERIFY_EXTRACTION_SHARE: float = float(
+        os.getenv("VERIFY_EXTRACTION_SHARE", "0.3"))
+
+    # Where rule-based analysis runs: "inline" (event loop), "thread" or "process" pool;
+    # texts shorter than CPU_OFFLOAD_MIN_CHARS always run inline
+    CPU_EXECUTOR_MODE: str = os.getenv("CPU_EXECUTOR_MODE", "process").lower()
+    CPU_OFFLOAD_MIN_CHARS: int = int(
+        os.getenv("CPU_OFFLOAD_MIN_CHARS", "20000"))
+    CPU_EXECUTOR_WORKERS: int = int(os.getenv("CPU_EXECUTOR_WORKERS", "0"))
+
+    # FactChecker pattern rules (JSON), re-read on change at most every N seconds (0 = never)
+    FACT_PATTERNS_PATH: str = _backend_path(
+        "FACT_PATTERNS_PATH", "data/fake_patterns.json")
+    FACT_PATTERNS_RELOAD_SECONDS: float = float(
+        os.getenv("FACT_PATTERNS_RELOAD_SECONDS", "5"))
+
+    # Local index of fact-checked claims (built with `python -m app.services.claim_index build`)
+    CLAIM_INDEX_PATH: str = _backend_path("CLAIM_INDEX_PATH", "data/claim_index")
+    CLAIM_INDEX_MIN_SIMILARITY: float = float(
+        os.getenv("CLAIM_INDEX_MIN_SIMILARITY", "0.8"))
+    # Matches at least this close (Dice) are answered from the index without search or Gemini
+    CLAIM_INDEX_CONFIDENT_DICE: float = float(
+        os.getenv("CLAIM_INDEX_CONFIDENT_DICE", "0.9"))
+    CLAIM_INDEX_RELOAD_SECONDS: float = float(
+        os.getenv("CLAIM_INDEX_RELOAD_SECONDS", "30"))
+
+    # Domain reputation ratings (CSV: domain,score) shared by the verifier and FactChecker
+    DOMAIN_REPUTATION_PATH: str = _backend_path(
+        "DOMAIN_REPUTATION_PATH", "data/domain_reputation.csv")
+
+    # Voice input: split recordings at pauses and recognize segments in parallel
+    SPEECH_MAX_SEGMENT_SECONDS: float = float(
+        os.getenv("SPEECH_MAX_SEGMENT_SECONDS", "30"))
+    SPEECH_MIN_SILENCE_MS: int = int(os.getenv("SPEECH_MIN_SILENCE_MS", "500"))
+    SPEECH_SILENCE_RMS: float = float(os.getenv("SPEECH_SILENCE_RMS", "300"))
+    SPEECH_MAX_PARALLEL: int = int(os.getenv("SPEECH_MAX_PARALLEL", "4"))
+    # Recognition engine: "google" (web API), "vosk" or "whisper" (offline, CPU);
+    # per-language overrides as "hi:google,en:vosk"
+    SPEECH_BACKEND: str = os.getenv("SPEECH_BACKEND", "google").lower()
+    SPEECH_LANGUAGE_BACKENDS: str = os.getenv("SPEECH_LANGUAGE_BACKENDS", "")
+    VOSK_MODEL_DIR: str = os.getenv("VOSK_MODEL_DIR", "./models/vosk")
+    WHISPER_MODEL: str = os.getenv("WHISPER_MODEL", "base")
+    WHISPER_COMPUTE_TYPE: str = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+
+    # Load the OCR reader and speech engines in the background at startup (/health shows progress)
+    WARMUP_ON_STARTUP: bool = os.getenv(
+        "WARMUP_ON_STARTUP", "True").lower() == "true"
+    # EasyOCR placement: "local" (a reader per API worker) or "worker" (one shared OCR process per host)
+    OCR_MODE: str = os.getenv("OCR_MODE", "local").lower()
+    # Empty: ocr.sock in a private (0700) directory under $XDG_RUNTIME_DIR or the temp dir
+    OCR_WORKER_SOCKET: str = os.getenv("OCR_WORKER_SOCKET", "")
+    OCR_WORKER_START_TIMEOUT: float = float(
+        os.getenv("OCR_WORKER_START_TIMEOUT", "10"))
+
+    # OCR image preparation: downscale, grayscale, crop to text; Gemini uploads re-encoded as JPEG
+    OCR_PREP_ENABLED: bool = os.getenv(
+        "OCR_PREP_ENABLED", "True").lower() == "true"
+    OCR_TARGET_DPI: float = float(os.getenv("OCR_TARGET_DPI", "300"))
+    OCR_MAX_SIDE: int = int(os.getenv("OCR_MAX_SIDE", "2000"))
+    OCR_UPLOAD_QUALITY: int = int(os.getenv("OCR_UPLOAD_QUALITY", "85"))
+
+    # Response compression: "auto" (brotli when brotli-asgi is installed, else gzip), "gzip" or "off"
+    RESPONSE_COMPRESSION: str = os.getenv("RESPONSE_COMPRESSION", "auto").lower()
+    COMPRESSION_MIN_BYTES: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1000"))
+
+    # Batch endpoint limits
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+    BATCH_MAX_PARALLEL: int = int(os.getenv("BATCH_MAX_PARALLEL", "8"))
+
+    # Verification cache: "memory", "sqlite" (shared on-disk file) or "redis"
+    VERIFY_CACHE_BACKEND: str = os.getenv(
+        "VERIFY_CACHE_BACKEND", "memory").lower()
+    VERIFY_CACHE_PATH: str = os.getenv(
+        "VERIFY_CACHE_PATH", "./verify_cache.db")
+    VERIFY_CACHE_REDIS_URL: str = os.getenv(
+        "VERIFY_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    VERIFY_CACHE_MAX_BYTES: int = int(
+        os.getenv("VERIFY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    VERIFY_CACHE_TTL: float = float(
+        os.getenv("VERIFY_CACHE_TTL", str(6 * 3600)))
+
+    # Near-duplicate lookup (SimHash) in front of the verification cache
+    NEAR_DUP_ENABLED: bool = os.getenv(
+        "NEAR_DUP_ENABLED", "True").lower() == "true"
+    NEAR_DUP_THRESHOLD: float = float(os.getenv("NEAR_DUP_THRESHOLD", "0.9"))
+    NEAR_DUP_MAX_ENTRIES: int = int(
+        os.getenv("NEAR_DUP_MAX_ENTRIES", "200000"))
+    NEAR_DUP_MIN_SHINGLES: int = int(os.getenv("NEAR_DUP_MIN_SHINGLES", "8"))
 
     # CORS
     ALLOWED_ORIGINS: list = [
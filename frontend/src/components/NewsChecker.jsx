@@ -1,7 +1,12 @@
 import React, { useState } from "react";
 import "./NewsChecker.css";
 import VoiceInput from "./VoiceInput";
-import { checkNewsText, checkNewsVoice, checkNewsImage } from "../services/api";
+import {
+  checkNewsText,
+  checkNewsTextStream,
+  checkNewsVoice,
+  checkNewsImage,
+} from "../services/api";
 
 const NewsChecker = ({ onAnalysisComplete, loading, setLoading, language }) => {
   const [inputText, setInputText] = useState("");
@@ -14,7 +19,12 @@ const NewsChecker = ({ onAnalysisComplete, loading, setLoading, language }) => {
     console.log("📝 Submitting text for analysis:", inputText);
     setLoading(true);
     try {
-      const results = await checkNewsText(inputText, language);
+      // Render local analysis and per-claim verdicts as they stream in
+      const results = await checkNewsTextStream(
+        inputText,
+        language,
+        onAnalysisComplete
+      );
       console.log("📊 Analysis complete, passing results to parent:", results);
       onAnalysisComplete(results);
     } catch (error) {
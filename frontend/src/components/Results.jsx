@@ -40,6 +40,53 @@ const Results = ({ data }) => {
     }
   };
 
+  const getClaimStatus = (pc) => {
+    if (pc.status === "pending") return { label: "⏳ Checking...", className: "" };
+    if (pc.status === "error" || pc.status === "skipped")
+      return { label: "⚠️ Not verified", className: "" };
+    const label =
+      pc.verdict === "true"
+        ? "✅ True"
+        : pc.verdict === "false"
+        ? "❌ False"
+        : "❓ Uncertain";
+    return {
+      label: pc.status === "preliminary" ? `${label} (preliminary)` : label,
+      className:
+        pc.verdict === "true" ? "verified" : pc.verdict === "false" ? "unverified" : "",
+    };
+  };
+
+  // Per-claim verdicts; while streaming, claims arrive pending and fill in one by one
+  const renderClaims = (perClaim) =>
+    Array.isArray(perClaim) &&
+    perClaim.length > 0 && (
+      <div className="sources-section">
+        <strong>🧩 Claims Checked:</strong>
+        <div className="sources-list">
+          {perClaim.slice(0, 5).map((pc, idx) => {
+            const status = getClaimStatus(pc);
+            return (
+              <div key={idx} className="claim-item">
+                <div className="claim-header">
+                  <span className="claim-number">#{idx + 1}</span>
+                  <span className={`claim-status ${status.className}`}>
+                    {status.label}
+                  </span>
+                  {typeof pc.confidence === "number" && pc.status !== "pending" && (
+                    <span className="confidence-mini">
+                      {(pc.confidence * 100).toFixed(0)}%
+                    </span>
+                  )}
+                </div>
+                <p className="claim-text">{pc.claim || ""}</p>
+              </div>
+            );
+          })}
+        </div>
+      </div>
+    );
+
   return (
     <div className="results">
       <div className="results-header">
@@ -191,37 +238,7 @@ const Results = ({ data }) => {
                   </div>
                 )}
 
-                {Array.isArray(verification.per_claim) &&
-                  verification.per_claim.length > 0 && (
-                    <div className="sources-section">
-                      <strong>🧩 Claims Checked:</strong>
-                      <div className="sources-list">
-                        {verification.per_claim.slice(0, 5).map((pc, idx) => (
-                          <div key={idx} className="claim-item">
-                            <div className="claim-header">
-                              <span className="claim-number">#{idx + 1}</span>
-                              <span
-                                className={`claim-status ${
-                                  pc.verdict === "true"
-                                    ? "verified"
-                                    : pc.verdict === "false"
-                                    ? "unverified"
-                                    : ""
-                                }`}
-                              >
-                                {pc.verdict === "true"
-                                  ? "✅ True"
-                                  : pc.verdict === "false"
-                                  ? "❌ False"
-                                  : "❓ Uncertain"}
-                              </span>
-                            </div>
-                            <p className="claim-text">{pc.claim || ""}</p>
-                          </div>
-                        ))}
-                      </div>
-                    </div>
-                  )}
+                {renderClaims(verification.per_claim)}
               </div>
             ) : (
               <div className="verification-fallback">
@@ -232,6 +249,7 @@ const Results = ({ data }) => {
                 {verification.reason && (
                   <p className="reason-text">{verification.reason}</p>
                 )}
+                {renderClaims(verification.per_claim)}
               </div>
             )}
           </div>
@@ -22,6 +22,90 @@ export const checkNewsText = async (text, language = "en") => {
   return data;
 };
 
+// Streaming variant of checkNewsText: the backend sends NDJSON events
+// (analysis -> claims -> verdict/claim... -> result). `onUpdate` receives a partial
+// result in the same shape as checkNewsText's, so <Results> can render early.
+// Claims in `verification.per_claim` go from status "pending" to "preliminary"
+// (verdict and confidence streamed in, reasoning still coming) to their final status.
+export const checkNewsTextStream = async (text, language = "en", onUpdate = () => {}) => {
+  const formData = new FormData();
+  formData.append("text", text);
+  formData.append("language", language);
+
+  const response = await fetch(`${API_BASE_URL}/news/check-text/stream`, {
+    method: "POST",
+    body: formData,
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error("Failed to analyze text");
+  }
+
+  let partial = { status: "pending" };
+  let claims = [];
+  let final = null;
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  const handleEvent = ({ event, data }) => {
+    if (event === "analysis") {
+      partial = {
+        ...partial,
+        ...data,
+        confidence_score: data.analysis?.confidence_score ?? 0,
+        verification: {
+          status: "pending",
+          reason: "Checking claims against web sources...",
+        },
+      };
+    } else if (event === "claims") {
+      claims = data.claims.map((claim) => ({ claim, status: "pending" }));
+      partial = {
+        ...partial,
+        verification: { ...partial.verification, per_claim: claims },
+      };
+    } else if (event === "verdict") {
+      claims = claims.map((c, i) =>
+        i === data.index && (c.status === "pending" || c.status === "preliminary")
+          ? { ...c, verdict: data.verdict, confidence: data.confidence, status: "preliminary" }
+          : c
+      );
+      partial = {
+        ...partial,
+        verification: { ...partial.verification, per_claim: claims },
+      };
+    } else if (event === "claim") {
+      claims = claims.map((c, i) => (i === data.index ? data : c));
+      partial = {
+        ...partial,
+        verification: { ...partial.verification, per_claim: claims },
+      };
+    } else if (event === "result") {
+      final = data;
+      partial = data;
+    } else if (event === "error") {
+      throw new Error(data.detail || "Failed to analyze text");
+    }
+    onUpdate(partial);
+  };
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop();
+    lines.filter((line) => line.trim()).forEach((line) => handleEvent(JSON.parse(line)));
+  }
+  if (buffer.trim()) handleEvent(JSON.parse(buffer));
+
+  if (!final) {
+    throw new Error("Analysis stream ended early");
+  }
+  return final;
+};
+
 export const checkNewsVoice = async (audioBlob, language = "en") => {
   const formData = new FormData();
   formData.append("audio_file", audioBlob, "recording.wav");